@@ -0,0 +1,208 @@
+import os, sys
+import numpy as np
+import vtkUtils.encodeDataArray  as eda
+import vtkUtils.structuredPoints as stp
+import makeImageData.makeImageData             as mid
+import makeRectilinearGrid.makeRectilinearGrid as mrg
+import makeStructuredGrid.makeStructuredGrid   as msg
+
+# -- grid type => ( writer, file extension ), the most compact first -- #
+GridTypeTable = { "ImageData"      :( mid.vtk_makeImageData      , ".vti" ), \
+                  "RectilinearGrid":( mrg.vtk_makeRectilinearGrid, ".vtr" ), \
+                  "StructuredGrid" :( msg.vtk_makeStructuredGrid , ".vts" ) }
+
+
+# ========================================================= #
+# ===  vtk_makeAutoGrid                                 === #
+# ========================================================= #
+def vtk_makeAutoGrid( vtkFile=None, Data=None, Axis=None, xAxis=None, yAxis=None, zAxis=None, \
+                      AxisFunc=None, AxisDims=None, VectorData=False, tolerance=1.0e-6, \
+                      silent=False, **kwargs ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- Axis :: ( nPoints,3 ) points in file order ( i fastest ), as for vtk_makeStructuredGrid, -- #
+    #  -- or 1D x/y/zAxis, or AxisFunc( i, j, k ) over AxisDims = ( LI,LJ,LK )                     -- #
+    #  -- kwargs :: DataFormat, compressor, level, pretty, nPieces, ... passed to the writer       -- #
+    if ( AxisDims is None ): AxisDims = guessDims( Axis=Axis, Data=Data, VectorData=VectorData )
+    # ------------------------------------------------- #
+    # --- [2] most compact grid type                --- #
+    # ------------------------------------------------- #
+    info = detectGrid( Axis=Axis, xAxis=xAxis, yAxis=yAxis, zAxis=zAxis, AxisFunc=AxisFunc, \
+                       AxisDims=AxisDims, tolerance=tolerance )
+    writer, ext = GridTypeTable[ info["GridType"] ]
+    if ( vtkFile is not None ): vtkFile = os.path.splitext( vtkFile )[0] + ext
+    if ( not( silent ) ):
+        print( "[vtk_makeAutoGrid-@makeAutoGrid-] {0} :: {1}".format( info["GridType"], info["reason"] ) )
+    # ------------------------------------------------- #
+    # --- [3] write with the chosen writer          --- #
+    # ------------------------------------------------- #
+    if   ( info["GridType"] == "ImageData"       ):
+        #  -- ImageData takes its dimensions from Data.shape :: flat Data is put on the grid first -- #
+        LILJLK = tuple( [ np.size( info[key] ) for key in [ "xAxis", "yAxis", "zAxis" ] ] )
+        Data   = gridData( Data=Data, LILJLK=LILJLK, VectorData=VectorData )
+        ret = writer( vtkFile=vtkFile, Data=Data, VectorData=VectorData, \
+                      Origin=info["Origin"], Spacing=info["Spacing"], **kwargs )
+    elif ( info["GridType"] == "RectilinearGrid" ):
+        ret = writer( vtkFile=vtkFile, Data=Data, VectorData=VectorData, \
+                      xAxis=info["xAxis"], yAxis=info["yAxis"], zAxis=info["zAxis"], **kwargs )
+    else:
+        ret = writer( vtkFile=vtkFile, Data=Data, VectorData=VectorData, Axis=info["Axis"], **kwargs )
+    ret.autoGrid = info
+    return( ret )
+
+
+# ========================================================= #
+# ===  detectGrid                                       === #
+# ========================================================= #
+def detectGrid( Axis=None, xAxis=None, yAxis=None, zAxis=None, AxisFunc=None, AxisDims=None, \
+                tolerance=1.0e-6 ):
+    # ------------------------------------------------- #
+    # --- [1] points as a structuredPoints / array  --- #
+    # ------------------------------------------------- #
+    #  -- tolerance is relative to the largest extent of the grid -- #
+    if   ( AxisFunc is not None ):
+        if ( AxisDims is None ): sys.exit( "[detectGrid-@makeAutoGrid-] AxisFunc needs AxisDims [ERROR]" )
+        Axis = stp.structuredPoints( func=AxisFunc, LILJLK=AxisDims )
+    elif ( Axis is None ):
+        Axis = stp.structuredPoints( xAxis=xAxis, yAxis=yAxis, zAxis=zAxis )
+    if ( eda.isLazy( Axis ) ):
+        AxisDims = Axis.LILJLK
+    if ( AxisDims is None ): sys.exit( "[detectGrid-@makeAutoGrid-] AxisDims == ??? " )
+    LI, LJ, LK = AxisDims
+    if ( int( np.prod( AxisDims ) ) * 3 != Axis.size ):
+        sys.exit( "[detectGrid-@makeAutoGrid-] Axis size != AxisDims {0} [ERROR]".format( tuple( AxisDims ) ) )
+    # ------------------------------------------------- #
+    # --- [2] separable :: x(i), y(j), z(k) only    --- #
+    # ------------------------------------------------- #
+    if ( eda.isLazy( Axis ) and ( Axis.func is None ) ):
+        axes      = [ Axis.xAxis, Axis.yAxis, Axis.zAxis ]
+        deviation = 0.0
+    else:
+        axes      = referenceAxes( Axis=Axis, AxisDims=AxisDims )
+        deviation = None
+    span      = max( [ float( np.max( a ) - np.min( a ) ) for a in axes ] + [ 0.0 ] )
+    tol       = tolerance * max( span, np.finfo( np.float64 ).tiny )
+    if ( deviation is None ):
+        deviation = separableDeviation( Axis=Axis, AxisDims=AxisDims, axes=axes, tol=tol )
+    if ( deviation > tol ):
+        return( { "GridType":"StructuredGrid", "Axis":Axis, "deviation":deviation, \
+                  "reason":"points are not separable ( deviation {0:.3e} > {1:.3e} )".format( deviation, tol ) } )
+    # ------------------------------------------------- #
+    # --- [3] uniform :: Origin + Spacing           --- #
+    # ------------------------------------------------- #
+    ret      = { "xAxis":axes[0], "yAxis":axes[1], "zAxis":axes[2], "deviation":deviation }
+    uniform  = [ uniformSpacing( Axis1D=a, tol=tol ) for a in axes ]
+    if ( any( [ spc is None for spc in uniform ] ) ):
+        ret.update( { "GridType":"RectilinearGrid", \
+                      "reason"  :"separable, non-uniform axes ( {0} )".format( \
+                          ", ".join( [ key for key,spc in zip( "xyz", uniform ) if ( spc is None ) ] ) ) } )
+        return( ret )
+    ret.update( { "GridType":"ImageData", "Origin":[ float( a[0] ) for a in axes ], "Spacing":uniform, \
+                  "reason"  :"separable, uniform axes ( Spacing = {0} )".format( uniform ) } )
+    return( ret )
+
+
+# ========================================================= #
+# ===  referenceAxes                                    === #
+# ========================================================= #
+def referenceAxes( Axis=None, AxisDims=None ):
+    #  -- x along i ( j=k=0 ), y along j ( i=k=0 ), z along k ( i=j=0 ) -- #
+    LI, LJ, LK = AxisDims
+    if ( eda.isLazy( Axis ) ):
+        zero  = np.array( [0] )
+        xAxis = Axis.slab( i=np.arange( LI ), j=zero, k=zero )[:,0]
+        yAxis = Axis.slab( i=zero, j=np.arange( LJ ), k=zero )[:,1]
+        zAxis = Axis.slab( i=zero, j=zero, k=np.arange( LK ) )[:,2]
+    else:
+        ordered = Axis.reshape( LK, LJ, LI, 3 )
+        xAxis, yAxis, zAxis = ordered[0,0,:,0], ordered[0,:,0,1], ordered[:,0,0,2]
+    return( [ np.array( xAxis ), np.array( yAxis ), np.array( zAxis ) ] )
+
+
+# ========================================================= #
+# ===  separableDeviation                               === #
+# ========================================================= #
+def separableDeviation( Axis=None, AxisDims=None, axes=None, tol=0.0 ):
+    # ------------------------------------------------- #
+    # --- [1] max | point - ( x(i), y(j), z(k) ) |  --- #
+    # ------------------------------------------------- #
+    #  -- k-plane slabs ( O(slab) memory ), stops as soon as tol is exceeded -- #
+    LI, LJ, LK = AxisDims
+    nPlane     = max( 2**20 // max( LI*LJ, 1 ), 1 )
+    deviation  = 0.0
+    for k0 in range( 0, LK, nPlane ):
+        kIdx   = np.arange( k0, min( k0+nPlane, LK ) )
+        if ( eda.isLazy( Axis ) ):
+            slab = Axis.slab( i=np.arange( LI ), j=np.arange( LJ ), k=kIdx )
+        else:
+            slab = Axis[ k0*LI*LJ:( kIdx[-1]+1 )*LI*LJ ]
+        slab   = slab.reshape( kIdx.size, LJ, LI, 3 )
+        dx     = np.max( np.abs( slab[...,0] - axes[0][np.newaxis,np.newaxis,:]    ) )
+        dy     = np.max( np.abs( slab[...,1] - axes[1][np.newaxis,:,np.newaxis]    ) )
+        dz     = np.max( np.abs( slab[...,2] - axes[2][kIdx][:,np.newaxis,np.newaxis] ) )
+        deviation = max( deviation, float( dx ), float( dy ), float( dz ) )
+        if ( deviation > tol ): break
+    return( deviation )
+
+
+# ========================================================= #
+# ===  uniformSpacing                                   === #
+# ========================================================= #
+def uniformSpacing( Axis1D=None, tol=0.0 ):
+    #  -- Spacing of an increasing, evenly spaced axis ( 1.0 for 1 point ), None otherwise -- #
+    Axis1D  = np.asarray( Axis1D, dtype=np.float64 )
+    if ( Axis1D.size == 1 ): return( 1.0 )
+    spacing = ( Axis1D[-1] - Axis1D[0] ) / ( Axis1D.size - 1 )
+    if ( spacing <= 0.0 ): return( None )
+    linear  = Axis1D[0] + spacing * np.arange( Axis1D.size )
+    if ( np.max( np.abs( Axis1D - linear ) ) > tol ): return( None )
+    return( float( spacing ) )
+
+
+# ========================================================= #
+# ===  guessDims                                        === #
+# ========================================================= #
+def guessDims( Axis=None, Data=None, VectorData=False ):
+    #  -- ( LI,LJ,LK ) of an explicit Axis, from the Data shape ( as the writers do ) -- #
+    if ( ( Axis is None ) or eda.isLazy( Axis ) or not( isinstance( Data, np.ndarray ) ) ):
+        return( None )
+    shape = Data.shape[:-1] if ( VectorData ) else Data.shape
+    return( tuple( shape ) + (1,)*( 3-len( shape ) ) )
+
+
+# ========================================================= #
+# ===  gridData                                         === #
+# ========================================================= #
+def gridData( Data=None, LILJLK=None, VectorData=False ):
+    #  -- point data ( flat, or any shape in file order ) => ( LI,LJ,LK[,nComp] ) ; -- #
+    #  -- { name:ndarray or ( ndarray, VectorData ) } field by field                -- #
+    if ( Data is None ): return( None )
+    if ( isinstance( Data, dict  ) ):
+        return( { key:gridData( Data=val, LILJLK=LILJLK, VectorData=None ) for key,val in Data.items() } )
+    if ( isinstance( Data, tuple ) ):
+        return( ( gridData( Data=Data[0], LILJLK=LILJLK, VectorData=Data[1] ), Data[1] ) )
+    nPoints = int( np.prod( LILJLK ) )
+    if ( VectorData is None ): VectorData = ( Data.size != nPoints )
+    nComp   = ( Data.size // nPoints, ) if ( VectorData ) else ()
+    if ( Data.size != nPoints * int( np.prod( nComp ) ) ):
+        sys.exit( "[gridData-@makeAutoGrid-] Data size {0} != grid {1} [ERROR]".format( Data.size, LILJLK ) )
+    return( Data.reshape( tuple( LILJLK ) + nComp ) )
+
+
+# ======================================== #
+# ===  実行部                          === #
+# ======================================== #
+if ( __name__=="__main__" ):
+    size    = ( 101,101,1 )
+    xAxis   = np.linspace( -1.0, +1.0, size[0] )
+    yAxis   = np.linspace( -1.0, +1.0, size[1] )**3
+    zAxis   = np.zeros( (1,) )
+    Axis    = stp.structuredPoints( xAxis=xAxis, yAxis=np.linspace( -1.0, +1.0, size[1] ), zAxis=zAxis ).toArray()
+    Data    = np.exp( - Axis[:,0]**2 - Axis[:,1]**2 ).reshape( size )
+    vtk     = vtk_makeAutoGrid( vtkFile="out.vts", Data=Data, Axis=Axis )
+    vtk     = vtk_makeAutoGrid( vtkFile="out.vts", Data=Data, xAxis=xAxis, yAxis=yAxis, zAxis=zAxis )
+    #  -- uniform axes + flat Data :: ImageData on the ( 4,5,6 ) grid of the axes -- #
+    vtk     = vtk_makeAutoGrid( vtkFile="flat.vti", Data=np.arange( 120.0 ), \
+                                xAxis=np.linspace( 0.0, 3.0, 4 ), yAxis=np.linspace( 0.0, 4.0, 5 ), \
+                                zAxis=np.linspace( 0.0, 5.0, 6 ) )
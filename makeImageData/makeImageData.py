@@ -1,5 +1,16 @@
-import sys, subprocess
+import os, sys
 import numpy as np
+import vtkUtils.encodeDataArray   as eda
+import vtkUtils.appendedWriter    as apw
+import vtkUtils.compressDataArray as cda
+import vtkUtils.writeXML          as xwr
+import vtkUtils.writePieces       as pwr
+import vtkUtils.fieldData         as fda
+import vtkUtils.inquiryData       as iqd
+import vtkUtils.encodeCache       as ecc
+import vtkUtils.quantizeData      as qnt
+import vtkUtils.pyramidData       as pyd
+import vtkUtils.binPoints         as bnp
 
 # ========================================================= #
 # ===  vtk_makeImageData class                          === #
@@ -9,7 +20,11 @@ class vtk_makeImageData():
     # --- class Initiator                           --- #
     # ------------------------------------------------- #
     def __init__( self, vtkFile=None, Data=None, Spacing=[1.,1.,1.], Origin=[0.,0.,0.,], \
-                  VectorData=False, DataFormat="ascii", ):
+                  VectorData=False, DataFormat="ascii", \
+                  compressor=None, level=None, pretty=False, WholeExtent=None, \
+                  nPieces=None, nProcs=None, GhostLevel=0, \
+                  precision=None, float_format=None, downcast=False, quantize=None, \
+                  pyramid=None, pyramid_mode="mean" ):
         # --- [1-1] Arguments                       --- #
         if ( vtkFile is None ): vtkFile = "out.vti"
         # --- [1-2] Variables Settings              --- #
@@ -21,12 +36,123 @@ class vtk_makeImageData():
         self.Spacing     = Spacing
         self.DataFormat  = DataFormat
         self.VectorData  = VectorData
+        self.compressor  = compressor
+        self.level       = level
+        self.stats       = cda.compressStats()
+        self.inquiry     = iqd.inquiryCache()
+        self.pretty      = pretty
+        self.float_format = eda.floatFormat( precision=precision, float_format=float_format )
+        self.downcast    = downcast
+        self.quantize    = quantize
+        self.quantization = {}
+        self.pyramid     = pyd.pyramidFactors( pyramid=pyramid )
+        self.pyramid_mode = pyramid_mode
+        self.pyramidFiles = []
+        self.binning     = {}
+        self.appended    = None
+        if ( DataFormat.lower() == "appended" ):
+            self.appended = apw.appendedWriter( vtkFile=vtkFile )
+        self.WholeExtent = WholeExtent
         self.DataDims    = None
         self.LILJLK      = None
+        self.PointFields = {}
+        self.CellFields  = {}
         # --- [1-3] Routines                        --- #
+        #  -- Data is None :: builder use, add_point_data / add_cell_data, then write -- #
+        if ( self.Data is not None ):
+            self.PointFields.update( fda.asFields( Data=self.Data, DataName="Data", VectorData=self.VectorData ) )
+        if   ( nPieces   is not None ):
+            self.vtk_writePieces( nPieces=nPieces, nProcs=nProcs, GhostLevel=GhostLevel )
+        elif ( self.Data is not None ):
+            self.write()
+
+
+    # ------------------------------------------------- #
+    # --- add_point_data                            --- #
+    # ------------------------------------------------- #
+    def add_point_data( self, name=None, array=None, VectorData=None ):
+        if ( name  is None ): sys.exit( "[add_point_data-@makeImageData-] name  == ??? " )
+        if ( array is None ): sys.exit( "[add_point_data-@makeImageData-] array == ??? " )
+        self.PointFields[name] = ( array, VectorData )
+        return( self )
+
+
+    # ------------------------------------------------- #
+    # --- add_cell_data                             --- #
+    # ------------------------------------------------- #
+    def add_cell_data( self, name=None, array=None, VectorData=None ):
+        if ( name  is None ): sys.exit( "[add_cell_data-@makeImageData-] name  == ??? " )
+        if ( array is None ): sys.exit( "[add_cell_data-@makeImageData-] array == ??? " )
+        self.CellFields[name]  = ( array, VectorData )
+        return( self )
+
+
+    # ------------------------------------------------- #
+    # --- add_binned_data                           --- #
+    # ------------------------------------------------- #
+    def add_binned_data( self, name="Data", xyz=None, values=None, LILJLK=None, statistics=None, \
+                         Point_or_Cell="cell", fit=False, chunkSize=None, nProcs=None ):
+        # ------------------------------------------------- #
+        # --- [1] Arguments                             --- #
+        # ------------------------------------------------- #
+        #  -- scattered xyz ( + values ) binned on the LILJLK grid of self.Origin / self.Spacing, -- #
+        #  -- fit=True :: Origin / Spacing spanning the bounding box of xyz                        -- #
+        #  -- adds "{name}_count", "{name}_sum", "{name}_mean", "{name}_min", "{name}_max"          -- #
+        #  -- as CellData ( voxel = cell ) or PointData ( voxel = box around each point )          -- #
+        #  -- nProcs > 1 :: partial grids of chunk groups on a process pool, reduced at the end    -- #
+        if ( xyz    is None ): sys.exit( "[add_binned_data-@makeImageData-] xyz    == ??? " )
+        if ( LILJLK is None ): sys.exit( "[add_binned_data-@makeImageData-] LILJLK == ??? " )
+        LILJLK = tuple( LILJLK ) + (1,)*( 3-len( LILJLK ) )
+        if ( fit ):
+            self.Origin, self.Spacing = bnp.gridFromBounds( xyz=xyz, LILJLK=LILJLK, chunkSize=chunkSize )
+        # ------------------------------------------------- #
+        # --- [2] count / sum / mean / min / max        --- #
+        # ------------------------------------------------- #
+        binned, info = bnp.binPoints( xyz=xyz, values=values, LILJLK=LILJLK, Origin=self.Origin, \
+                                      Spacing=self.Spacing, statistics=statistics, Point_or_Cell=Point_or_Cell, \
+                                      chunkSize=chunkSize, nProcs=nProcs )
+        self.binning[name] = info
+        print( "[add_binned_data-@makeImageData-] {0} :: {1} points => {2} / {3} voxels filled, {4} outside"\
+               .format( name, info["nPoints"], info["nFilled"], info["nVoxels"], info["nOutside"] ) )
+        # ------------------------------------------------- #
+        # --- [3] ( LI,LJ,LK[,nComp] ) fields           --- #
+        # ------------------------------------------------- #
+        #  -- cells :: trailing flat axes dropped, so that the writer infers LILJLK = cells + 1 -- #
+        shape = list( info["dims"] )
+        if ( Point_or_Cell.lower() == "cell" ):
+            while ( ( len( shape ) > 1 ) and ( LILJLK[len( shape )-1] == 1 ) ): shape = shape[:-1]
+        add   = self.add_cell_data if ( Point_or_Cell.lower() == "cell" ) else self.add_point_data
+        for stat,Data in binned.items():
+            VectorData = ( Data.ndim == 2 )
+            add( name="{0}_{1}".format( name, stat ), array=Data.reshape( tuple( shape ) + Data.shape[1:] ), \
+                 VectorData=VectorData )
+        return( self )
+
+
+    # ------------------------------------------------- #
+    # --- write                                     --- #
+    # ------------------------------------------------- #
+    def write( self, path_or_fileobj=None, pretty=None ):
+        # ------------------------------------------------- #
+        # --- [1] rebuild contents from added fields    --- #
+        # ------------------------------------------------- #
+        self.vtkContents = ''
+        self.vtkEndTags  = ''
+        self.stats       = cda.compressStats()
+        if ( self.appended is not None ): self.appended.truncate( offset=0 )
         self.vtk_add_VTKFileTag  ( datatype="ImageData" )
-        self.vtk_add_ImageDataTag( Data=self.Data, VectorData=self.VectorData )
-        self.vtk_writeFile()
+        self.vtk_add_ImageDataTag( PointFields=self.PointFields, CellFields=self.CellFields, \
+                                   WholeExtent=self.WholeExtent )
+        # ------------------------------------------------- #
+        # --- [2] write to path or file object          --- #
+        # ------------------------------------------------- #
+        ret = self.vtk_writeFile( vtkFile=path_or_fileobj, pretty=pretty )
+        # ------------------------------------------------- #
+        # --- [3] LOD pyramid alongside ( path only )   --- #
+        # ------------------------------------------------- #
+        if ( self.pyramid and not( hasattr( path_or_fileobj, "write" ) ) ):
+            self.vtk_writePyramid( vtkFile=path_or_fileobj )
+        return( ret )
 
         
     # ------------------------------------------------- #
@@ -37,8 +163,8 @@ class vtk_makeImageData():
         # --- [1] Add XML Definition & VTKFile Tag      --- #
         # ------------------------------------------------- #
         if ( datatype is None ): datatype = "ImageData"
-        self.vtkContents  += '<?xml version="1.0"?>\n'
-        self.vtkContents  += '<VTKFile type="{0}">\n'.format( datatype )
+        self.vtkContents  += '<?xml version="1.0" encoding="utf-8"?>\n'
+        self.vtkContents  += '<VTKFile type="{0}"{1}>\n'.format( datatype, eda.fileAttributes( DataFormat=self.DataFormat, compressor=self.compressor ) )
         self.vtkEndTags    = '</VTKFile>'     + '\n' + self.vtkEndTags
 
         
@@ -46,16 +172,28 @@ class vtk_makeImageData():
     # --- vtk_add_ImageDataTag                      --- #
     # ------------------------------------------------- #
     def vtk_add_ImageDataTag( self, Data=None, LILJLK=None, Origin=None, Spacing=None, \
-                              DataName=None, VectorData=False, WholeExtent=None, Point_or_Cell="point" ):
+                              DataName=None, VectorData=False, WholeExtent=None, Point_or_Cell="point", \
+                              PointFields=None, CellFields=None ):
         # ------------------------------------------------- #
         # --- [1] Arguments                             --- #
         # ------------------------------------------------- #
-        if ( DataName is None ): DataName = "Data"
-        self.prepareData( Data=Data, VectorData=VectorData )
-        if   ( VectorData is True  ):
-            Scl_or_Vec   = "Vectors"
-        elif ( VectorData is False ):
-            Scl_or_Vec   = "Scalars"
+        #  -- Data, PointFields, CellFields :: ndarray or { DataName:ndarray or ( ndarray, VectorData ) } -- #
+        if ( DataName    is None ): DataName    = "Data"
+        PointFields      = fda.asFields( Data=PointFields )
+        CellFields       = fda.asFields( Data=CellFields  )
+        if ( Point_or_Cell.lower() == "point" ):
+            PointFields  = { **fda.asFields( Data=Data, DataName=DataName, VectorData=VectorData ), **PointFields }
+        if ( Point_or_Cell.lower() == "cell"  ):
+            CellFields   = { **fda.asFields( Data=Data, DataName=DataName, VectorData=VectorData ), **CellFields  }
+        self.prepareFields( PointFields=PointFields, CellFields=CellFields )
+        nPoints          = int( np.prod( self.LILJLK ) )
+        nCells           = int( np.prod( [ max(s-1,1) for s in self.LILJLK ] ) )
+        PointFields      = fda.resolveFields( Fields=PointFields, nTuples=nPoints )
+        CellFields       = fda.resolveFields( Fields=CellFields , nTuples=nCells  )
+        #  -- lossy :: floating fields => UInt8 / UInt16 ..., ( scale, offset, maxError ) in FieldData -- #
+        PointFields, qPoint = qnt.quantizeFields( Fields=PointFields, quantize=self.quantize )
+        CellFields , qCell  = qnt.quantizeFields( Fields=CellFields , quantize=self.quantize )
+        self.quantization   = { **qPoint, **qCell }
         if ( WholeExtent is None   ):
             WholeExtent  = " ".join( [ "0 {0}".format( max(s-1,0) ) for s in list( self.LILJLK ) ] )
         if ( Origin      is None   ):
@@ -67,24 +205,32 @@ class vtk_makeImageData():
         # ------------------------------------------------- #
         self.vtkContents  += '<ImageData WholeExtent="{0}" Origin="{1}" Spacing="{2}">\n'\
             .format( WholeExtent, Origin, Spacing )
+        self.vtkContents  += qnt.fieldDataTag( info=self.quantization )
         self.vtkContents  += '<Piece Extent="{0}">\n'.format( WholeExtent )
         # ------------------------------------------------- #
         # --- [3] PointData / CellData                  --- #
         # ------------------------------------------------- #
-        if ( Point_or_Cell.lower() == "point" ):
-            self.vtkContents  += '<PointData {0}="{1}">\n'.format( Scl_or_Vec, DataName )
-            self.vtkContents  += self.vtk_add_DataArray( Data=Data, DataName=DataName )
-            self.vtkContents  += '</PointData>\n'
-        if ( Point_or_Cell.lower() == "cell"  ):
-            self.vtkContents  += '<CellData {0}="{1}">\n'.format( Scl_or_Vec, DataName )
-            self.vtkContents  += self.vtk_add_DataArray( Data=Data, DataName=DataName )
-            self.vtkContents  += '</CellData>\n'
+        self.vtkContents  += self.vtk_add_FieldData( Fields=PointFields, tag="PointData" )
+        self.vtkContents  += self.vtk_add_FieldData( Fields=CellFields , tag="CellData"  )
         # ------------------------------------------------- #
         # --- [4] Close ImageData Tag                   --- #
         # ------------------------------------------------- #
         self.vtkContents += '</Piece>\n'    
         self.vtkContents += '</ImageData>\n'
 
+
+    # ------------------------------------------------- #
+    # --- vtk_add_FieldData                         --- #
+    # ------------------------------------------------- #
+    def vtk_add_FieldData( self, Fields=None, tag="PointData" ):
+        #  -- Fields are resolved, active Scalars / Vectors :: first scalar / 3-component field -- #
+        if ( not( Fields ) ): return( "" )
+        ret  = '<{0}{1}>\n'.format( tag, fda.activeAttributes( Fields=Fields ) )
+        for DataName, ( Data, VectorData ) in Fields.items():
+            ret += self.vtk_add_DataArray( Data=Data, DataName=DataName, VectorData=VectorData )
+        ret += '</{0}>\n'.format( tag )
+        return( ret )
+
         
     # ------------------------------------------------- #
     # --- vtk_add_DataArray                         --- #
@@ -93,21 +239,23 @@ class vtk_makeImageData():
         if ( Data        is None ): sys.exit( "[vtk_add_DataArray -@makeStructuredGrid-] Data     == ??? " )
         if ( DataName    is None ): sys.exit( "[vtk_add_DataArray -@makeStructuredGrid-] DataName == ??? " )
         if ( DataFormat  is None ): DataFormat  = self.DataFormat
-        if ( DataType    is None ): DataType    = self.inquiryData( Data=Data, ret_DataType   =True, VectorData=VectorData )
-        if ( nComponents is None ): nComponents = self.inquiryData( Data=Data, ret_nComponents=True, VectorData=VectorData )
-        if ( nData       is None ): nData       = self.inquiryData( Data=Data, ret_nData      =True, VectorData=VectorData )
+        if ( self.downcast       ): Data        = eda.downcastArray( Data=Data )
+        info = self.inquiryData( Data=Data, VectorData=VectorData )
+        if ( DataType    is None ): DataType    = info["DataType"]
+        if ( nComponents is None ): nComponents = info["nComponents"]
+        if ( nData       is None ): nData       = info["nData"]
+        if ( DataFormat.lower() == "appended" ):
+            offset = self.appended.add_DataArray( Data=Data, compressor=self.compressor, level=self.level, \
+                                                  DataName=DataName, stats=self.stats, cache=ecc.sharedCache() )
+            return( '<DataArray Name="{0}" type="{1}" NumberOfComponents="{2}" format="{3}" offset="{4}"/>\n'\
+                    .format( DataName, DataType, nComponents, DataFormat, offset ) )
         ret  = ""
         ret += '<DataArray Name="{0}" type="{1}" NumberOfComponents="{2}" format="{3}">\n'\
                                  .format( DataName, DataType, nComponents, DataFormat )
-        lines = ""
-        if ( nComponents == 1 ):
-            for line in np.ravel( Data ):
-                lines += "{0} ".format( line )
-            lines += "\n"
-        else:
-            for line in Data:
-                lines += ( " ".join( [ str( val ) for val in line ] ) + "\n" )
-        ret += lines
+        ret += eda.encodeDataArray( Data=Data, DataFormat=DataFormat, rowWise=( nComponents != 1 ), \
+                                   compressor=self.compressor, level=self.level, \
+                                   DataName=DataName, stats=self.stats, cache=ecc.sharedCache(), \
+                                   float_format=self.float_format )
         ret += '</DataArray>\n'
         return( ret )
         
@@ -115,46 +263,145 @@ class vtk_makeImageData():
     # ------------------------------------------------- #
     # --- vtk_writeFile                             --- #
     # ------------------------------------------------- #
-    def vtk_writeFile( self, vtkFile=None ):
+    def vtk_writeFile( self, vtkFile=None, pretty=None ):
+        #  -- vtkFile :: path, or a file object opened in "wb" -- #
         if ( vtkFile is None ): vtkFile = self.vtkFile
-        with open( vtkFile, "w" ) as f:
-            f.write( self.vtkContents )
-            f.write( self.vtkEndTags  )
-        subprocess.call( ( "xmllint --format --encode utf-8 {0} -o {0}"\
-                           .format( vtkFile ) ).split() )
-        print( "[vtk_writeFile-@makeImageData-] VTK File output :: {0}".format( vtkFile ) )
+        if ( pretty  is None ): pretty  = self.pretty
+        with xwr.openXML( vtkFile ) as f:
+            depth = xwr.writeXML( f=f, contents=self.vtkContents, pretty=pretty )
+            if ( self.appended is not None ):
+                self.appended.writeAppendedData( f=f, indent=xwr.indentOf( depth=depth, pretty=pretty ) )
+            xwr.writeXML( f=f, contents=self.vtkEndTags, pretty=pretty, depth=depth )
+        print( "[vtk_writeFile-@makeImageData-] VTK File output :: {0}".format( xwr.nameOf( vtkFile ) ) )
+        return( self.stats )
 
 
     # ------------------------------------------------- #
-    # --- inquiryData                               --- #
+    # --- vtk_writePieces                           --- #
     # ------------------------------------------------- #
-    def inquiryData( self, Data=None, VectorData=False, ret_DataType=False, ret_nComponents=False, ret_nData=False ):
-        if ( Data is None ): sys.exit( "[inquiryData-@vtk_makeImageData-] Data  == ??? " )
+    def vtk_writePieces( self, nPieces=None, nProcs=None, GhostLevel=0, vtkFile=None ):
+        # ------------------------------------------------- #
+        # --- [1] Arguments                             --- #
         # ------------------------------------------------- #
-        # --- [1] DataType Check                        --- #
+        #  -- every field of self.PointFields / self.CellFields, sliced by the extent of each piece -- #
+        if ( nPieces  is None ): sys.exit( "[vtk_writePieces-@makeImageData-] nPieces == ??? " )
+        if ( vtkFile  is None ): vtkFile  = self.vtkFile
+        self.prepareFields( PointFields=self.PointFields, CellFields=self.CellFields )
+        cLILJLK     = pwr.cellDims( LILJLK=self.LILJLK )
+        PointFields = fda.resolveFields( Fields=self.PointFields, nTuples=int( np.prod( self.LILJLK ) ) )
+        CellFields  = fda.resolveFields( Fields=self.CellFields , nTuples=int( np.prod( cLILJLK     ) ) )
+        extents     = pwr.structuredExtents( LILJLK=self.LILJLK, nPieces=nPieces, GhostLevel=GhostLevel )
+        #  -- quantized pieces share 1 ( scale, offset ) per field from the whole field -- #
+        quantize    = pwr.sharedQuantize( quantize=self.quantize, Fields={ **PointFields, **CellFields } )
         # ------------------------------------------------- #
-        if ( type(Data) is not np.ndarray ):
-            sys.exit( "[inquiryData-@vtk_makeImageData-] Data should be np.ndarray [ERROR]" )
-        if ( Data.dtype == np.int32   ): DataType = "Int32"
-        if ( Data.dtype == np.int64   ): DataType = "Int64"
-        if ( Data.dtype == np.float32 ): DataType = "Float32"
-        if ( Data.dtype == np.float64 ): DataType = "Float64"
+        # --- [2] write each piece on a process pool    --- #
         # ------------------------------------------------- #
-        # --- [2] Data Shape Check                      --- #
+        pieces      = []
+        for ik,extent in enumerate( extents ):
+            cExtent  = pwr.cellExtent( extent=extent, LILJLK=self.LILJLK )
+            pFields  = { key:( pwr.subExtent( Data=Data, LILJLK=self.LILJLK, extent=extent, VectorData=VectorData ), \
+                               VectorData ) for key,( Data, VectorData ) in PointFields.items() }
+            cFields  = { key:( pwr.subExtent( Data=Data, LILJLK=cLILJLK, extent=cExtent, VectorData=VectorData ), \
+                               VectorData ) for key,( Data, VectorData ) in CellFields.items()  }
+            pieces  += [ { "vtkFile"   :pwr.pieceFileName( vtkFile=vtkFile, iPiece=ik ), \
+                           "PointFields":pFields, "CellFields":cFields, \
+                           "Spacing"   :self.Spacing, "Origin":self.Origin, \
+                           "DataFormat":self.DataFormat, "compressor":self.compressor, "level":self.level, \
+                           "pretty"    :self.pretty, "WholeExtent":pwr.extentString( extent=extent ), \
+                           "float_format":self.float_format, "downcast":self.downcast, "quantize":quantize } ]
+        pwr.writePieces( writer=vtk_makeImageData, pieces=pieces, nProcs=nProcs )
         # ------------------------------------------------- #
-        if ( VectorData is True ):
-            nComponents = Data.shape[-1]
-            nData       = np.size( Data[-1][:] )
-        else:
-            nComponents = 1
-            nData       = np.size( Data[:]    )
+        # --- [3] PImageData summary file               --- #
+        # ------------------------------------------------- #
+        WholeExtent  = " ".join( [ "0 {0}".format( max(s-1,0) ) for s in list( self.LILJLK ) ] )
+        contents     = '<?xml version="1.0" encoding="utf-8"?>\n'
+        contents    += '<VTKFile type="PImageData"{0}>\n'.format( eda.fileAttributes( DataFormat=self.DataFormat, compressor=self.compressor ) )
+        contents    += '<PImageData WholeExtent="{0}" GhostLevel="{1}" Origin="{2}" Spacing="{3}">\n'\
+            .format( WholeExtent, GhostLevel, " ".join( [ str(Opt) for Opt in self.Origin ] ), \
+                     " ".join( [ str(Spc) for Spc in self.Spacing ] ) )
+        contents    += pwr.summaryFields( Fields=PointFields, tag="PPointData", downcast=self.downcast, quantize=quantize )
+        contents    += pwr.summaryFields( Fields=CellFields , tag="PCellData" , downcast=self.downcast, quantize=quantize )
+        for piece,extent in zip( pieces, extents ):
+            contents += '<Piece Extent="{0}" Source="{1}"/>\n'\
+                .format( pwr.extentString( extent=extent ), os.path.basename( piece["vtkFile"] ) )
+        contents    += '</PImageData>\n'
+        contents    += '</VTKFile>\n'
+        with open( pwr.summaryFileName( vtkFile=vtkFile ), "wb" ) as f:
+            xwr.writeXML( f=f, contents=contents, pretty=self.pretty )
+        print( "[vtk_writePieces-@makeImageData-] VTK File output :: {0}".format( pwr.summaryFileName( vtkFile=vtkFile ) ) )
+        # ------------------------------------------------- #
+        # --- [4] LOD pyramid, in pieces as well        --- #
+        # ------------------------------------------------- #
+        if ( self.pyramid ):
+            self.vtk_writePyramid( vtkFile=vtkFile, nPieces=nPieces, nProcs=nProcs, GhostLevel=GhostLevel )
+
+
+    # ------------------------------------------------- #
+    # --- vtk_writePyramid                          --- #
+    # ------------------------------------------------- #
+    def vtk_writePyramid( self, vtkFile=None, factors=None, mode=None, nPieces=None, nProcs=None, GhostLevel=0 ):
+        # ------------------------------------------------- #
+        # --- [1] Arguments                             --- #
+        # ------------------------------------------------- #
+        #  -- out.vti => out_lod2.vti, out_lod4.vti, ... of the point fields, indexed by out_lod.xml -- #
+        #  -- ( factor 1 :: full resolution ) ; nPieces :: out_lod2.pvti, ... ; cell fields are kept  -- #
+        #  -- at full resolution only                                                                -- #
+        if ( vtkFile is None ): vtkFile = self.vtkFile
+        if ( factors is None ): factors = self.pyramid
+        if ( mode    is None ): mode    = self.pyramid_mode
+        factors     = pyd.pyramidFactors( pyramid=factors )
+        self.prepareFields( PointFields=self.PointFields, CellFields=self.CellFields )
+        PointFields = fda.resolveFields( Fields=self.PointFields, nTuples=int( np.prod( self.LILJLK ) ) )
+        if ( not( PointFields ) ):
+            sys.exit( "[vtk_writePyramid-@makeImageData-] no PointData to downsample [ERROR]" )
         # ------------------------------------------------- #
-        # --- [3] Return                                --- #
+        # --- [2] downsample in k-slabs, 1 pass / field --- #
         # ------------------------------------------------- #
-        if ( ret_DataType    ): return( DataType    )
-        if ( ret_nComponents ): return( nComponents )
-        if ( ret_nData       ): return( nData       )
-        return( { "DataType":DataType, "nComponents":nComponents, "nData":nData } )
+        levels      = { key:pyd.downsampleLevels( Data=Data, LILJLK=self.LILJLK, VectorData=VectorData, \
+                                                  factors=factors, mode=mode ) \
+                        for key,( Data, VectorData ) in PointFields.items() }
+        # ------------------------------------------------- #
+        # --- [3] 1 .vti ( .pvti ) per level + manifest --- #
+        # ------------------------------------------------- #
+        listed      = pwr.summaryFileName( vtkFile=vtkFile ) if ( nPieces is not None ) else vtkFile
+        manifest    = [ { "factor":1, "vtkFile":listed, "LILJLK":self.LILJLK, \
+                          "Origin":self.Origin, "Spacing":self.Spacing } ]
+        self.pyramidFiles = []
+        for factor in factors:
+            Origin, Spacing = pyd.levelGeometry( Origin=self.Origin, Spacing=self.Spacing, factor=factor, mode=mode )
+            levelFile   = pyd.levelFileName( vtkFile=vtkFile, factor=factor )
+            level       = vtk_makeImageData( vtkFile=levelFile, Origin=Origin, Spacing=Spacing, \
+                                             DataFormat=self.DataFormat, compressor=self.compressor, \
+                                             level=self.level, pretty=self.pretty, float_format=self.float_format, \
+                                             downcast=self.downcast, quantize=self.quantize )
+            for key,( Data, VectorData ) in PointFields.items():
+                level.add_point_data( name=key, array=levels[key][factor], VectorData=VectorData )
+            if ( nPieces is None ):
+                level.write()
+                listed  = levelFile
+            else:
+                level.vtk_writePieces( nPieces=nPieces, nProcs=nProcs, GhostLevel=GhostLevel )
+                listed  = pwr.summaryFileName( vtkFile=levelFile )
+            manifest   += [ { "factor":factor, "vtkFile":listed, "LILJLK":level.LILJLK, \
+                              "Origin":Origin, "Spacing":Spacing } ]
+            self.pyramidFiles += [ listed ]
+        manifestFile = pyd.writeManifest( manifestFile=pyd.manifestFileName( vtkFile=vtkFile ), levels=manifest, \
+                                          mode=mode, pretty=self.pretty )
+        print( "[vtk_writePyramid-@makeImageData-] VTK File output :: {0}".format( manifestFile ) )
+        return( self.pyramidFiles )
+
+        
+    # ------------------------------------------------- #
+    # --- inquiryData                               --- #
+    # ------------------------------------------------- #
+    def inquiryData( self, Data=None, VectorData=False, ret_DataType=False, ret_nComponents=False, ret_nData=False ):
+        #  -- DataType, nComponents, nData in 1 pass, memoized in self.inquiry -- #
+        if ( Data is None ): sys.exit( "[inquiryData-@vtk_makeImageData-] Data  == ??? " )
+        info = self.inquiry.inquire( Data=Data, VectorData=VectorData )
+        if ( ret_DataType    ): return( info["DataType"]    )
+        if ( ret_nComponents ): return( info["nComponents"] )
+        if ( ret_nData       ): return( info["nData"]       )
+        return( info )
 
 
     # ------------------------------------------------- #
@@ -165,7 +412,7 @@ class vtk_makeImageData():
         # --- [1] Data Array Type/Shape Check           --- #
         # ------------------------------------------------- #
         if ( Data is None   ): return()
-        if ( type(Data) is not np.ndarray ):
+        if ( not( isinstance( Data, np.ndarray ) ) ):
             sys.exit( "[prepareData-@vtk_makeImageData-] Data should be np.ndarray [ERROR]" )
         if ( Data.ndim >= 5 ):
             sys.exit( "[prepareData-@vtk_makeImageData-] incorrect Data size ( ndim >= 5 ) [ERROR]" )
@@ -188,6 +435,23 @@ class vtk_makeImageData():
             self.LILJLK = self.LILJLK + (1,1,)
             Data        = Data.reshape( self.LILJLK )
 
+
+    # ------------------------------------------------- #
+    # --- prepareFields                             --- #
+    # ------------------------------------------------- #
+    def prepareFields( self, PointFields=None, CellFields=None ):
+        #  -- LILJLK from the first point field, or from the first cell field + 1 -- #
+        if   ( PointFields ):
+            Data, VectorData = next( iter( fda.resolveFields( Fields=PointFields ).values() ) )
+            self.prepareData( Data=Data, VectorData=VectorData )
+        elif ( CellFields  ):
+            Data, VectorData = next( iter( fda.resolveFields( Fields=CellFields  ).values() ) )
+            self.prepareData( Data=Data, VectorData=VectorData )
+            nDims       = Data.ndim - ( 1 if ( VectorData ) else 0 )
+            self.LILJLK = tuple( [ s+1 if ( ik < nDims ) else s for ik,s in enumerate( self.LILJLK ) ] )
+        if ( self.LILJLK is None ):
+            sys.exit( "[prepareFields-@vtk_makeImageData-] no PointData / CellData [ERROR]" )
+
     
 # ======================================== #
 # ===  実行部                          === #
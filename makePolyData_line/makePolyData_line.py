@@ -1,5 +1,13 @@
-import sys, subprocess
+import os, sys
 import numpy as np
+import vtkUtils.encodeDataArray   as eda
+import vtkUtils.appendedWriter    as apw
+import vtkUtils.compressDataArray as cda
+import vtkUtils.writeXML          as xwr
+import vtkUtils.writePieces       as pwr
+import vtkUtils.fieldData         as fda
+import vtkUtils.inquiryData       as iqd
+import vtkUtils.encodeCache       as ecc
 
 
 # ========================================================= #
@@ -10,7 +18,12 @@ class vtk_makePolyData_line():
     # --- class Initiator                           --- #
     # ------------------------------------------------- #
     def __init__( self, vtkFile=None, Data=None, xyz=None, \
-                  VectorData=False, DataFormat="ascii", ):
+                  VectorData=False, DataFormat="ascii", \
+                  compressor=None, level=None, pretty=False, \
+                  nPieces=None, nProcs=None, GhostLevel=0, lengths=None, polyline=False, \
+                  precision=None, float_format=None, downcast=False ):
+        #  -- xyz :: ( nPoints,3 ), ( nPoints,3,nLines ), list of ( n_i,3 ), or ( sum n_i,3 ) + lengths -- #
+        #  -- polyline=False :: 1 line cell per segment, True :: 1 poly_line cell per line             -- #
         # --- [1-1] Arguments                       --- #
         if ( vtkFile is None ): vtkFile = "out.vtp"
         # --- [1-2] Variables Settings              --- #
@@ -21,15 +34,84 @@ class vtk_makePolyData_line():
         self.Data         = Data
         self.DataFormat   = DataFormat
         self.VectorData   = VectorData
+        self.compressor   = compressor
+        self.level        = level
+        self.stats        = cda.compressStats()
+        self.inquiry      = iqd.inquiryCache()
+        self.pretty       = pretty
+        self.float_format = eda.floatFormat( precision=precision, float_format=float_format )
+        self.downcast     = downcast
+        self.appended     = None
+        if ( DataFormat.lower() == "appended" ):
+            self.appended = apw.appendedWriter( vtkFile=vtkFile )
         self.DataDims     = None
         self.NoLines      = None
         self.NoPoints     = None
         self.NoCoords     = None
+        self.lengths      = None
+        self.lineShape    = None
+        self.polyline     = polyline
+        self.PointFields  = {}
+        self.CellFields   = {}
         # --- [1-3] Routines                        --- #
-        self.inquireLineData( xyz=self.xyz, Data=self.Data, VectorData=self.VectorData )
+        #  -- xyz / Data are None :: builder use, add_point_data / add_cell_data, then write -- #
+        #  -- xyz without Data :: written with a zero "Line" field, dropped by add_point_data  -- #
+        self.placeholder  = False
+        if ( self.xyz is not None ):
+            self.xyz, self.lengths = self.inquireLineData( xyz=self.xyz, lengths=lengths )
+            self.Data              = self.flattenLineData( Data=self.Data )
+            if ( self.Data is None ):
+                self.Data          = np.zeros( ( self.NoPoints, ) )
+                self.placeholder   = True
+        if ( self.Data is not None ):
+            self.PointFields.update( fda.asFields( Data=self.Data, DataName="Line" ) )
+        if   ( nPieces   is not None ):
+            self.vtk_writePieces( nPieces=nPieces, nProcs=nProcs, GhostLevel=GhostLevel )
+        elif ( self.Data is not None ):
+            self.write()
+
+
+    # ------------------------------------------------- #
+    # --- add_point_data                            --- #
+    # ------------------------------------------------- #
+    def add_point_data( self, name=None, array=None, VectorData=None ):
+        if ( name  is None ): sys.exit( "[add_point_data-@makePolyData_line-] name  == ??? " )
+        if ( array is None ): sys.exit( "[add_point_data-@makePolyData_line-] array == ??? " )
+        if ( self.placeholder ):
+            self.PointFields.pop( "Line", None )
+            self.placeholder = False
+        self.PointFields[name] = ( self.flattenLineData( Data=array ), VectorData )
+        return( self )
+
+
+    # ------------------------------------------------- #
+    # --- add_cell_data                             --- #
+    # ------------------------------------------------- #
+    def add_cell_data( self, name=None, array=None, VectorData=None ):
+        #  -- 1 value ( or vector ) per line cell ( segment, or line if polyline ) -- #
+        if ( name  is None ): sys.exit( "[add_cell_data-@makePolyData_line-] name  == ??? " )
+        if ( array is None ): sys.exit( "[add_cell_data-@makePolyData_line-] array == ??? " )
+        self.CellFields[name]  = ( array, VectorData )
+        return( self )
+
+
+    # ------------------------------------------------- #
+    # --- write                                     --- #
+    # ------------------------------------------------- #
+    def write( self, path_or_fileobj=None, pretty=None ):
+        # ------------------------------------------------- #
+        # --- [1] rebuild contents from added fields    --- #
+        # ------------------------------------------------- #
+        self.vtkContents = ''
+        self.vtkEndTags  = ''
+        self.stats       = cda.compressStats()
+        if ( self.appended is not None ): self.appended.truncate( offset=0 )
         self.vtk_add_VTKFileTag( datatype="PolyData" )
-        self.vtk_add_PolyDataTag_Line( Data=self.Data, xyz=self.xyz, VectorData=self.VectorData )
-        self.vtk_writeFile()
+        self.vtk_add_PolyDataTag_Line( PointFields=self.PointFields, CellFields=self.CellFields )
+        # ------------------------------------------------- #
+        # --- [2] write to path or file object          --- #
+        # ------------------------------------------------- #
+        return( self.vtk_writeFile( vtkFile=path_or_fileobj, pretty=pretty ) )
 
         
     # ------------------------------------------------- #
@@ -40,8 +122,8 @@ class vtk_makePolyData_line():
         # --- [1] Add XML Definition & VTKFile Tag      --- #
         # ------------------------------------------------- #
         if ( datatype is None ): datatype = "ImageData"
-        self.vtkContents  += '<?xml version="1.0"?>\n'
-        self.vtkContents  += '<VTKFile type="{0}">\n'.format( datatype )
+        self.vtkContents  += '<?xml version="1.0" encoding="utf-8"?>\n'
+        self.vtkContents  += '<VTKFile type="{0}"{1}>\n'.format( datatype, eda.fileAttributes( DataFormat=self.DataFormat, compressor=self.compressor ) )
         self.vtkEndTags    = '</VTKFile>'     + '\n' + self.vtkEndTags
 
         
@@ -49,17 +131,24 @@ class vtk_makePolyData_line():
     # --- vtk_add_PolyDataTag                       --- #
     # ------------------------------------------------- #
     def vtk_add_PolyDataTag_Line( self, xyz=None, Data=None, VectorData=None, DataName="Line", \
-                                  NoPoints=None, NoSegments=None, NoVerts=0, NoStrips=0, NoPolys=0 ):
+                                  NoPoints=None, NoSegments=None, NoVerts=0, NoStrips=0, NoPolys=0, \
+                                  PointFields=None, CellFields=None, lengths=None, polyline=None ):
         # ------------------------------------------------- #
         # --- [1] Arguments                             --- #
         # ------------------------------------------------- #
-        if ( xyz        is None ): xyz        = self.xyz
-        if ( Data       is None ): Data       = self.Data
-        if ( VectorData is None ): VectorData = self.VectorData
+        #  -- Data, PointFields, CellFields :: ndarray or { DataName:ndarray or ( ndarray, VectorData ) } -- #
+        if ( xyz        is None ): xyz, lengths = self.xyz, ( self.lengths if ( lengths is None ) else lengths )
+        if ( ( Data is None ) and ( PointFields is None ) ): Data = self.Data
+        if ( polyline   is None ): polyline   = self.polyline
+        xyz, lengths     = self.inquireLineData( xyz=xyz, lengths=lengths )
+        PointFields      = { **fda.asFields( Data=self.flattenLineData( Data=Data ), DataName=DataName ), \
+                             **fda.asFields( Data=self.flattenLineData( Data=PointFields ) ) }
+        CellFields       = fda.asFields( Data=CellFields )
+        connect, offsets = self.prepareLineInfo( lengths=lengths, polyline=polyline )
         if ( NoPoints   is None ): NoPoints   = self.NoPoints
-        if ( NoSegments is None ): NoSegments = self.NoPoints-1
-        self.inquireLineData( xyz=xyz, Data=Data, VectorData=VectorData )
-        connect, offsets   = self.prepareLineInfo( NoPoints=NoPoints )
+        if ( NoSegments is None ): NoSegments = offsets.size
+        PointFields      = fda.resolveFields( Fields=PointFields, nTuples=NoPoints   )
+        CellFields       = fda.resolveFields( Fields=CellFields , nTuples=NoSegments )
         # ------------------------------------------------- #
         # --- [2] Open PolyData Tag                     --- #
         # ------------------------------------------------- #
@@ -71,9 +160,8 @@ class vtk_makePolyData_line():
         # --- [3] add Point & Line Data                 --- #
         # ------------------------------------------------- #
         #  -- [3-1] Data   -- #
-        self.vtkContents  += '<PointData {0}="{1}">\n'.format( "Scalars", DataName )
-        self.vtkContents  += self.vtk_add_DataArray( Data=Data, DataName=DataName, VectorData=False )
-        self.vtkContents  += '</PointData>\n'
+        self.vtkContents  += self.vtk_add_FieldData( Fields=PointFields, tag="PointData" )
+        self.vtkContents  += self.vtk_add_FieldData( Fields=CellFields , tag="CellData"  )
         #  -- [3-2] xyz points -- #
         self.vtkContents  += '<Points>\n'
         self.vtkContents  += self.vtk_add_DataArray( Data=xyz, DataName="points", VectorData=True )
@@ -90,6 +178,19 @@ class vtk_makePolyData_line():
         self.vtkContents  += '</PolyData>\n'
 
 
+    # ------------------------------------------------- #
+    # --- vtk_add_FieldData                         --- #
+    # ------------------------------------------------- #
+    def vtk_add_FieldData( self, Fields=None, tag="PointData" ):
+        #  -- Fields are resolved, active Scalars / Vectors :: first scalar / 3-component field -- #
+        if ( not( Fields ) ): return( "" )
+        ret  = '<{0}{1}>\n'.format( tag, fda.activeAttributes( Fields=Fields ) )
+        for DataName, ( Data, VectorData ) in Fields.items():
+            ret += self.vtk_add_DataArray( Data=Data, DataName=DataName, VectorData=VectorData )
+        ret += '</{0}>\n'.format( tag )
+        return( ret )
+
+
     # ------------------------------------------------- #
     # --- vtk_add_DataArray                         --- #
     # ------------------------------------------------- #
@@ -97,21 +198,23 @@ class vtk_makePolyData_line():
         if ( Data        is None ): sys.exit( "[vtk_add_DataArray -@makeStructuredGrid-] Data     == ??? " )
         if ( DataName    is None ): sys.exit( "[vtk_add_DataArray -@makeStructuredGrid-] DataName == ??? " )
         if ( DataFormat  is None ): DataFormat  = self.DataFormat
-        if ( DataType    is None ): DataType    = self.inquiryData( Data=Data, ret_DataType   =True, VectorData=VectorData )
-        if ( nComponents is None ): nComponents = self.inquiryData( Data=Data, ret_nComponents=True, VectorData=VectorData )
-        if ( nData       is None ): nData       = self.inquiryData( Data=Data, ret_nData      =True, VectorData=VectorData )
+        if ( self.downcast       ): Data        = eda.downcastArray( Data=Data )
+        info = self.inquiryData( Data=Data, VectorData=VectorData )
+        if ( DataType    is None ): DataType    = info["DataType"]
+        if ( nComponents is None ): nComponents = info["nComponents"]
+        if ( nData       is None ): nData       = info["nData"]
+        if ( DataFormat.lower() == "appended" ):
+            offset = self.appended.add_DataArray( Data=Data, compressor=self.compressor, level=self.level, \
+                                                  DataName=DataName, stats=self.stats, cache=ecc.sharedCache() )
+            return( '<DataArray Name="{0}" type="{1}" NumberOfComponents="{2}" format="{3}" offset="{4}"/>\n'\
+                    .format( DataName, DataType, nComponents, DataFormat, offset ) )
         ret  = ""
         ret += '<DataArray Name="{0}" type="{1}" NumberOfComponents="{2}" format="{3}">\n'\
                                  .format( DataName, DataType, nComponents, DataFormat )
-        lines = ""
-        if ( nComponents == 1 ):
-            for line in np.ravel( Data ):
-                lines += "{0} ".format( line )
-            lines += "\n"
-        else:
-            for line in Data:
-                lines += ( " ".join( [ str( val ) for val in line ] ) + "\n" )
-        ret += lines
+        ret += eda.encodeDataArray( Data=Data, DataFormat=DataFormat, rowWise=( nComponents != 1 ), \
+                                   compressor=self.compressor, level=self.level, \
+                                   DataName=DataName, stats=self.stats, cache=ecc.sharedCache(), \
+                                   float_format=self.float_format )
         ret += '</DataArray>\n'
         return( ret )
 
@@ -119,88 +222,168 @@ class vtk_makePolyData_line():
     # ------------------------------------------------- #
     # --- vtk_writeFile                             --- #
     # ------------------------------------------------- #
-    def vtk_writeFile( self, vtkFile=None ):
+    def vtk_writeFile( self, vtkFile=None, pretty=None ):
+        #  -- vtkFile :: path, or a file object opened in "wb" -- #
         if ( vtkFile is None ): vtkFile = self.vtkFile
-        with open( vtkFile, "w" ) as f:
-            f.write( self.vtkContents )
-            f.write( self.vtkEndTags  )
-        subprocess.call( ( "xmllint --format --encode utf-8 {0} -o {0}"\
-                           .format( vtkFile ) ).split() )
-        print( "[vtk_writeFile-@makePolyData_line-] VTK File output :: {0}".format( vtkFile ) )
+        if ( pretty  is None ): pretty  = self.pretty
+        with xwr.openXML( vtkFile ) as f:
+            depth = xwr.writeXML( f=f, contents=self.vtkContents, pretty=pretty )
+            if ( self.appended is not None ):
+                self.appended.writeAppendedData( f=f, indent=xwr.indentOf( depth=depth, pretty=pretty ) )
+            xwr.writeXML( f=f, contents=self.vtkEndTags, pretty=pretty, depth=depth )
+        print( "[vtk_writeFile-@makePolyData_line-] VTK File output :: {0}".format( xwr.nameOf( vtkFile ) ) )
+        return( self.stats )
 
 
     # ------------------------------------------------- #
-    # --- inquiryData                               --- #
+    # --- vtk_writePieces                           --- #
     # ------------------------------------------------- #
-    def inquiryData( self, Data=None, VectorData=False, ret_DataType=False, ret_nComponents=False, ret_nData=False ):
-        if ( Data is None ): sys.exit( "[inquiryData-@vtk_makeImageData-] Data  == ??? " )
+    def vtk_writePieces( self, nPieces=None, nProcs=None, GhostLevel=0, vtkFile=None ):
         # ------------------------------------------------- #
-        # --- [1] DataType Check                        --- #
+        # --- [1] Arguments                             --- #
         # ------------------------------------------------- #
-        if ( type(Data) is not np.ndarray ):
-            sys.exit( "[inquiryData-@vtk_makeImageData-] Data should be np.ndarray [ERROR]" )
-        if ( Data.dtype == np.int32   ): DataType = "Int32"
-        if ( Data.dtype == np.int64   ): DataType = "Int64"
-        if ( Data.dtype == np.float32 ): DataType = "Float32"
-        if ( Data.dtype == np.float64 ): DataType = "Float64"
+        #  -- 1 line  :: pieces are segment ranges, neighbouring pieces share 1 end point -- #
+        #  -- nLines :: pieces are ranges of whole lines                                -- #
+        #  -- every field of self.PointFields is sliced by the point range of each piece -- #
+        if ( nPieces  is None ): sys.exit( "[vtk_writePieces-@makePolyData_line-] nPieces == ??? " )
+        if ( self.xyz is None ): sys.exit( "[vtk_writePieces-@makePolyData_line-] xyz == ??? " )
+        if ( self.CellFields ):
+            sys.exit( "[vtk_writePieces-@makePolyData_line-] CellData is not supported with nPieces [ERROR]" )
+        if ( not( self.PointFields ) ):
+            sys.exit( "[vtk_writePieces-@makePolyData_line-] no PointData [ERROR]" )
+        if ( vtkFile  is None ): vtkFile  = self.vtkFile
+        PointFields  = fda.resolveFields( Fields=self.PointFields, nTuples=self.NoPoints )
+        if ( self.NoLines == 1 ):
+            ranges   = [ ( s0, s1+1, None ) for ( s0,s1 ) in pwr.splitRange( nItems=max( self.NoPoints-1, 1 ), nPieces=nPieces ) ]
+        else:
+            heads    = np.concatenate( [ [0], np.cumsum( self.lengths ) ] )
+            ranges   = [ ( heads[l0], heads[l1], self.lengths[l0:l1] ) \
+                         for ( l0,l1 ) in pwr.splitRange( nItems=self.NoLines, nPieces=nPieces ) ]
         # ------------------------------------------------- #
-        # --- [2] Data Shape Check                      --- #
+        # --- [2] write each piece on a process pool    --- #
         # ------------------------------------------------- #
-        if ( VectorData is True ):
-            nComponents = Data.shape[-1]
-            nData       = np.size( Data[-1][:] )
-        else:
-            nComponents = 1
-            nData       = np.size( Data[:]    )
+        pieces   = []
+        for ik,( p0,p1,lengths ) in enumerate( ranges ):
+            pieces  += [ { "vtkFile"   :pwr.pieceFileName( vtkFile=vtkFile, iPiece=ik ), \
+                           "xyz"       :self.xyz[p0:p1], "lengths":lengths, \
+                           "Data"      :{ key:( Data[p0:p1], VectorData ) for key,( Data, VectorData ) in PointFields.items() }, \
+                           "polyline"  :self.polyline, "DataFormat":self.DataFormat, \
+                           "compressor":self.compressor, "level":self.level, "pretty":self.pretty, \
+                           "float_format":self.float_format, "downcast":self.downcast } ]
+        pwr.writePieces( writer=vtk_makePolyData_line, pieces=pieces, nProcs=nProcs )
         # ------------------------------------------------- #
-        # --- [3] Return                                --- #
+        # --- [3] PPolyData summary file                --- #
         # ------------------------------------------------- #
-        if ( ret_DataType    ): return( DataType    )
-        if ( ret_nComponents ): return( nComponents )
-        if ( ret_nData       ): return( nData       )
-        return( { "DataType":DataType, "nComponents":nComponents, "nData":nData } )
+        contents     = '<?xml version="1.0" encoding="utf-8"?>\n'
+        contents    += '<VTKFile type="PPolyData"{0}>\n'.format( eda.fileAttributes( DataFormat=self.DataFormat, compressor=self.compressor ) )
+        contents    += '<PPolyData GhostLevel="{0}">\n'.format( GhostLevel )
+        contents    += pwr.summaryFields( Fields=PointFields, tag="PPointData", downcast=self.downcast )
+        contents    += '<PPoints>\n'
+        contents    += '<PDataArray type="{0}" Name="points" NumberOfComponents="{1}"/>\n'\
+            .format( eda.downcastType( DataType=self.inquiryData( Data=self.xyz, ret_DataType=True ), downcast=self.downcast ), self.NoCoords )
+        contents    += '</PPoints>\n'
+        for piece in pieces:
+            contents += '<Piece Source="{0}"/>\n'.format( os.path.basename( piece["vtkFile"] ) )
+        contents    += '</PPolyData>\n'
+        contents    += '</VTKFile>\n'
+        with open( pwr.summaryFileName( vtkFile=vtkFile ), "wb" ) as f:
+            xwr.writeXML( f=f, contents=contents, pretty=self.pretty )
+        print( "[vtk_writePieces-@makePolyData_line-] VTK File output :: {0}".format( pwr.summaryFileName( vtkFile=vtkFile ) ) )
+
+
+    # ------------------------------------------------- #
+    # --- inquiryData                               --- #
+    # ------------------------------------------------- #
+    def inquiryData( self, Data=None, VectorData=False, ret_DataType=False, ret_nComponents=False, ret_nData=False ):
+        #  -- DataType, nComponents, nData in 1 pass, memoized in self.inquiry -- #
+        if ( Data is None ): sys.exit( "[inquiryData-@vtk_makePolyData_line-] Data  == ??? " )
+        info = self.inquiry.inquire( Data=Data, VectorData=VectorData )
+        if ( ret_DataType    ): return( info["DataType"]    )
+        if ( ret_nComponents ): return( info["nComponents"] )
+        if ( ret_nData       ): return( info["nData"]       )
+        return( info )
 
 
     # ------------------------------------------------- #
     # --- vtk_inquireLineData                       --- #
     # ------------------------------------------------- #
-    def inquireLineData( self, xyz=None, Data=None, VectorData=False ):
+    def inquireLineData( self, xyz=None, lengths=None ):
         # ------------------------------------------------- #
         # --- [1] Arguments                             --- #
         # ------------------------------------------------- #
+        #  -- returns points flattened line by line, and the number of points of each line -- #
         if ( xyz  is None ): xyz  = self.xyz
         if ( xyz  is None ): return( None )
-        if ( Data is None ): Data = self.Data
-        if ( type( xyz ) is not np.ndarray ):
-            print( "[inquireLineData-@makePolyData_Line-] xyz should be np.ndarray [ERROR]" )
-        if ( xyz.ndim >= 5 ):
-            sys.exit( "[inquireLineData-@makePolyData_Line-] incorrect xyz size ( ndim >= 5 ) [ERROR]" )
-        # ------------------------------------------------- #
-        # --- [2] DataDims & LILJLK Check               --- #
-        # ------------------------------------------------- #
-        if ( VectorData is True ):
-            self.NoPoints   = xyz.shape[0]
-            self.NoCoords   = xyz.shape[1]
-            self.NoLines    = xyz.shape[2]
-        else:
-            self.NoPoints   = xyz.shape[0]
-            self.NoCoords   = xyz.shape[1]
-            self.NoLines    = 1
-            xyz             =  xyz.reshape(  xyz.shape + (1,) )
+        self.lineShape = None
+        if ( isinstance( xyz, ( list, tuple ) ) ):
+            lengths = [ len( line ) for line in xyz ]
+            xyz     = np.concatenate( xyz, axis=0 )
+        if ( not( isinstance( xyz, np.ndarray ) ) ):
+            sys.exit( "[inquireLineData-@makePolyData_Line-] xyz should be np.ndarray [ERROR]" )
+        if ( xyz.ndim >= 4 ):
+            sys.exit( "[inquireLineData-@makePolyData_Line-] incorrect xyz size ( ndim >= 4 ) [ERROR]" )
         # ------------------------------------------------- #
-        # --- [3] prepare Data                          --- #
+        # --- [2] ( nPoints,3,nLines ) => flat points   --- #
         # ------------------------------------------------- #
-        if ( Data is None ): Data = np.zeros( ( self.NoPoints, self.NoLines ) )
-        return( xyz, Data )
+        if ( xyz.ndim == 3 ):
+            self.lineShape = ( xyz.shape[0], xyz.shape[2] )
+            lengths        = [ xyz.shape[0] ]*xyz.shape[2]
+            xyz            = np.moveaxis( xyz, 2, 0 ).reshape( -1, xyz.shape[1] )
+        if ( lengths is None ): lengths = [ xyz.shape[0] ]
+        lengths         = np.asarray( lengths, dtype=np.int64 )
+        if ( lengths.sum() != xyz.shape[0] ):
+            sys.exit( "[inquireLineData-@makePolyData_Line-] sum( lengths ) != number of points [ERROR]" )
+        self.NoPoints   = xyz.shape[0]
+        self.NoCoords   = xyz.shape[1]
+        self.NoLines    = lengths.size
+        return( xyz, lengths )
+
+
+    # ------------------------------------------------- #
+    # --- flattenLineData                           --- #
+    # ------------------------------------------------- #
+    def flattenLineData( self, Data=None ):
+        #  -- point data in the same layout as xyz ( list, or ( nPoints,nLines[,nComp] ) ) => flat -- #
+        if   ( Data is None ):
+            return( None )
+        elif ( isinstance( Data, dict  ) ):
+            return( { key:self.flattenLineData( Data=val ) for key,val in Data.items() } )
+        elif ( isinstance( Data, tuple ) and ( len( Data ) == 2 ) and isinstance( Data[1], ( bool, type(None) ) ) ):
+            return( ( self.flattenLineData( Data=Data[0] ), Data[1] ) )
+        elif ( isinstance( Data, ( list, tuple ) ) ):
+            return( np.concatenate( Data, axis=0 ) )
+        elif ( ( self.lineShape is not None ) and ( Data.shape[:2] == self.lineShape ) ):
+            return( np.moveaxis( Data, 1, 0 ).reshape( ( -1, ) + Data.shape[2:] ) )
+        return( Data )
 
     
     # ------------------------------------------------- #
     # --- prepareLineInfo                           --- #
     # ------------------------------------------------- #
-    def prepareLineInfo( self, NoPoints=None ):
+    def prepareLineInfo( self, NoPoints=None, lengths=None, polyline=False ):
+        # ------------------------------------------------- #
+        # --- [1] Arguments                             --- #
+        # ------------------------------------------------- #
         if ( NoPoints is None ): NoPoints = self.NoPoints
-        connect = np.ravel( np.array( [ [ ik, ik+1 ] for ik in range( NoPoints-1 ) ] ) )
-        offsets = np.ravel( np.array( [ 2*(ik+1)     for ik in range( NoPoints-1 ) ] ) )
+        if ( lengths  is None ): lengths  = [ NoPoints ]
+        lengths  = np.asarray( lengths, dtype=np.int64 )
+        heads    = np.cumsum( lengths ) - lengths
+        # ------------------------------------------------- #
+        # --- [2] 1 poly_line cell per line             --- #
+        # ------------------------------------------------- #
+        if ( polyline ):
+            connect = np.arange( lengths.sum(), dtype=np.int64 )
+            offsets = np.cumsum( lengths[ lengths > 0 ] )
+            return( connect, offsets )
+        # ------------------------------------------------- #
+        # --- [3] 1 line cell per segment               --- #
+        # ------------------------------------------------- #
+        #  -- every point except the last one of each line starts a segment -- #
+        starts   = np.ones( ( lengths.sum(), ), dtype=bool )
+        starts[ ( heads + lengths - 1 )[ lengths > 0 ] ] = False
+        starts   = np.flatnonzero( starts ).astype( np.int64 )
+        connect  = np.ravel( np.stack( [ starts, starts+1 ], axis=1 ) )
+        offsets  = 2 * np.arange( 1, starts.size+1, dtype=np.int64 )
         return( connect, offsets )
 
         
@@ -0,0 +1,229 @@
+import sys
+import numpy as np
+import vtkUtils.encodeDataArray   as eda
+import vtkUtils.appendedWriter    as apw
+import vtkUtils.compressDataArray as cda
+import vtkUtils.writeXML          as xwr
+import vtkUtils.fieldData         as fda
+import vtkUtils.streamArray       as sta
+import vtkUtils.rangeArray        as rga
+import vtkUtils.inquiryData       as iqd
+
+
+# ========================================================= #
+# ===  vtk_makePolyData_points class                    === #
+# ========================================================= #
+class vtk_makePolyData_points():
+    # ------------------------------------------------- #
+    # --- class Initiator                           --- #
+    # ------------------------------------------------- #
+    #  -- blocks :: iterable of ( xyz, Data ), Data :: ndarray or { name:ndarray }        -- #
+    #  -- each block is spooled to disk as it comes, memory is bounded by 1 block's size -- #
+    def __init__( self, vtkFile=None, xyz=None, Data=None, blocks=None, DataFormat="appended", \
+                  compressor=None, level=None, pretty=False ):
+        # --- [1-1] Arguments                       --- #
+        if ( vtkFile is None ): vtkFile = "out.vtp"
+        if ( DataFormat.lower() != "appended" ):
+            sys.exit( "[vtk_makePolyData_points] blocks are streamed to DataFormat=\"appended\" only [ERROR]" )
+        # --- [1-2] Variables Settings              --- #
+        self.vtkFile      = vtkFile
+        self.vtkContents  = ''
+        self.vtkEndTags   = ''
+        self.DataFormat   = DataFormat
+        self.compressor   = compressor
+        self.level        = level
+        self.stats        = cda.compressStats()
+        self.pretty       = pretty
+        self.appended     = apw.appendedWriter( vtkFile=vtkFile )
+        self.NoPoints     = 0
+        self.points       = None
+        self.fields       = None
+        # --- [1-3] Routines                        --- #
+        #  -- xyz / blocks is None :: builder use, add_block / add_blocks, then write -- #
+        if ( xyz    is not None ): self.add_block ( xyz=xyz, Data=Data )
+        if ( blocks is not None ): self.add_blocks( blocks=blocks )
+        if ( ( xyz is not None ) or ( blocks is not None ) ):
+            self.write()
+
+
+    # ------------------------------------------------- #
+    # --- add_blocks                                --- #
+    # ------------------------------------------------- #
+    def add_blocks( self, blocks=None ):
+        if ( blocks is None ): sys.exit( "[add_blocks-@makePolyData_points-] blocks == ??? " )
+        #  -- block :: xyz, or any ( xyz, Data ) sequence ( tuple, list, ... ) -- #
+        for block in blocks:
+            if ( isinstance( block, np.ndarray ) ):
+                self.add_block( xyz=block )
+            else:
+                block = list( block )
+                self.add_block( xyz=block[0], Data=( block[1] if ( len( block ) > 1 ) else None ) )
+        return( self )
+
+
+    # ------------------------------------------------- #
+    # --- add_block                                 --- #
+    # ------------------------------------------------- #
+    def add_block( self, xyz=None, Data=None ):
+        # ------------------------------------------------- #
+        # --- [1] Arguments                             --- #
+        # ------------------------------------------------- #
+        if ( xyz is None ): sys.exit( "[add_block-@makePolyData_points-] xyz == ??? " )
+        if ( ( not( isinstance( xyz, np.ndarray ) ) ) or ( xyz.ndim != 2 ) ):
+            sys.exit( "[add_block-@makePolyData_points-] xyz should be ( nPoints,3 ) np.ndarray [ERROR]" )
+        nPoints = xyz.shape[0]
+        Fields  = fda.resolveFields( Fields=fda.asFields( Data=Data ), nTuples=nPoints )
+        # ------------------------------------------------- #
+        # --- [2] open streams on the 1st block         --- #
+        # ------------------------------------------------- #
+        if ( self.points is None ):
+            self.points = sta.streamArray( vtkFile=self.vtkFile, DataName="points", VectorData=True )
+            self.fields = { key:sta.streamArray( vtkFile=self.vtkFile, DataName=key, VectorData=VectorData ) \
+                            for key,( Field, VectorData ) in Fields.items() }
+        if ( list( Fields.keys() ) != list( self.fields.keys() ) ):
+            sys.exit( "[add_block-@makePolyData_points-] block fields {0} != {1} [ERROR]"\
+                      .format( list( Fields.keys() ), list( self.fields.keys() ) ) )
+        # ------------------------------------------------- #
+        # --- [3] spool points and fields               --- #
+        # ------------------------------------------------- #
+        self.points.append( Data=xyz )
+        for key,( Field, VectorData ) in Fields.items():
+            if ( Field.shape[0] != nPoints ):
+                sys.exit( "[add_block-@makePolyData_points-] {0} :: {1} values for {2} points [ERROR]"\
+                          .format( key, Field.shape[0], nPoints ) )
+            self.fields[key].append( Data=Field )
+        self.NoPoints += nPoints
+        return( self )
+
+
+    # ------------------------------------------------- #
+    # --- write                                     --- #
+    # ------------------------------------------------- #
+    def write( self, path_or_fileobj=None, pretty=None ):
+        # ------------------------------------------------- #
+        # --- [1] rebuild contents from the streams     --- #
+        # ------------------------------------------------- #
+        if ( self.points is None ): sys.exit( "[write-@makePolyData_points-] no block was added [ERROR]" )
+        self.vtkContents = ''
+        self.vtkEndTags  = ''
+        self.stats       = cda.compressStats()
+        self.appended.truncate( offset=0 )
+        self.vtk_add_VTKFileTag( datatype="PolyData" )
+        self.vtk_add_PolyDataTag_Verts()
+        # ------------------------------------------------- #
+        # --- [2] write to path or file object          --- #
+        # ------------------------------------------------- #
+        return( self.vtk_writeFile( vtkFile=path_or_fileobj, pretty=pretty ) )
+
+
+    # ------------------------------------------------- #
+    # --- vtk_add_VTKFileTag                        --- #
+    # ------------------------------------------------- #
+    def vtk_add_VTKFileTag( self, datatype=None ):
+        # ------------------------------------------------- #
+        # --- [1] Add XML Definition & VTKFile Tag      --- #
+        # ------------------------------------------------- #
+        if ( datatype is None ): datatype = "PolyData"
+        self.vtkContents  += '<?xml version="1.0" encoding="utf-8"?>\n'
+        self.vtkContents  += '<VTKFile type="{0}"{1}>\n'.format( datatype, eda.fileAttributes( DataFormat=self.DataFormat, compressor=self.compressor ) )
+        self.vtkEndTags    = '</VTKFile>'     + '\n' + self.vtkEndTags
+
+
+    # ------------------------------------------------- #
+    # --- vtk_add_PolyDataTag_Verts                 --- #
+    # ------------------------------------------------- #
+    def vtk_add_PolyDataTag_Verts( self ):
+        # ------------------------------------------------- #
+        # --- [1] Open PolyData Tag                     --- #
+        # ------------------------------------------------- #
+        self.vtkContents  += '<PolyData>\n'
+        self.vtkContents  += '<Piece NumberOfPoints="{0}" NumberOfVerts="{0}" ' \
+                             'NumberOfLines="0" NumberOfStrips="0" NumberOfPolys="0">\n'\
+                             .format( self.NoPoints )
+        # ------------------------------------------------- #
+        # --- [2] PointData / Points / Verts            --- #
+        # ------------------------------------------------- #
+        if ( self.fields ):
+            Fields = { key:( stream.sample, stream.VectorData ) for key,stream in self.fields.items() }
+            self.vtkContents  += '<PointData{0}>\n'.format( fda.activeAttributes( Fields=Fields ) )
+            for key,stream in self.fields.items():
+                self.vtkContents  += self.vtk_add_StreamArray( stream=stream )
+            self.vtkContents  += '</PointData>\n'
+        self.vtkContents  += '<Points>\n'
+        self.vtkContents  += self.vtk_add_StreamArray( stream=self.points )
+        self.vtkContents  += '</Points>\n'
+        #  -- 1 vertex / point :: connectivity 0..n-1, offsets 1..n, generated chunk by chunk at write -- #
+        self.vtkContents  += '<Verts>\n'
+        self.vtkContents  += self.vtk_add_RangeArray( Data=rga.rangeArray( nData=self.NoPoints, start=0 ), \
+                                                      DataName="connectivity" )
+        self.vtkContents  += self.vtk_add_RangeArray( Data=rga.rangeArray( nData=self.NoPoints, start=1 ), \
+                                                      DataName="offsets" )
+        self.vtkContents  += '</Verts>\n'
+        # ------------------------------------------------- #
+        # --- [3] Close PolyData Tags                   --- #
+        # ------------------------------------------------- #
+        self.vtkContents  += '</Piece>\n'
+        self.vtkContents  += '</PolyData>\n'
+
+
+    # ------------------------------------------------- #
+    # --- vtk_add_StreamArray                       --- #
+    # ------------------------------------------------- #
+    def vtk_add_StreamArray( self, stream=None ):
+        if ( stream is None ): sys.exit( "[vtk_add_StreamArray -@makePolyData_points-] stream == ??? " )
+        offset = self.appended.add_Stream( stream=stream, compressor=self.compressor, level=self.level, \
+                                           stats=self.stats )
+        return( '<DataArray Name="{0}" type="{1}" NumberOfComponents="{2}" format="{3}" offset="{4}"/>\n'\
+                .format( stream.DataName, stream.info["DataType"], stream.info["nComponents"], \
+                         self.DataFormat, offset ) )
+
+
+    # ------------------------------------------------- #
+    # --- vtk_add_RangeArray                        --- #
+    # ------------------------------------------------- #
+    def vtk_add_RangeArray( self, Data=None, DataName=None ):
+        #  -- rangeArray :: encoded into the appended section slab by slab, never spooled as a whole -- #
+        if ( Data is None ): sys.exit( "[vtk_add_RangeArray -@makePolyData_points-] Data == ??? " )
+        offset = self.appended.add_DataArray( Data=Data, compressor=self.compressor, level=self.level, \
+                                              DataName=DataName, stats=self.stats )
+        return( '<DataArray Name="{0}" type="{1}" NumberOfComponents="1" format="{2}" offset="{3}"/>\n'\
+                .format( DataName, iqd.inquiryData( Data=Data )["DataType"], self.DataFormat, offset ) )
+
+
+    # ------------------------------------------------- #
+    # --- vtk_writeFile                             --- #
+    # ------------------------------------------------- #
+    def vtk_writeFile( self, vtkFile=None, pretty=None ):
+        #  -- vtkFile :: path, or a file object opened in "wb" -- #
+        if ( vtkFile is None ): vtkFile = self.vtkFile
+        if ( pretty  is None ): pretty  = self.pretty
+        with xwr.openXML( vtkFile ) as f:
+            depth = xwr.writeXML( f=f, contents=self.vtkContents, pretty=pretty )
+            self.appended.writeAppendedData( f=f, indent=xwr.indentOf( depth=depth, pretty=pretty ) )
+            xwr.writeXML( f=f, contents=self.vtkEndTags, pretty=pretty, depth=depth )
+        print( "[vtk_writeFile-@makePolyData_points-] VTK File output :: {0}".format( xwr.nameOf( vtkFile ) ) )
+        return( self.stats )
+
+
+    # ------------------------------------------------- #
+    # --- close                                     --- #
+    # ------------------------------------------------- #
+    def close( self ):
+        for stream in [ self.points ] + list( ( self.fields or {} ).values() ):
+            if ( stream is not None ): stream.close()
+        self.appended.close()
+
+
+# ======================================== #
+# ===  実行部                          === #
+# ======================================== #
+if ( __name__=="__main__" ):
+    nBlocks = 10
+    nPoints = 10**5
+    def blocks():
+        rng = np.random.default_rng( 0 )
+        for ik in range( nBlocks ):
+            xyz = rng.standard_normal( ( nPoints,3 ) ).astype( np.float32 )
+            yield( xyz, { "radius":np.linalg.norm( xyz, axis=1 ), "velocity":-xyz } )
+    vtk     = vtk_makePolyData_points( blocks=blocks(), compressor="zlib" )
+    print( vtk.stats )
@@ -0,0 +1,276 @@
+import sys
+import numpy as np
+import vtkUtils.encodeDataArray   as eda
+import vtkUtils.appendedWriter    as apw
+import vtkUtils.compressDataArray as cda
+import vtkUtils.writeXML          as xwr
+import vtkUtils.fieldData         as fda
+import vtkUtils.inquiryData       as iqd
+import vtkUtils.encodeCache       as ecc
+import vtkUtils.triangleStrips    as tst
+
+
+# ========================================================= #
+# ===  vtk_makePolyData_surface class                   === #
+# ========================================================= #
+class vtk_makePolyData_surface():
+    # ------------------------------------------------- #
+    # --- class Initiator                           --- #
+    # ------------------------------------------------- #
+    #  -- Node :: ( nNodes,3 ), Elem :: ( nElems,3 ) triangles or ( nElems,4 ) quads  -- #
+    #  -- strips=False :: 1 <Polys> cell per Elem, True :: triangles merged into <Strips> -- #
+    #  --   ( stripify ~1 s per 10^6 triangles, connectivity ~1/3 of <Polys> )           -- #
+    def __init__( self, vtkFile=None, Data=None, Node=None, Elem=None, \
+                  VectorData=False, DataFormat="ascii", \
+                  compressor=None, level=None, pretty=False, strips=False, \
+                  precision=None, float_format=None, downcast=False ):
+        # --- [1-1] Arguments                       --- #
+        if ( vtkFile is None ): vtkFile = "out.vtp"
+        # --- [1-2] Variables Settings              --- #
+        self.vtkFile     = vtkFile
+        self.vtkContents = ''
+        self.vtkEndTags  = ''
+        self.Data        = Data
+        self.Node        = Node
+        self.Elem        = Elem
+        self.DataFormat  = DataFormat
+        self.VectorData  = VectorData
+        self.compressor  = compressor
+        self.level       = level
+        self.stats       = cda.compressStats()
+        self.inquiry     = iqd.inquiryCache()
+        self.pretty      = pretty
+        self.float_format = eda.floatFormat( precision=precision, float_format=float_format )
+        self.downcast    = downcast
+        self.appended    = None
+        if ( DataFormat.lower() == "appended" ):
+            self.appended = apw.appendedWriter( vtkFile=vtkFile )
+        self.strips      = strips
+        self.PointFields = {}
+        self.CellFields  = {}
+        # --- [1-3] Routines                        --- #
+        #  -- Data is None :: builder use, add_point_data / add_cell_data, then write -- #
+        if ( self.Data is not None ):
+            self.CellFields.update( fda.asFields( Data=self.Data, DataName="Data", VectorData=self.VectorData ) )
+            self.write()
+
+
+    # ------------------------------------------------- #
+    # --- add_point_data                            --- #
+    # ------------------------------------------------- #
+    def add_point_data( self, name=None, array=None, VectorData=None ):
+        if ( name  is None ): sys.exit( "[add_point_data-@makePolyData_surface-] name  == ??? " )
+        if ( array is None ): sys.exit( "[add_point_data-@makePolyData_surface-] array == ??? " )
+        self.PointFields[name] = ( array, VectorData )
+        return( self )
+
+
+    # ------------------------------------------------- #
+    # --- add_cell_data                             --- #
+    # ------------------------------------------------- #
+    def add_cell_data( self, name=None, array=None, VectorData=None ):
+        if ( name  is None ): sys.exit( "[add_cell_data-@makePolyData_surface-] name  == ??? " )
+        if ( array is None ): sys.exit( "[add_cell_data-@makePolyData_surface-] array == ??? " )
+        self.CellFields[name]  = ( array, VectorData )
+        return( self )
+
+
+    # ------------------------------------------------- #
+    # --- write                                     --- #
+    # ------------------------------------------------- #
+    def write( self, path_or_fileobj=None, pretty=None ):
+        # ------------------------------------------------- #
+        # --- [1] rebuild contents from added fields    --- #
+        # ------------------------------------------------- #
+        self.vtkContents = ''
+        self.vtkEndTags  = ''
+        self.stats       = cda.compressStats()
+        if ( self.appended is not None ): self.appended.truncate( offset=0 )
+        self.vtk_add_VTKFileTag( datatype="PolyData" )
+        self.vtk_add_PolyDataTag_Surface( Node=self.Node, Elem=self.Elem, strips=self.strips, \
+                                          PointFields=self.PointFields, CellFields=self.CellFields )
+        # ------------------------------------------------- #
+        # --- [2] write to path or file object          --- #
+        # ------------------------------------------------- #
+        return( self.vtk_writeFile( vtkFile=path_or_fileobj, pretty=pretty ) )
+
+
+    # ------------------------------------------------- #
+    # --- vtk_add_VTKFileTag                        --- #
+    # ------------------------------------------------- #
+    def vtk_add_VTKFileTag( self, datatype=None ):
+        # ------------------------------------------------- #
+        # --- [1] Add XML Definition & VTKFile Tag      --- #
+        # ------------------------------------------------- #
+        if ( datatype is None ): datatype = "PolyData"
+        self.vtkContents  += '<?xml version="1.0" encoding="utf-8"?>\n'
+        self.vtkContents  += '<VTKFile type="{0}"{1}>\n'.format( datatype, eda.fileAttributes( DataFormat=self.DataFormat, compressor=self.compressor ) )
+        self.vtkEndTags    = '</VTKFile>'     + '\n' + self.vtkEndTags
+
+
+    # ------------------------------------------------- #
+    # --- vtk_add_PolyDataTag_Surface               --- #
+    # ------------------------------------------------- #
+    def vtk_add_PolyDataTag_Surface( self, Data=None, Node=None, Elem=None, DataName="Data", \
+                                     VectorData=False, strips=False, PointFields=None, CellFields=None ):
+        # ------------------------------------------------- #
+        # --- [1] Arguments                             --- #
+        # ------------------------------------------------- #
+        #  -- Data, PointFields, CellFields :: ndarray or { DataName:ndarray or ( ndarray, VectorData ) } -- #
+        if ( Node        is None ): sys.exit( "[vtk_add_PolyDataTag_Surface-@makePolyData_surface-] Node == ??? " )
+        if ( Elem        is None ): sys.exit( "[vtk_add_PolyDataTag_Surface-@makePolyData_surface-] Elem == ??? " )
+        PointFields      = fda.asFields( Data=PointFields )
+        CellFields       = { **fda.asFields( Data=Data, DataName=DataName, VectorData=VectorData ), \
+                             **fda.asFields( Data=CellFields ) }
+        nNodes           = Node.shape[0]
+        nElems           = Elem.shape[0]
+        connect, offsets = self.prepareSurfaceInfo( Elem=Elem, strips=strips )
+        nCells           = offsets.size
+        if ( strips and CellFields ):
+            #  -- a strip is 1 cell made of many Elem, per-Elem values can not follow it -- #
+            sys.exit( "[vtk_add_PolyDataTag_Surface-@makePolyData_surface-] strips=True takes PointData only [ERROR]" )
+        PointFields      = fda.resolveFields( Fields=PointFields, nTuples=nNodes )
+        CellFields       = fda.resolveFields( Fields=CellFields , nTuples=nCells )
+        NoPolys, NoStrips = ( 0, nCells ) if ( strips ) else ( nCells, 0 )
+        # ------------------------------------------------- #
+        # --- [2] Open PolyData Tag                     --- #
+        # ------------------------------------------------- #
+        self.vtkContents  += '<PolyData>\n'
+        self.vtkContents  += '<Piece NumberOfPoints="{0}" NumberOfVerts="0" NumberOfLines="0" ' \
+                             'NumberOfStrips="{1}" NumberOfPolys="{2}">\n'\
+                             .format( nNodes, NoStrips, NoPolys )
+        # ------------------------------------------------- #
+        # --- [3] PointData / CellData / Points         --- #
+        # ------------------------------------------------- #
+        self.vtkContents  += self.vtk_add_FieldData( Fields=PointFields, tag="PointData" )
+        self.vtkContents  += self.vtk_add_FieldData( Fields=CellFields , tag="CellData"  )
+        self.vtkContents  += '<Points>\n'
+        self.vtkContents  += self.vtk_add_DataArray( Data=Node, DataName="points", VectorData=True )
+        self.vtkContents  += '</Points>\n'
+        # ------------------------------------------------- #
+        # --- [4] Polys or Strips                       --- #
+        # ------------------------------------------------- #
+        tag                = "Strips" if ( strips ) else "Polys"
+        self.vtkContents  += '<{0}>\n'.format( tag )
+        self.vtkContents  += self.vtk_add_DataArray( Data=connect, DataName="connectivity", VectorData=False )
+        self.vtkContents  += self.vtk_add_DataArray( Data=offsets, DataName="offsets"     , VectorData=False )
+        self.vtkContents  += '</{0}>\n'.format( tag )
+        # ------------------------------------------------- #
+        # --- [5] Close PolyData Tags                   --- #
+        # ------------------------------------------------- #
+        self.vtkContents  += '</Piece>\n'
+        self.vtkContents  += '</PolyData>\n'
+
+
+    # ------------------------------------------------- #
+    # --- vtk_add_FieldData                         --- #
+    # ------------------------------------------------- #
+    def vtk_add_FieldData( self, Fields=None, tag="PointData" ):
+        #  -- Fields are resolved, active Scalars / Vectors :: first scalar / 3-component field -- #
+        if ( not( Fields ) ): return( "" )
+        ret  = '<{0}{1}>\n'.format( tag, fda.activeAttributes( Fields=Fields ) )
+        for DataName, ( Data, VectorData ) in Fields.items():
+            ret += self.vtk_add_DataArray( Data=Data, DataName=DataName, VectorData=VectorData )
+        ret += '</{0}>\n'.format( tag )
+        return( ret )
+
+
+    # ------------------------------------------------- #
+    # --- vtk_add_DataArray                         --- #
+    # ------------------------------------------------- #
+    def vtk_add_DataArray( self, Data=None, DataName=None, DataFormat=None, DataType=None, nComponents=None, nData=None, VectorData=False ):
+        if ( Data        is None ): sys.exit( "[vtk_add_DataArray -@makePolyData_surface-] Data     == ??? " )
+        if ( DataName    is None ): sys.exit( "[vtk_add_DataArray -@makePolyData_surface-] DataName == ??? " )
+        if ( DataFormat  is None ): DataFormat  = self.DataFormat
+        if ( self.downcast       ): Data        = eda.downcastArray( Data=Data )
+        info = self.inquiryData( Data=Data, VectorData=VectorData )
+        if ( DataType    is None ): DataType    = info["DataType"]
+        if ( nComponents is None ): nComponents = info["nComponents"]
+        if ( nData       is None ): nData       = info["nData"]
+        if ( DataFormat.lower() == "appended" ):
+            offset = self.appended.add_DataArray( Data=Data, compressor=self.compressor, level=self.level, \
+                                                  DataName=DataName, stats=self.stats, cache=ecc.sharedCache() )
+            return( '<DataArray Name="{0}" type="{1}" NumberOfComponents="{2}" format="{3}" offset="{4}"/>\n'\
+                    .format( DataName, DataType, nComponents, DataFormat, offset ) )
+        ret  = ""
+        ret += '<DataArray Name="{0}" type="{1}" NumberOfComponents="{2}" format="{3}">\n'\
+                                 .format( DataName, DataType, nComponents, DataFormat )
+        ret += eda.encodeDataArray( Data=Data, DataFormat=DataFormat, rowWise=( nComponents != 1 ), \
+                                   compressor=self.compressor, level=self.level, \
+                                   DataName=DataName, stats=self.stats, cache=ecc.sharedCache(), \
+                                   float_format=self.float_format )
+        ret += '</DataArray>\n'
+        return( ret )
+
+
+    # ------------------------------------------------- #
+    # --- vtk_writeFile                             --- #
+    # ------------------------------------------------- #
+    def vtk_writeFile( self, vtkFile=None, pretty=None ):
+        #  -- vtkFile :: path, or a file object opened in "wb" -- #
+        if ( vtkFile is None ): vtkFile = self.vtkFile
+        if ( pretty  is None ): pretty  = self.pretty
+        with xwr.openXML( vtkFile ) as f:
+            depth = xwr.writeXML( f=f, contents=self.vtkContents, pretty=pretty )
+            if ( self.appended is not None ):
+                self.appended.writeAppendedData( f=f, indent=xwr.indentOf( depth=depth, pretty=pretty ) )
+            xwr.writeXML( f=f, contents=self.vtkEndTags, pretty=pretty, depth=depth )
+        print( "[vtk_writeFile-@makePolyData_surface-] VTK File output :: {0}".format( xwr.nameOf( vtkFile ) ) )
+        return( self.stats )
+
+
+    # ------------------------------------------------- #
+    # --- inquiryData                               --- #
+    # ------------------------------------------------- #
+    def inquiryData( self, Data=None, VectorData=False, ret_DataType=False, ret_nComponents=False, ret_nData=False ):
+        #  -- DataType, nComponents, nData in 1 pass, memoized in self.inquiry -- #
+        if ( Data is None ): sys.exit( "[inquiryData-@vtk_makePolyData_surface-] Data  == ??? " )
+        info = self.inquiry.inquire( Data=Data, VectorData=VectorData )
+        if ( ret_DataType    ): return( info["DataType"]    )
+        if ( ret_nComponents ): return( info["nComponents"] )
+        if ( ret_nData       ): return( info["nData"]       )
+        return( info )
+
+
+    # ------------------------------------------------- #
+    # --- prepareSurfaceInfo                        --- #
+    # ------------------------------------------------- #
+    def prepareSurfaceInfo( self, Elem=None, strips=False ):
+        # ------------------------------------------------- #
+        # --- [1] Arguments                             --- #
+        # ------------------------------------------------- #
+        if ( Elem is None ): Elem = self.Elem
+        if ( ( not( isinstance( Elem, np.ndarray ) ) ) or ( Elem.ndim != 2 ) or ( Elem.shape[1] < 3 ) ):
+            sys.exit( "[prepareSurfaceInfo-@vtk_makePolyData_surface-] Elem should be ( nElems,nVerts>=3 ) np.ndarray [ERROR]" )
+        # ------------------------------------------------- #
+        # --- [2] Strips :: greedy triangle strips      --- #
+        # ------------------------------------------------- #
+        if ( strips ):
+            return( tst.stripify( Elem=Elem ) )
+        # ------------------------------------------------- #
+        # --- [3] Polys  :: 1 polygon per Elem          --- #
+        # ------------------------------------------------- #
+        nElems, nVerts = Elem.shape
+        connect  = Elem.astype( np.int64, copy=False ).ravel()
+        offsets  = ( np.arange( nElems, dtype=np.int64 ) + 1 ) * nVerts
+        return( connect, offsets )
+
+
+# ======================================== #
+# ===  実行部                          === #
+# ======================================== #
+if ( __name__=="__main__" ):
+    #  -- sphere surface from a ( nTheta,nPhi ) grid of quads, split into triangles -- #
+    nT, nP  = 64, 128
+    theta   = np.linspace( 0.0, np.pi, nT )
+    phi     = np.linspace( 0.0, 2.0*np.pi, nP, endpoint=False )
+    tt, pp  = np.meshgrid( theta, phi, indexing="ij" )
+    Node    = np.stack( [ np.sin(tt)*np.cos(pp), np.sin(tt)*np.sin(pp), np.cos(tt) ], axis=-1 ).reshape( -1,3 )
+    ii, jj  = np.meshgrid( np.arange( nT-1 ), np.arange( nP ), indexing="ij" )
+    n00     = ( ii*nP + jj ).ravel()
+    n01     = ( ii*nP + ( jj+1 )%nP ).ravel()
+    Quad    = np.stack( [ n00, n01, n01+nP, n00+nP ], axis=1 )
+    Elem    = np.concatenate( [ Quad[:,[0,1,2]], Quad[:,[0,2,3]] ], axis=0 )
+    vtk     = vtk_makePolyData_surface( vtkFile="out_polys.vtp", Node=Node, Elem=Elem, Data=Node[Elem[:,0],2] )
+    vtk     = vtk_makePolyData_surface( vtkFile="out_strips.vtp", Node=Node, Elem=Elem, strips=True )
+    vtk.add_point_data( name="height", array=Node[:,2] ).write()
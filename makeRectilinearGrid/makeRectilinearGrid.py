@@ -1,5 +1,14 @@
-import sys, subprocess
+import os, sys
 import numpy as np
+import vtkUtils.encodeDataArray   as eda
+import vtkUtils.appendedWriter    as apw
+import vtkUtils.compressDataArray as cda
+import vtkUtils.writeXML          as xwr
+import vtkUtils.writePieces       as pwr
+import vtkUtils.fieldData         as fda
+import vtkUtils.inquiryData       as iqd
+import vtkUtils.encodeCache       as ecc
+import vtkUtils.quantizeData      as qnt
 
 
 # ========================================================= #
@@ -10,9 +19,11 @@ class vtk_makeRectilinearGrid():
     # --- class Initiator                           --- #
     # ------------------------------------------------- #
     def __init__( self, vtkFile=None, Data=None, Axis=None, VectorData=False, \
-                  xAxis=None, yAxis=None, zAxis=None, DataFormat="ascii" ):
+                  xAxis=None, yAxis=None, zAxis=None, DataFormat="ascii", \
+                  compressor=None, level=None, pretty=False, WholeExtent=None, \
+                  nPieces=None, nProcs=None, GhostLevel=0, \
+                  precision=None, float_format=None, downcast=False, quantize=None ):
         # --- [1-1] Arguments                       --- #
-        if ( Data    is None ): sys.exit( "[vtk_makeRectilinearGrid] Data == ??? " )
         if ( vtkFile is None ): vtkFile = "out.vtr"
         # --- [1-2] Variables Settings              --- #
         self.vtkFile     = vtkFile
@@ -22,11 +33,72 @@ class vtk_makeRectilinearGrid():
         self.Axis        = Axis
         self.DataFormat  = DataFormat
         self.VectorData  = VectorData
+        self.compressor  = compressor
+        self.level       = level
+        self.stats       = cda.compressStats()
+        self.inquiry     = iqd.inquiryCache()
+        self.pretty      = pretty
+        self.float_format = eda.floatFormat( precision=precision, float_format=float_format )
+        self.downcast    = downcast
+        self.quantize    = quantize
+        self.quantization = {}
+        self.appended    = None
+        if ( DataFormat.lower() == "appended" ):
+            self.appended = apw.appendedWriter( vtkFile=vtkFile )
+        self.WholeExtent = WholeExtent
+        self.LILJLK      = None
+        self.PointFields = {}
+        self.CellFields  = {}
         # --- [1-3] Routines                        --- #
-        self.vtk_add_VTKFileTag  ( datatype="RectilinearGrid" )
+        #  -- Data is None :: builder use, add_point_data / add_cell_data, then write -- #
         self.prepareAxis ( xAxis=xAxis, yAxis=yAxis, zAxis=zAxis )
-        self.vtk_add_RectilinearGridTag( Data=self.Data, Axis=self.Axis, VectorData=self.VectorData )
-        self.vtk_writeFile()
+        if ( self.Data is not None ):
+            self.PointFields.update( fda.asFields( Data=self.Data, DataName="Data", VectorData=self.VectorData ) )
+        if   ( nPieces   is not None ):
+            self.vtk_writePieces( nPieces=nPieces, nProcs=nProcs, GhostLevel=GhostLevel )
+        elif ( self.Data is not None ):
+            self.write()
+
+
+    # ------------------------------------------------- #
+    # --- add_point_data                            --- #
+    # ------------------------------------------------- #
+    def add_point_data( self, name=None, array=None, VectorData=None ):
+        if ( name  is None ): sys.exit( "[add_point_data-@makeRectilinearGrid-] name  == ??? " )
+        if ( array is None ): sys.exit( "[add_point_data-@makeRectilinearGrid-] array == ??? " )
+        self.PointFields[name] = ( array, VectorData )
+        return( self )
+
+
+    # ------------------------------------------------- #
+    # --- add_cell_data                             --- #
+    # ------------------------------------------------- #
+    def add_cell_data( self, name=None, array=None, VectorData=None ):
+        if ( name  is None ): sys.exit( "[add_cell_data-@makeRectilinearGrid-] name  == ??? " )
+        if ( array is None ): sys.exit( "[add_cell_data-@makeRectilinearGrid-] array == ??? " )
+        self.CellFields[name]  = ( array, VectorData )
+        return( self )
+
+
+    # ------------------------------------------------- #
+    # --- write                                     --- #
+    # ------------------------------------------------- #
+    def write( self, path_or_fileobj=None, pretty=None ):
+        # ------------------------------------------------- #
+        # --- [1] rebuild contents from added fields    --- #
+        # ------------------------------------------------- #
+        self.vtkContents = ''
+        self.vtkEndTags  = ''
+        self.stats       = cda.compressStats()
+        if ( self.appended is not None ): self.appended.truncate( offset=0 )
+        self.vtk_add_VTKFileTag  ( datatype="RectilinearGrid" )
+        self.vtk_add_RectilinearGridTag( Axis=self.Axis, PointFields=self.PointFields, CellFields=self.CellFields, \
+                                         WholeExtent=self.WholeExtent )
+        # ------------------------------------------------- #
+        # --- [2] write to path or file object          --- #
+        # ------------------------------------------------- #
+        return( self.vtk_writeFile( vtkFile=path_or_fileobj, pretty=pretty ) )
+
         
     # ------------------------------------------------- #
     # --- vtk_add_VTKFileTag                        --- #
@@ -36,41 +108,48 @@ class vtk_makeRectilinearGrid():
         # --- [1] Add XML Definition & VTKFile Tag      --- #
         # ------------------------------------------------- #
         if ( datatype is None ): datatype = "RectilinearGrid"
-        self.vtkContents  = self.vtkContents + '<?xml version="1.0"?>\n'
-        self.vtkContents  = self.vtkContents + '<VTKFile type="{0}">\n'.format( datatype )
+        self.vtkContents  = self.vtkContents + '<?xml version="1.0" encoding="utf-8"?>\n'
+        self.vtkContents  = self.vtkContents + '<VTKFile type="{0}"{1}>\n'.format( datatype, eda.fileAttributes( DataFormat=self.DataFormat, compressor=self.compressor ) )
         self.vtkEndTags   = '</VTKFile>'     + '\n' + self.vtkEndTags
         
     # ------------------------------------------------- #
     # --- vtk_add_RectilinearGridTag                --- #
     # ------------------------------------------------- #
     def vtk_add_RectilinearGridTag( self, Data=None, Axis=None, DataName=None, VectorData=False, DataDims=None, WholeExtent=None, \
-                                    PointData=True, CellData=False ):
+                                    PointData=True, CellData=False, PointFields=None, CellFields=None ):
         # ------------------------------------------------- #
         # --- [1] Arguments                             --- #
         # ------------------------------------------------- #
-        if ( DataName is None ): DataName = "Data"
-        self.prepareData( Data=Data, VectorData=VectorData )
-        if   ( VectorData is True  ):
-            Scl_or_Vec   = "Vectors"
-        elif ( VectorData is False ):
-            Scl_or_Vec   = "Scalars"
+        #  -- Data, PointFields, CellFields :: ndarray or { DataName:ndarray or ( ndarray, VectorData ) } -- #
+        if ( DataName    is None ): DataName    = "Data"
+        if ( Axis        is None ): Axis        = self.Axis
+        PointFields      = fda.asFields( Data=PointFields )
+        CellFields       = fda.asFields( Data=CellFields  )
+        if   ( PointData is True ):
+            PointFields  = { **fda.asFields( Data=Data, DataName=DataName, VectorData=VectorData ), **PointFields }
+        elif ( CellData  is True ):
+            CellFields   = { **fda.asFields( Data=Data, DataName=DataName, VectorData=VectorData ), **CellFields  }
+        self.LILJLK      = tuple( [ np.size( Axis[key] ) for key in [ "xAxis", "yAxis", "zAxis" ] ] )
+        nPoints          = int( np.prod( self.LILJLK ) )
+        nCells           = int( np.prod( [ max(s-1,1) for s in self.LILJLK ] ) )
+        PointFields      = fda.resolveFields( Fields=PointFields, nTuples=nPoints )
+        CellFields       = fda.resolveFields( Fields=CellFields , nTuples=nCells  )
+        #  -- lossy :: floating fields => UInt8 / UInt16 ..., ( scale, offset, maxError ) in FieldData -- #
+        PointFields, qPoint = qnt.quantizeFields( Fields=PointFields, quantize=self.quantize )
+        CellFields , qCell  = qnt.quantizeFields( Fields=CellFields , quantize=self.quantize )
+        self.quantization   = { **qPoint, **qCell }
         if ( WholeExtent is None   ): WholeExtent  = " ".join( [ "0 {0}".format( max(s-1,0) ) for s in list( self.LILJLK ) ] )
         # ------------------------------------------------- #
         # --- [2] RectilinearGrid & Piece Tag  Begin    --- #
         # ------------------------------------------------- #
         self.vtkContents  += '<RectilinearGrid WholeExtent="{0}">\n'.format( WholeExtent )
+        self.vtkContents  += qnt.fieldDataTag( info=self.quantization )
         self.vtkContents  += '<Piece Extent="{0}">\n'               .format( WholeExtent )
         # ------------------------------------------------- #
         # --- [3] PointData / CellData / Coordinates    --- #
         # ------------------------------------------------- #
-        if   ( PointData is True ):
-            self.vtkContents  += '<PointData {0}="{1}">\n'.format( Scl_or_Vec, DataName )
-            self.vtkContents  += self.vtk_add_DataArray( Data=Data, DataName=DataName )
-            self.vtkContents  += '</PointData>\n'
-        elif ( CellData  is True ):
-            self.vtkContents  += '<CellData {0}="{1}">\n' .format( Scl_or_Vec, DataName  )
-            self.vtkContents  += self.vtk_add_DataArray( Data=Data, DataName=DataName )
-            self.vtkContents  += '</CellData>\n'
+        self.vtkContents  += self.vtk_add_FieldData( Fields=PointFields, tag="PointData" )
+        self.vtkContents  += self.vtk_add_FieldData( Fields=CellFields , tag="CellData"  )
         self.vtkContents  += '<Coordinates>\n'
         self.vtkContents  += self.vtk_add_DataArray( Data=Axis["xAxis"], DataName="xAxis" )
         self.vtkContents  += self.vtk_add_DataArray( Data=Axis["yAxis"], DataName="yAxis" )
@@ -82,6 +161,19 @@ class vtk_makeRectilinearGrid():
         self.vtkContents  += '</Piece>\n'          
         self.vtkContents  += '</RectilinearGrid>\n'
 
+
+    # ------------------------------------------------- #
+    # --- vtk_add_FieldData                         --- #
+    # ------------------------------------------------- #
+    def vtk_add_FieldData( self, Fields=None, tag="PointData" ):
+        #  -- Fields are resolved, active Scalars / Vectors :: first scalar / 3-component field -- #
+        if ( not( Fields ) ): return( "" )
+        ret  = '<{0}{1}>\n'.format( tag, fda.activeAttributes( Fields=Fields ) )
+        for DataName, ( Data, VectorData ) in Fields.items():
+            ret += self.vtk_add_DataArray( Data=Data, DataName=DataName, VectorData=VectorData )
+        ret += '</{0}>\n'.format( tag )
+        return( ret )
+
         
     # ------------------------------------------------- #
     # --- vtk_add_DataArray                         --- #
@@ -90,21 +182,23 @@ class vtk_makeRectilinearGrid():
         if ( Data        is None ): sys.exit( "[vtk_add_DataArray -@makeRectilinearGrid-] Data     == ??? " )
         if ( DataName    is None ): sys.exit( "[vtk_add_DataArray -@makeRectilinearGrid-] DataName == ??? " )
         if ( DataFormat  is None ): DataFormat  = self.DataFormat
-        if ( DataType    is None ): DataType    = self.inquiryData( Data=Data, ret_DataType   =True, VectorData=VectorData )
-        if ( nComponents is None ): nComponents = self.inquiryData( Data=Data, ret_nComponents=True, VectorData=VectorData )
-        if ( nData       is None ): nData       = self.inquiryData( Data=Data, ret_nData      =True, VectorData=VectorData )
+        if ( self.downcast       ): Data        = eda.downcastArray( Data=Data )
+        info = self.inquiryData( Data=Data, VectorData=VectorData )
+        if ( DataType    is None ): DataType    = info["DataType"]
+        if ( nComponents is None ): nComponents = info["nComponents"]
+        if ( nData       is None ): nData       = info["nData"]
+        if ( DataFormat.lower() == "appended" ):
+            offset = self.appended.add_DataArray( Data=Data, compressor=self.compressor, level=self.level, \
+                                                  DataName=DataName, stats=self.stats, cache=ecc.sharedCache() )
+            return( '<DataArray Name="{0}" type="{1}" NumberOfComponents="{2}" format="{3}" offset="{4}"/>\n'\
+                    .format( DataName, DataType, nComponents, DataFormat, offset ) )
         ret  = ""
         ret += '<DataArray Name="{0}" type="{1}" NumberOfComponents="{2}" format="{3}">\n'\
                                  .format( DataName, DataType, nComponents, DataFormat )
-        lines = ""
-        if ( nComponents == 1 ):
-            for line in np.ravel( Data ):
-                lines += "{0} ".format( line )
-            lines += "\n"
-        else:
-            for line in Data:
-                lines += " ".join( [ str( val ) for val in line ] ) + "\n"
-        ret += lines
+        ret += eda.encodeDataArray( Data=Data, DataFormat=DataFormat, rowWise=( nComponents != 1 ), \
+                                   compressor=self.compressor, level=self.level, \
+                                   DataName=DataName, stats=self.stats, cache=ecc.sharedCache(), \
+                                   float_format=self.float_format )
         ret += '</DataArray>\n'
         return( ret )
 
@@ -112,52 +206,98 @@ class vtk_makeRectilinearGrid():
     # ------------------------------------------------- #
     # --- vtk_writeFile                             --- #
     # ------------------------------------------------- #
-    def vtk_writeFile( self, vtkFile=None ):
+    def vtk_writeFile( self, vtkFile=None, pretty=None ):
+        #  -- vtkFile :: path, or a file object opened in "wb" -- #
         if ( vtkFile is None ): vtkFile = self.vtkFile
-        with open( vtkFile, "w" ) as f:
-            f.write( self.vtkContents )
-            f.write( self.vtkEndTags  )
-        subprocess.call( ( "xmllint --format --encode utf-8 {0} -o {0}"\
-                           .format( vtkFile ) ).split() )
-        print( "[vtk_writeFile-@makeRectilinearGrid-] VTK File output :: {0}".format( vtkFile ) )
+        if ( pretty  is None ): pretty  = self.pretty
+        with xwr.openXML( vtkFile ) as f:
+            depth = xwr.writeXML( f=f, contents=self.vtkContents, pretty=pretty )
+            if ( self.appended is not None ):
+                self.appended.writeAppendedData( f=f, indent=xwr.indentOf( depth=depth, pretty=pretty ) )
+            xwr.writeXML( f=f, contents=self.vtkEndTags, pretty=pretty, depth=depth )
+        print( "[vtk_writeFile-@makeRectilinearGrid-] VTK File output :: {0}".format( xwr.nameOf( vtkFile ) ) )
+        return( self.stats )
 
             
     # ------------------------------------------------- #
-    # --- inquiryData                               --- #
+    # --- vtk_writePieces                           --- #
     # ------------------------------------------------- #
-    def inquiryData( self, Data=None, VectorData=False, ret_DataType=False, ret_nComponents=False, ret_nData=False ):
-        if ( Data is None ): sys.exit( "[inquiryData-@vtk_makeRectilinearGrid-] Data  == ??? " )
+    def vtk_writePieces( self, nPieces=None, nProcs=None, GhostLevel=0, vtkFile=None ):
         # ------------------------------------------------- #
-        # --- [1] DataType Check                        --- #
+        # --- [1] Arguments                             --- #
         # ------------------------------------------------- #
-        if ( type(Data) is not np.ndarray ):
-            sys.exit( "[inquiryData-@vtk_makeRectilinearGrid-] Data should be np.ndarray [ERROR]" )
-        if ( Data.dtype == np.int32   ): DataType = "Int32"
-        if ( Data.dtype == np.int64   ): DataType = "Int64"
-        if ( Data.dtype == np.float32 ): DataType = "Float32"
-        if ( Data.dtype == np.float64 ): DataType = "Float64"
+        #  -- every field of self.PointFields / self.CellFields, sliced by the extent of each piece -- #
+        if ( nPieces  is None ): sys.exit( "[vtk_writePieces-@makeRectilinearGrid-] nPieces == ??? " )
+        if ( not( self.PointFields ) and not( self.CellFields ) ):
+            sys.exit( "[vtk_writePieces-@makeRectilinearGrid-] no PointData / CellData [ERROR]" )
+        if ( vtkFile  is None ): vtkFile  = self.vtkFile
+        self.LILJLK = tuple( [ np.size( self.Axis[key] ) for key in [ "xAxis", "yAxis", "zAxis" ] ] )
+        cLILJLK     = pwr.cellDims( LILJLK=self.LILJLK )
+        PointFields = fda.resolveFields( Fields=self.PointFields, nTuples=int( np.prod( self.LILJLK ) ) )
+        CellFields  = fda.resolveFields( Fields=self.CellFields , nTuples=int( np.prod( cLILJLK     ) ) )
+        extents     = pwr.structuredExtents( LILJLK=self.LILJLK, nPieces=nPieces, GhostLevel=GhostLevel )
+        #  -- quantized pieces share 1 ( scale, offset ) per field from the whole field -- #
+        quantize    = pwr.sharedQuantize( quantize=self.quantize, Fields={ **PointFields, **CellFields } )
         # ------------------------------------------------- #
-        # --- [2] Data Shape Check                      --- #
+        # --- [2] write each piece on a process pool    --- #
         # ------------------------------------------------- #
-        if ( VectorData is True ):
-            nComponents = Data.shape[-1]
-            nData       = np.size( Data[-1][:] )
-        else:
-            nComponents = 1
-            nData       = np.size( Data[:]    )
+        pieces      = []
+        for ik,extent in enumerate( extents ):
+            ( i0,i1 ), ( j0,j1 ), ( k0,k1 ) = extent
+            cExtent  = pwr.cellExtent( extent=extent, LILJLK=self.LILJLK )
+            pFields  = { key:( pwr.subExtent( Data=Data, LILJLK=self.LILJLK, extent=extent, VectorData=VectorData ), \
+                               VectorData ) for key,( Data, VectorData ) in PointFields.items() }
+            cFields  = { key:( pwr.subExtent( Data=Data, LILJLK=cLILJLK, extent=cExtent, VectorData=VectorData ), \
+                               VectorData ) for key,( Data, VectorData ) in CellFields.items()  }
+            pieces  += [ { "vtkFile"   :pwr.pieceFileName( vtkFile=vtkFile, iPiece=ik ), \
+                           "PointFields":pFields, "CellFields":cFields, \
+                           "xAxis"     :self.Axis["xAxis"][i0:i1+1], "yAxis":self.Axis["yAxis"][j0:j1+1], \
+                           "zAxis"     :self.Axis["zAxis"][k0:k1+1], \
+                           "DataFormat":self.DataFormat, "compressor":self.compressor, "level":self.level, \
+                           "pretty"    :self.pretty, "WholeExtent":pwr.extentString( extent=extent ), \
+                           "float_format":self.float_format, "downcast":self.downcast, "quantize":quantize } ]
+        pwr.writePieces( writer=vtk_makeRectilinearGrid, pieces=pieces, nProcs=nProcs )
         # ------------------------------------------------- #
-        # --- [3] Return                                --- #
+        # --- [3] PRectilinearGrid summary file         --- #
         # ------------------------------------------------- #
-        if ( ret_DataType    ): return( DataType    )
-        if ( ret_nComponents ): return( nComponents )
-        if ( ret_nData       ): return( nData       )
-        return( { "DataType":DataType, "nComponents":nComponents, "nData":nData } )
+        WholeExtent  = " ".join( [ "0 {0}".format( max(s-1,0) ) for s in list( self.LILJLK ) ] )
+        contents     = '<?xml version="1.0" encoding="utf-8"?>\n'
+        contents    += '<VTKFile type="PRectilinearGrid"{0}>\n'.format( eda.fileAttributes( DataFormat=self.DataFormat, compressor=self.compressor ) )
+        contents    += '<PRectilinearGrid WholeExtent="{0}" GhostLevel="{1}">\n'.format( WholeExtent, GhostLevel )
+        contents    += pwr.summaryFields( Fields=PointFields, tag="PPointData", downcast=self.downcast, quantize=quantize )
+        contents    += pwr.summaryFields( Fields=CellFields , tag="PCellData" , downcast=self.downcast, quantize=quantize )
+        contents    += '<PCoordinates>\n'
+        for key in [ "xAxis", "yAxis", "zAxis" ]:
+            contents += '<PDataArray type="{0}" Name="{1}" NumberOfComponents="1"/>\n'\
+                .format( eda.downcastType( DataType=self.inquiryData( Data=self.Axis[key], ret_DataType=True ), downcast=self.downcast ), key )
+        contents    += '</PCoordinates>\n'
+        for piece,extent in zip( pieces, extents ):
+            contents += '<Piece Extent="{0}" Source="{1}"/>\n'\
+                .format( pwr.extentString( extent=extent ), os.path.basename( piece["vtkFile"] ) )
+        contents    += '</PRectilinearGrid>\n'
+        contents    += '</VTKFile>\n'
+        with open( pwr.summaryFileName( vtkFile=vtkFile ), "wb" ) as f:
+            xwr.writeXML( f=f, contents=contents, pretty=self.pretty )
+        print( "[vtk_writePieces-@makeRectilinearGrid-] VTK File output :: {0}".format( pwr.summaryFileName( vtkFile=vtkFile ) ) )
+
+
+    # ------------------------------------------------- #
+    # --- inquiryData                               --- #
+    # ------------------------------------------------- #
+    def inquiryData( self, Data=None, VectorData=False, ret_DataType=False, ret_nComponents=False, ret_nData=False ):
+        #  -- DataType, nComponents, nData in 1 pass, memoized in self.inquiry -- #
+        if ( Data is None ): sys.exit( "[inquiryData-@vtk_makeRectilinearGrid-] Data  == ??? " )
+        info = self.inquiry.inquire( Data=Data, VectorData=VectorData )
+        if ( ret_DataType    ): return( info["DataType"]    )
+        if ( ret_nComponents ): return( info["nComponents"] )
+        if ( ret_nData       ): return( info["nData"]       )
+        return( info )
 
     # ------------------------------------------------- #
     # --- prepareAxis                               --- #
     # ------------------------------------------------- #
     def prepareAxis( self, xAxis=None, yAxis=None, zAxis=None, Data=None ):
-        if ( ( self.Axis is None ) and ( self.Data is not None ) ):
+        if ( self.Axis is None ):
             if ( zAxis is None ): zAxis = np.array( [0.0] )
             if ( yAxis is None ): yAxis = np.array( [0.0] )
             if ( xAxis is None ): xAxis = np.array( [0.0] )
@@ -171,7 +311,7 @@ class vtk_makeRectilinearGrid():
         # --- [1] Data Array Type/Shape Check           --- #
         # ------------------------------------------------- #
         if ( Data is None   ): return()
-        if ( type(Data) is not np.ndarray ):
+        if ( not( isinstance( Data, np.ndarray ) ) ):
             sys.exit( "[prepareData-@vtk_makeRectilinearGrid-] Data should be np.ndarray [ERROR]" )
         if ( Data.ndim >= 5 ):
             sys.exit( "[prepareData-@vtk_makeRectilinearGrid-] incorrect Data size ( ndim >= 5 ) [ERROR]" )
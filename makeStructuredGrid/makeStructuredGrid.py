@@ -1,5 +1,15 @@
-import sys, subprocess
+import os, sys
 import numpy as np
+import vtkUtils.encodeDataArray   as eda
+import vtkUtils.appendedWriter    as apw
+import vtkUtils.compressDataArray as cda
+import vtkUtils.writeXML          as xwr
+import vtkUtils.writePieces       as pwr
+import vtkUtils.fieldData         as fda
+import vtkUtils.inquiryData       as iqd
+import vtkUtils.encodeCache       as ecc
+import vtkUtils.pvdCollection     as pvd
+import vtkUtils.structuredPoints  as stp
 
 
 # ========================================================= #
@@ -10,7 +20,10 @@ class vtk_makeStructuredGrid():
     # --- class Initiator                           --- #
     # ------------------------------------------------- #
     def __init__( self, vtkFile=None, Data=None, Axis=None, \
-                  xAxis=None, yAxis=None, zAxis=None, VectorData=False, DataFormat="ascii" ):
+                  xAxis=None, yAxis=None, zAxis=None, VectorData=False, DataFormat="ascii", \
+                  compressor=None, level=None, pretty=False, WholeExtent=None, \
+                  nPieces=None, nProcs=None, GhostLevel=0, AxisFunc=None, AxisDims=None, \
+                  precision=None, float_format=None, downcast=False ):
         # --- [1-1] Arguments                       --- #
         if ( vtkFile is None ): vtkFile = "out.vts"
         # --- [1-2] Variables Settings              --- #
@@ -21,13 +34,72 @@ class vtk_makeStructuredGrid():
         self.Axis        = Axis
         self.DataFormat  = DataFormat
         self.VectorData  = VectorData
+        self.compressor  = compressor
+        self.level       = level
+        self.stats       = cda.compressStats()
+        self.inquiry     = iqd.inquiryCache()
+        self.pretty      = pretty
+        self.float_format = eda.floatFormat( precision=precision, float_format=float_format )
+        self.downcast    = downcast
+        self.appended    = None
+        if ( DataFormat.lower() == "appended" ):
+            self.appended = apw.appendedWriter( vtkFile=vtkFile )
+        self.WholeExtent = WholeExtent
         self.DataDims    = None
         self.LILJLK      = None
+        self.AxisDims    = None
+        self.PointFields = {}
+        self.CellFields  = {}
         # --- [1-3] Routines                        --- #
+        #  -- Data is None :: builder use, add_point_data / add_cell_data, then write -- #
+        self.prepareAxis ( xAxis=xAxis, yAxis=yAxis, zAxis=zAxis, AxisFunc=AxisFunc, AxisDims=AxisDims )
+        if ( self.Data is not None ):
+            self.PointFields.update( fda.asFields( Data=self.Data, DataName="Data", VectorData=self.VectorData ) )
+        if   ( nPieces   is not None ):
+            self.vtk_writePieces( nPieces=nPieces, nProcs=nProcs, GhostLevel=GhostLevel )
+        elif ( self.Data is not None ):
+            self.write()
+
+
+    # ------------------------------------------------- #
+    # --- add_point_data                            --- #
+    # ------------------------------------------------- #
+    def add_point_data( self, name=None, array=None, VectorData=None ):
+        if ( name  is None ): sys.exit( "[add_point_data-@makeStructuredGrid-] name  == ??? " )
+        if ( array is None ): sys.exit( "[add_point_data-@makeStructuredGrid-] array == ??? " )
+        self.PointFields[name] = ( array, VectorData )
+        return( self )
+
+
+    # ------------------------------------------------- #
+    # --- add_cell_data                             --- #
+    # ------------------------------------------------- #
+    def add_cell_data( self, name=None, array=None, VectorData=None ):
+        if ( name  is None ): sys.exit( "[add_cell_data-@makeStructuredGrid-] name  == ??? " )
+        if ( array is None ): sys.exit( "[add_cell_data-@makeStructuredGrid-] array == ??? " )
+        self.CellFields[name]  = ( array, VectorData )
+        return( self )
+
+
+    # ------------------------------------------------- #
+    # --- write                                     --- #
+    # ------------------------------------------------- #
+    def write( self, path_or_fileobj=None, pretty=None ):
+        # ------------------------------------------------- #
+        # --- [1] rebuild contents from added fields    --- #
+        # ------------------------------------------------- #
+        self.vtkContents = ''
+        self.vtkEndTags  = ''
+        self.stats       = cda.compressStats()
+        if ( self.appended is not None ): self.appended.truncate( offset=0 )
         self.vtk_add_VTKFileTag  ( datatype="StructuredGrid" )
-        self.prepareAxis ( xAxis=xAxis, yAxis=yAxis, zAxis=zAxis )
-        self.vtk_add_StructuredGridTag( Data=self.Data, Axis=self.Axis, VectorData=self.VectorData )
-        self.vtk_writeFile()
+        self.vtk_add_StructuredGridTag( Axis=self.Axis, PointFields=self.PointFields, CellFields=self.CellFields, \
+                                        WholeExtent=self.WholeExtent )
+        # ------------------------------------------------- #
+        # --- [2] write to path or file object          --- #
+        # ------------------------------------------------- #
+        return( self.vtk_writeFile( vtkFile=path_or_fileobj, pretty=pretty ) )
+
         
     # ------------------------------------------------- #
     # --- vtk_add_VTKFileTag                        --- #
@@ -37,8 +109,8 @@ class vtk_makeStructuredGrid():
         # --- [1] Add XML Definition & VTKFile Tag      --- #
         # ------------------------------------------------- #
         if ( datatype is None ): datatype = "StructuredGrid"
-        self.vtkContents  += '<?xml version="1.0"?>\n'
-        self.vtkContents  += '<VTKFile type="{0}">\n'.format( datatype )
+        self.vtkContents  += '<?xml version="1.0" encoding="utf-8"?>\n'
+        self.vtkContents  += '<VTKFile type="{0}"{1}>\n'.format( datatype, eda.fileAttributes( DataFormat=self.DataFormat, compressor=self.compressor ) )
         self.vtkEndTags    = '</VTKFile>'     + '\n' + self.vtkEndTags
         
     # ------------------------------------------------- #
@@ -46,16 +118,24 @@ class vtk_makeStructuredGrid():
     # ------------------------------------------------- #
     def vtk_add_StructuredGridTag( self, Data=None, Axis=None, DataName=None, \
                                    VectorData=False, DataDims=None, WholeExtent=None, \
-                                   PointData=True, CellData=False ):
+                                   PointData=True, CellData=False, PointFields=None, CellFields=None ):
         # ------------------------------------------------- #
         # --- [1] Arguments                             --- #
         # ------------------------------------------------- #
-        if ( DataName is None ): DataName = "Data"
-        self.prepareData( Data=Data, VectorData=VectorData )
-        if   ( VectorData is True  ):
-            Scl_or_Vec   = "Vectors"
-        elif ( VectorData is False ):
-            Scl_or_Vec   = "Scalars"
+        #  -- Data, PointFields, CellFields :: ndarray or { DataName:ndarray or ( ndarray, VectorData ) } -- #
+        if ( DataName    is None ): DataName    = "Data"
+        if ( Axis        is None ): Axis        = self.Axis
+        PointFields      = fda.asFields( Data=PointFields )
+        CellFields       = fda.asFields( Data=CellFields  )
+        if   ( PointData is True ):
+            PointFields  = { **fda.asFields( Data=Data, DataName=DataName, VectorData=VectorData ), **PointFields }
+        elif ( CellData  is True ):
+            CellFields   = { **fda.asFields( Data=Data, DataName=DataName, VectorData=VectorData ), **CellFields  }
+        self.prepareFields( PointFields=PointFields, CellFields=CellFields )
+        nPoints          = int( np.prod( self.LILJLK ) )
+        nCells           = int( np.prod( [ max(s-1,1) for s in self.LILJLK ] ) )
+        PointFields      = fda.resolveFields( Fields=PointFields, nTuples=nPoints )
+        CellFields       = fda.resolveFields( Fields=CellFields , nTuples=nCells  )
         if ( WholeExtent is None   ): WholeExtent  = " ".join( [ "0 {0}".format( max(s-1,0) ) for s in list( self.LILJLK ) ] )
         # ------------------------------------------------- #
         # --- [2] StructuredGrid & Piece Tag  Begin     --- #
@@ -65,14 +145,8 @@ class vtk_makeStructuredGrid():
         # ------------------------------------------------- #
         # --- [3] PointData / CellData / Coordinates    --- #
         # ------------------------------------------------- #
-        if   ( PointData is True ):
-            self.vtkContents  += '<PointData {0}="{1}">\n'.format( Scl_or_Vec, DataName )
-            self.vtkContents  += self.vtk_add_DataArray( Data=Data, DataName=DataName )
-            self.vtkContents  += '</PointData>\n'
-        elif ( CellData  is True ):
-            self.vtkContents  += '<CellData {0}="{1}">\n' .format( Scl_or_Vec, DataName  )
-            self.vtkContents  += self.vtk_add_DataArray( Data=Data, DataName=DataName )
-            self.vtkContents  += '</CellData>\n'
+        self.vtkContents  += self.vtk_add_FieldData( Fields=PointFields, tag="PointData" )
+        self.vtkContents  += self.vtk_add_FieldData( Fields=CellFields , tag="CellData"  )
         self.vtkContents  += '<Points>\n'
         self.vtkContents  += self.vtk_add_DataArray( Data=Axis, DataName="Axis", VectorData=True )
         self.vtkContents  += '</Points>\n'
@@ -81,7 +155,20 @@ class vtk_makeStructuredGrid():
         # ------------------------------------------------- #
         self.vtkContents  += '</Piece>\n'         
         self.vtkContents  += '</StructuredGrid>\n'
-        
+
+
+    # ------------------------------------------------- #
+    # --- vtk_add_FieldData                         --- #
+    # ------------------------------------------------- #
+    def vtk_add_FieldData( self, Fields=None, tag="PointData" ):
+        #  -- Fields are resolved, active Scalars / Vectors :: first scalar / 3-component field -- #
+        if ( not( Fields ) ): return( "" )
+        ret  = '<{0}{1}>\n'.format( tag, fda.activeAttributes( Fields=Fields ) )
+        for DataName, ( Data, VectorData ) in Fields.items():
+            ret += self.vtk_add_DataArray( Data=Data, DataName=DataName, VectorData=VectorData )
+        ret += '</{0}>\n'.format( tag )
+        return( ret )
+
     # ------------------------------------------------- #
     # --- vtk_add_DataArray                         --- #
     # ------------------------------------------------- #
@@ -89,81 +176,130 @@ class vtk_makeStructuredGrid():
         if ( Data        is None ): sys.exit( "[vtk_add_DataArray -@makeStructuredGrid-] Data     == ??? " )
         if ( DataName    is None ): sys.exit( "[vtk_add_DataArray -@makeStructuredGrid-] DataName == ??? " )
         if ( DataFormat  is None ): DataFormat  = self.DataFormat
-        if ( DataType    is None ): DataType    = self.inquiryData( Data=Data, ret_DataType   =True, VectorData=VectorData )
-        if ( nComponents is None ): nComponents = self.inquiryData( Data=Data, ret_nComponents=True, VectorData=VectorData )
-        if ( nData       is None ): nData       = self.inquiryData( Data=Data, ret_nData      =True, VectorData=VectorData )
+        if ( self.downcast       ): Data        = eda.downcastArray( Data=Data )
+        info = self.inquiryData( Data=Data, VectorData=VectorData )
+        if ( DataType    is None ): DataType    = info["DataType"]
+        if ( nComponents is None ): nComponents = info["nComponents"]
+        if ( nData       is None ): nData       = info["nData"]
+        if ( DataFormat.lower() == "appended" ):
+            offset = self.appended.add_DataArray( Data=Data, compressor=self.compressor, level=self.level, \
+                                                  DataName=DataName, stats=self.stats, cache=ecc.sharedCache() )
+            return( '<DataArray Name="{0}" type="{1}" NumberOfComponents="{2}" format="{3}" offset="{4}"/>\n'\
+                    .format( DataName, DataType, nComponents, DataFormat, offset ) )
         ret  = ""
         ret += '<DataArray Name="{0}" type="{1}" NumberOfComponents="{2}" format="{3}">\n'\
                                  .format( DataName, DataType, nComponents, DataFormat )
-        lines = ""
-        if ( nComponents == 1 ):
-            for line in np.ravel( Data ):
-                lines += "{0} ".format( line )
-            lines += "\n"
-        else:
-            for line in Data:
-                lines += ( " ".join( [ str( val ) for val in line ] ) + "\n" )
-        ret += lines
+        ret += eda.encodeDataArray( Data=Data, DataFormat=DataFormat, rowWise=( nComponents != 1 ), \
+                                   compressor=self.compressor, level=self.level, \
+                                   DataName=DataName, stats=self.stats, cache=ecc.sharedCache(), \
+                                   float_format=self.float_format )
         ret += '</DataArray>\n'
         return( ret )
     
     # ------------------------------------------------- #
     # --- vtk_writeFile                             --- #
     # ------------------------------------------------- #
-    def vtk_writeFile( self, vtkFile=None ):
+    def vtk_writeFile( self, vtkFile=None, pretty=None ):
+        #  -- vtkFile :: path, or a file object opened in "wb" -- #
         if ( vtkFile is None ): vtkFile = self.vtkFile
-        with open( vtkFile, "w" ) as f:
-            f.write( self.vtkContents )
-            f.write( self.vtkEndTags  )
-        subprocess.call( ( "xmllint --format --encode utf-8 {0} -o {0}"\
-                           .format( vtkFile ) ).split() )
-        print( "[vtk_writeFile-@makeStructuredGrid-] VTK File output :: {0}".format( vtkFile ) )
+        if ( pretty  is None ): pretty  = self.pretty
+        with xwr.openXML( vtkFile ) as f:
+            depth = xwr.writeXML( f=f, contents=self.vtkContents, pretty=pretty )
+            if ( self.appended is not None ):
+                self.appended.writeAppendedData( f=f, indent=xwr.indentOf( depth=depth, pretty=pretty ) )
+            xwr.writeXML( f=f, contents=self.vtkEndTags, pretty=pretty, depth=depth )
+        print( "[vtk_writeFile-@makeStructuredGrid-] VTK File output :: {0}".format( xwr.nameOf( vtkFile ) ) )
+        return( self.stats )
 
 
     # ------------------------------------------------- #
-    # --- inquiryData                               --- #
+    # --- vtk_writePieces                           --- #
     # ------------------------------------------------- #
-    def inquiryData( self, Data=None, VectorData=False, ret_DataType=False, ret_nComponents=False, ret_nData=False ):
-        if ( Data is None ): sys.exit( "[inquiryData-@vtk_makeStructuredGrid-] Data  == ??? " )
+    def vtk_writePieces( self, nPieces=None, nProcs=None, GhostLevel=0, vtkFile=None ):
         # ------------------------------------------------- #
-        # --- [1] DataType Check                        --- #
+        # --- [1] Arguments                             --- #
         # ------------------------------------------------- #
-        if ( type(Data) is not np.ndarray ):
-            sys.exit( "[inquiryData-@vtk_makeStructuredGrid-] Data should be np.ndarray [ERROR]" )
-        if ( Data.dtype == np.int32   ): DataType = "Int32"
-        if ( Data.dtype == np.int64   ): DataType = "Int64"
-        if ( Data.dtype == np.float32 ): DataType = "Float32"
-        if ( Data.dtype == np.float64 ): DataType = "Float64"
+        #  -- every field of self.PointFields / self.CellFields, sliced by the extent of each piece -- #
+        if ( nPieces  is None ): sys.exit( "[vtk_writePieces-@makeStructuredGrid-] nPieces == ??? " )
+        if ( vtkFile  is None ): vtkFile  = self.vtkFile
+        self.prepareFields( PointFields=self.PointFields, CellFields=self.CellFields )
+        cLILJLK     = pwr.cellDims( LILJLK=self.LILJLK )
+        PointFields = fda.resolveFields( Fields=self.PointFields, nTuples=int( np.prod( self.LILJLK ) ) )
+        CellFields  = fda.resolveFields( Fields=self.CellFields , nTuples=int( np.prod( cLILJLK     ) ) )
+        extents     = pwr.structuredExtents( LILJLK=self.LILJLK, nPieces=nPieces, GhostLevel=GhostLevel )
         # ------------------------------------------------- #
-        # --- [2] Data Shape Check                      --- #
+        # --- [2] write each piece on a process pool    --- #
         # ------------------------------------------------- #
-        if ( VectorData is True ):
-            nComponents = Data.shape[-1]
-            nData       = np.size( Data[-1][:] )
-        else:
-            nComponents = 1
-            nData       = np.size( Data[:]    )
+        pieces      = []
+        for ik,extent in enumerate( extents ):
+            cExtent  = pwr.cellExtent( extent=extent, LILJLK=self.LILJLK )
+            pFields  = { key:( pwr.subExtent( Data=Data, LILJLK=self.LILJLK, extent=extent, VectorData=VectorData ), \
+                               VectorData ) for key,( Data, VectorData ) in PointFields.items() }
+            cFields  = { key:( pwr.subExtent( Data=Data, LILJLK=cLILJLK, extent=cExtent, VectorData=VectorData ), \
+                               VectorData ) for key,( Data, VectorData ) in CellFields.items()  }
+            if ( eda.isLazy( self.Axis ) ):
+                Axis = self.Axis.subExtent( extent=extent )
+            else:
+                Axis = pwr.subExtent( Data=self.Axis, LILJLK=self.LILJLK, extent=extent, VectorData=True )
+                Axis = Axis.reshape( -1, self.Axis.shape[-1] )
+            pieces  += [ { "vtkFile"   :pwr.pieceFileName( vtkFile=vtkFile, iPiece=ik ), \
+                           "PointFields":pFields, "CellFields":cFields, "Axis":Axis, \
+                           "DataFormat":self.DataFormat, "compressor":self.compressor, "level":self.level, \
+                           "pretty"    :self.pretty, "WholeExtent":pwr.extentString( extent=extent ), \
+                           "float_format":self.float_format, "downcast":self.downcast } ]
+        pwr.writePieces( writer=vtk_makeStructuredGrid, pieces=pieces, nProcs=nProcs )
         # ------------------------------------------------- #
-        # --- [3] Return                                --- #
+        # --- [3] PStructuredGrid summary file          --- #
         # ------------------------------------------------- #
-        if ( ret_DataType    ): return( DataType    )
-        if ( ret_nComponents ): return( nComponents )
-        if ( ret_nData       ): return( nData       )
-        return( { "DataType":DataType, "nComponents":nComponents, "nData":nData } )
+        WholeExtent  = " ".join( [ "0 {0}".format( max(s-1,0) ) for s in list( self.LILJLK ) ] )
+        contents     = '<?xml version="1.0" encoding="utf-8"?>\n'
+        contents    += '<VTKFile type="PStructuredGrid"{0}>\n'.format( eda.fileAttributes( DataFormat=self.DataFormat, compressor=self.compressor ) )
+        contents    += '<PStructuredGrid WholeExtent="{0}" GhostLevel="{1}">\n'.format( WholeExtent, GhostLevel )
+        contents    += pwr.summaryFields( Fields=PointFields, tag="PPointData", downcast=self.downcast )
+        contents    += pwr.summaryFields( Fields=CellFields , tag="PCellData" , downcast=self.downcast )
+        contents    += '<PPoints>\n'
+        contents    += '<PDataArray type="{0}" Name="Axis" NumberOfComponents="{1}"/>\n'\
+            .format( eda.downcastType( DataType=self.inquiryData( Data=self.Axis, ret_DataType=True ), downcast=self.downcast ), self.Axis.shape[-1] )
+        contents    += '</PPoints>\n'
+        for piece,extent in zip( pieces, extents ):
+            contents += '<Piece Extent="{0}" Source="{1}"/>\n'\
+                .format( pwr.extentString( extent=extent ), os.path.basename( piece["vtkFile"] ) )
+        contents    += '</PStructuredGrid>\n'
+        contents    += '</VTKFile>\n'
+        with open( pwr.summaryFileName( vtkFile=vtkFile ), "wb" ) as f:
+            xwr.writeXML( f=f, contents=contents, pretty=self.pretty )
+        print( "[vtk_writePieces-@makeStructuredGrid-] VTK File output :: {0}".format( pwr.summaryFileName( vtkFile=vtkFile ) ) )
+
+
+    # ------------------------------------------------- #
+    # --- inquiryData                               --- #
+    # ------------------------------------------------- #
+    def inquiryData( self, Data=None, VectorData=False, ret_DataType=False, ret_nComponents=False, ret_nData=False ):
+        #  -- DataType, nComponents, nData in 1 pass, memoized in self.inquiry -- #
+        if ( Data is None ): sys.exit( "[inquiryData-@vtk_makeStructuredGrid-] Data  == ??? " )
+        info = self.inquiry.inquire( Data=Data, VectorData=VectorData )
+        if ( ret_DataType    ): return( info["DataType"]    )
+        if ( ret_nComponents ): return( info["nComponents"] )
+        if ( ret_nData       ): return( info["nData"]       )
+        return( info )
 
     
     # ------------------------------------------------- #
     # --- prepareAxis                               --- #
     # ------------------------------------------------- #
-    def prepareAxis( self, xAxis=None, yAxis=None, zAxis=None, Data=None ):
-        if ( ( self.Axis is None ) and ( self.Data is not None ) ):
-            if ( zAxis is None ): zAxis = np.array( [0.0] )
-            if ( yAxis is None ): yAxis = np.array( [0.0] )
-            if ( xAxis is None ): xAxis = np.array( [0.0] )
-            xg,yg,zg  = np.meshgrid( xAxis,yAxis,zAxis,indexing='xy' )
-            self.Axis = np.concatenate( [ np.ravel(xg)[:,np.newaxis], \
-                                          np.ravel(yg)[:,np.newaxis], \
-                                          np.ravel(zg)[:,np.newaxis] ], axis=1 )
+    def prepareAxis( self, xAxis=None, yAxis=None, zAxis=None, AxisFunc=None, AxisDims=None ):
+        #  -- points are generated slab by slab while encoding ( O(slab) memory ), in file order, -- #
+        #  -- from the 1D axes, or from AxisFunc( i, j, k ) over ( LI,LJ,LK ) = AxisDims           -- #
+        if ( self.Axis is None ):
+            if ( AxisFunc is not None ):
+                if ( AxisDims is None ):
+                    sys.exit( "[prepareAxis-@vtk_makeStructuredGrid-] AxisFunc needs AxisDims [ERROR]" )
+                self.Axis = stp.structuredPoints( func=AxisFunc, LILJLK=AxisDims )
+            else:
+                self.Axis = stp.structuredPoints( xAxis=xAxis, yAxis=yAxis, zAxis=zAxis )
+            self.AxisDims = self.Axis.LILJLK
+        elif ( eda.isLazy( self.Axis ) ):
+            self.AxisDims = self.Axis.LILJLK
 
         
     # ------------------------------------------------- #
@@ -174,7 +310,7 @@ class vtk_makeStructuredGrid():
         # --- [1] Data Array Type/Shape Check           --- #
         # ------------------------------------------------- #
         if ( Data is None   ): return()
-        if ( type(Data) is not np.ndarray ):
+        if ( not( isinstance( Data, np.ndarray ) ) ):
             sys.exit( "[prepareData-@vtk_makeStructuredGrid-] Data should be np.ndarray [ERROR]" )
         if ( Data.ndim >= 5 ):
             sys.exit( "[prepareData-@vtk_makeStructuredGrid-] incorrect Data size ( ndim >= 5 ) [ERROR]" )
@@ -198,6 +334,121 @@ class vtk_makeStructuredGrid():
             Data        = Data.reshape( self.LILJLK )
 
 
+    # ------------------------------------------------- #
+    # --- prepareFields                             --- #
+    # ------------------------------------------------- #
+    def prepareFields( self, PointFields=None, CellFields=None ):
+        #  -- LILJLK from the axes, the first point field, or the first cell field + 1 -- #
+        if   ( self.AxisDims is not None ):
+            self.LILJLK = self.AxisDims
+        elif ( PointFields ):
+            Data, VectorData = next( iter( fda.resolveFields( Fields=PointFields ).values() ) )
+            self.prepareData( Data=Data, VectorData=VectorData )
+        elif ( CellFields  ):
+            Data, VectorData = next( iter( fda.resolveFields( Fields=CellFields  ).values() ) )
+            self.prepareData( Data=Data, VectorData=VectorData )
+            nDims       = Data.ndim - ( 1 if ( VectorData ) else 0 )
+            self.LILJLK = tuple( [ s+1 if ( ik < nDims ) else s for ik,s in enumerate( self.LILJLK ) ] )
+        if ( self.LILJLK is None ):
+            sys.exit( "[prepareFields-@vtk_makeStructuredGrid-] no PointData / CellData [ERROR]" )
+
+
+
+# ========================================================= #
+# ===  vtk_makeStructuredGridSeries class               === #
+# ========================================================= #
+class vtk_makeStructuredGridSeries( vtk_makeStructuredGrid ):
+    # ------------------------------------------------- #
+    # --- class Initiator                           --- #
+    # ------------------------------------------------- #
+    #  -- Points are encoded once, each add_step encodes only the new field -- #
+    def __init__( self, pvdFile=None, Axis=None, xAxis=None, yAxis=None, zAxis=None, \
+                  VectorData=False, DataFormat="ascii", compressor=None, level=None, pretty=False, \
+                  AxisFunc=None, AxisDims=None, \
+                  precision=None, float_format=None, downcast=False ):
+        # --- [1-1] Arguments                       --- #
+        if ( pvdFile is None ): pvdFile = "out.pvd"
+        # --- [1-2] Variables Settings              --- #
+        self.pvdFile     = pvdFile
+        self.vtkFile     = None
+        self.vtkContents = ''
+        self.vtkEndTags  = ''
+        self.Data        = None
+        self.Axis        = Axis
+        self.DataFormat  = DataFormat
+        self.VectorData  = VectorData
+        self.compressor  = compressor
+        self.level       = level
+        self.stats       = cda.compressStats()
+        self.inquiry     = iqd.inquiryCache()
+        self.pretty      = pretty
+        self.float_format = eda.floatFormat( precision=precision, float_format=float_format )
+        self.downcast    = downcast
+        self.appended    = None
+        if ( DataFormat.lower() == "appended" ):
+            self.appended = apw.appendedWriter( vtkFile=pvdFile )
+        self.WholeExtent = None
+        self.DataDims    = None
+        self.LILJLK      = None
+        self.AxisDims    = None
+        self.iStep       = 0
+        self.collection  = pvd.pvdCollection( pvdFile=pvdFile, pretty=pretty )
+        # --- [1-3] Routines                        --- #
+        self.prepareAxis( xAxis=xAxis, yAxis=yAxis, zAxis=zAxis, AxisFunc=AxisFunc, AxisDims=AxisDims )
+        self.vtk_add_VTKFileTag( datatype="StructuredGrid" )
+        self.vtkHeader   = self.vtkContents
+        self.vtkGeometry = '<Points>\n' \
+            + self.vtk_add_DataArray( Data=self.Axis, DataName="Axis", VectorData=True ) \
+            + '</Points>\n'
+        if ( self.appended is not None ):
+            self.geometryOffset = self.appended.offset
+
+
+    # ------------------------------------------------- #
+    # --- add_step                                  --- #
+    # ------------------------------------------------- #
+    def add_step( self, Data=None, time=None, vtkFile=None, DataName=None, VectorData=None, \
+                  WholeExtent=None, PointData=True, CellData=False ):
+        # ------------------------------------------------- #
+        # --- [1] Arguments                             --- #
+        # ------------------------------------------------- #
+        if ( Data       is None ): sys.exit( "[add_step-@vtk_makeStructuredGridSeries-] Data == ??? " )
+        if ( DataName   is None ): DataName   = "Data"
+        if ( VectorData is None ): VectorData = self.VectorData
+        if ( time       is None ): time       = self.iStep
+        if ( vtkFile    is None ):
+            vtkFile  = "{0}_{1:06}.vts".format( os.path.splitext( self.pvdFile )[0], self.iStep )
+        Fields           = fda.asFields( Data=Data, DataName=DataName, VectorData=VectorData )
+        PointFields      = Fields if ( PointData is True ) else {}
+        CellFields       = Fields if ( ( PointData is not True ) and ( CellData is True ) ) else {}
+        self.prepareFields( PointFields=PointFields, CellFields=CellFields )
+        nPoints          = int( np.prod( self.LILJLK ) )
+        nCells           = int( np.prod( [ max(s-1,1) for s in self.LILJLK ] ) )
+        PointFields      = fda.resolveFields( Fields=PointFields, nTuples=nPoints )
+        CellFields       = fda.resolveFields( Fields=CellFields , nTuples=nCells  )
+        if ( WholeExtent is None ): WholeExtent = " ".join( [ "0 {0}".format( max(s-1,0) ) for s in list( self.LILJLK ) ] )
+        self.stats       = cda.compressStats()
+        # ------------------------------------------------- #
+        # --- [2] field + cached geometry               --- #
+        # ------------------------------------------------- #
+        self.vtkContents  = self.vtkHeader
+        self.vtkContents += '<StructuredGrid WholeExtent="{0}">\n'.format( WholeExtent )
+        self.vtkContents += '<Piece Extent="{0}">\n'              .format( WholeExtent )
+        self.vtkContents += self.vtk_add_FieldData( Fields=PointFields, tag="PointData" )
+        self.vtkContents += self.vtk_add_FieldData( Fields=CellFields , tag="CellData"  )
+        self.vtkContents += self.vtkGeometry
+        self.vtkContents += '</Piece>\n'
+        self.vtkContents += '</StructuredGrid>\n'
+        # ------------------------------------------------- #
+        # --- [3] write step & update .pvd              --- #
+        # ------------------------------------------------- #
+        self.vtk_writeFile( vtkFile=vtkFile )
+        if ( self.appended is not None ):
+            self.appended.truncate( offset=self.geometryOffset )
+        self.collection.add_DataSet( vtkFile=vtkFile, timestep=time )
+        self.iStep += 1
+        return( self.stats )
+
             
 # ======================================== #
 # ===  実行部                          === #
@@ -0,0 +1,68 @@
+import os, sys, time, tempfile
+import numpy as np
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), "..", ".." ) )
+import makeUnstructuredGrid.makeUnstructuredGrid as mug
+
+
+# ========================================================= #
+# ===  hybridMesh                                       === #
+# ========================================================= #
+def hybridMesh( nCells=10**7 ):
+    # ------------------------------------------------- #
+    # --- [1] cubes of a ( n,n,n ) lattice          --- #
+    # ------------------------------------------------- #
+    #  -- cube ik % 4 == 0,1,2,3 :: 1 hexahedron, 2 wedges, 3 pyramids, 6 tetras ( 3 cells / cube ) -- #
+    n        = max( int( round( ( nCells / 3.0 )**( 1.0/3.0 ) ) ), 2 )
+    x        = np.arange( n+1, dtype=np.float64 )
+    Node     = np.stack( np.meshgrid( x, x, x, indexing="ij" ), axis=-1 ).reshape( -1,3 )
+    i,j,k    = [ idx.ravel() for idx in np.meshgrid( *( [ np.arange( n ) ]*3 ), indexing="ij" ) ]
+    base     = ( i*(n+1) + j )*(n+1) + k
+    corner   = np.stack( [ base + di*(n+1)**2 + dj*(n+1) + dk \
+                           for dk in (0,1) for dj in (0,1) for di in (0,1) ], axis=1 )
+    kind     = np.arange( base.size ) % 4
+    # ------------------------------------------------- #
+    # --- [2] padded ( -1 ) connectivity per type   --- #
+    # ------------------------------------------------- #
+    split    = { 12:[ [0,1,3,2,4,5,7,6] ], \
+                 13:[ [0,1,3,4,5,7], [0,3,2,4,7,6] ], \
+                 14:[ [0,1,3,2,7], [0,4,5,1,7], [0,2,6,4,7] ], \
+                 10:[ [0,1,3,7], [0,1,5,7], [0,2,3,7], [0,2,6,7], [0,4,5,7], [0,4,6,7] ] }
+    Elems, types = [], []
+    for ik,( ctype, cells ) in enumerate( split.items() ):
+        cubes    = corner[ kind == ik ]
+        for cell in cells:
+            block          = np.full( ( cubes.shape[0], 8 ), -1, dtype=np.int64 )
+            block[:,:len(cell)] = cubes[:,cell]
+            Elems         += [ block ]
+            types         += [ np.full( ( cubes.shape[0], ), ctype, dtype=np.int64 ) ]
+    return( Node, np.concatenate( Elems ), np.concatenate( types ) )
+
+
+# ======================================== #
+# ===  実行部                          === #
+# ======================================== #
+if ( __name__=="__main__" ):
+    nCells   = int( float( sys.argv[1] ) ) if ( len( sys.argv ) > 1 ) else 10**7
+    Node, Pad, types = hybridMesh( nCells=nCells )
+    print( "[bench_mixedCells] {0} cells, {1} nodes".format( Pad.shape[0], Node.shape[0] ) )
+    ug       = mug.vtk_makeUnstructuredGrid.__new__( mug.vtk_makeUnstructuredGrid )
+    #  -- [1] padded => connectivity / offsets / types -- #
+    t0       = time.perf_counter()
+    connect, offsets, ctypes = ug.prepareCells( Elem=Pad )
+    t1       = time.perf_counter()
+    print( "  prepareCells ( padded, types inferred ) :: {0:8.3f} s".format( t1-t0 ) )
+    del Pad
+    #  -- [2] CSR + explicit types                  -- #
+    t0       = time.perf_counter()
+    ug.prepareCells( Elem=connect, offsets=offsets, types=types )
+    t1       = time.perf_counter()
+    print( "  prepareCells ( CSR, types given )        :: {0:8.3f} s".format( t1-t0 ) )
+    #  -- [3] write appended raw                     -- #
+    with tempfile.TemporaryDirectory() as tmp:
+        t0   = time.perf_counter()
+        mug.vtk_makeUnstructuredGrid( vtkFile=os.path.join( tmp, "hybrid.vtu" ), Node=Node, Elem=connect, \
+                                      offsets=offsets, types=types, DataFormat="appended", \
+                                      Data=np.arange( types.size, dtype=np.float32 ) )
+        t1   = time.perf_counter()
+        size = os.path.getsize( os.path.join( tmp, "hybrid.vtu" ) )
+        print( "  write ( appended )                       :: {0:8.3f} s  {1:.1f} MB".format( t1-t0, size/2**20 ) )
@@ -1,5 +1,21 @@
-import sys, subprocess
+import os, sys
 import numpy as np
+import vtkUtils.encodeDataArray   as eda
+import vtkUtils.appendedWriter    as apw
+import vtkUtils.compressDataArray as cda
+import vtkUtils.writeXML          as xwr
+import vtkUtils.writePieces       as pwr
+import vtkUtils.fieldData         as fda
+import vtkUtils.inquiryData       as iqd
+import vtkUtils.encodeCache       as ecc
+import vtkUtils.pvdCollection     as pvd
+import vtkUtils.cellPointData     as cpd
+
+# -- VTK cell type ids, and the default type of a cell from its number of vertices -- #
+ElementTypeTable = { "vertex":1, "poly_vertex":2, "line":3, "poly_line":4, "triangle":5, \
+                     "polygon":7, "pixel":8, "quad":9, "tetra":10, "voxel":11, "hexahedron":12, \
+                     "hexa":12, "wedge":13, "pyramid":14 }
+nVertsTable      = { 1:"vertex", 2:"line", 3:"triangle", 4:"tetra", 5:"pyramid", 6:"wedge", 8:"hexahedron" }
 
 
 # ========================================================= #
@@ -10,9 +26,17 @@ class vtk_makeUnstructuredGrid():
     # --- class Initiator                           --- #
     # ------------------------------------------------- #
     def __init__( self, vtkFile=None, Data=None, Node=None, Elem=None, \
-                  xAxis=None, yAxis=None, zAxis=None, VectorData=False, DataFormat="ascii" ):
+                  xAxis=None, yAxis=None, zAxis=None, VectorData=False, DataFormat="ascii", \
+                  compressor=None, level=None, pretty=False, \
+                  nPieces=None, nProcs=None, GhostLevel=0, offsets=None, types=None, \
+                  precision=None, float_format=None, downcast=False, average=None ):
+        #  -- Elem :: ( nElems,nVerts ), ( nElems,maxVerts ) padded with -1, or 1D connectivity + offsets -- #
+        #  -- types :: None ( from nVerts ), an ElementType name, or per-cell type ids / names         -- #
+        #  -- average :: "point_to_cell" / "cell_to_point" / "both", fields also written as cell / point means -- #
         # --- [1-1] Arguments                       --- #
         if ( vtkFile is None ): vtkFile = "out.vtu"
+        if ( average not in cpd.AverageModes ):
+            sys.exit( "[vtk_makeUnstructuredGrid] unknown average :: {0} [ERROR]".format( average ) )
         # --- [1-2] Variables Settings              --- #
         self.vtkFile     = vtkFile
         self.vtkContents = ''
@@ -20,14 +44,74 @@ class vtk_makeUnstructuredGrid():
         self.Data        = Data
         self.Node        = Node
         self.Elem        = Elem
+        self.offsets     = offsets
+        self.types       = types
         self.DataFormat  = DataFormat
         self.VectorData  = VectorData
+        self.compressor  = compressor
+        self.level       = level
+        self.stats       = cda.compressStats()
+        self.inquiry     = iqd.inquiryCache()
+        self.pretty      = pretty
+        self.float_format = eda.floatFormat( precision=precision, float_format=float_format )
+        self.downcast    = downcast
+        self.average     = average
+        self.appended    = None
+        if ( DataFormat.lower() == "appended" ):
+            self.appended = apw.appendedWriter( vtkFile=vtkFile )
         self.DataDims    = None
         self.LILJLK      = None
+        self.PointFields = {}
+        self.CellFields  = {}
         # --- [1-3] Routines                        --- #
+        #  -- Data is None :: builder use, add_point_data / add_cell_data, then write -- #
+        if ( self.Data is not None ):
+            self.CellFields.update( fda.asFields( Data=self.Data, DataName="Data", VectorData=self.VectorData ) )
+        if   ( nPieces   is not None ):
+            self.vtk_writePieces( nPieces=nPieces, nProcs=nProcs, GhostLevel=GhostLevel )
+        elif ( self.Data is not None ):
+            self.write()
+
+
+    # ------------------------------------------------- #
+    # --- add_point_data                            --- #
+    # ------------------------------------------------- #
+    def add_point_data( self, name=None, array=None, VectorData=None ):
+        if ( name  is None ): sys.exit( "[add_point_data-@makeUnstructuredGrid-] name  == ??? " )
+        if ( array is None ): sys.exit( "[add_point_data-@makeUnstructuredGrid-] array == ??? " )
+        self.PointFields[name] = ( array, VectorData )
+        return( self )
+
+
+    # ------------------------------------------------- #
+    # --- add_cell_data                             --- #
+    # ------------------------------------------------- #
+    def add_cell_data( self, name=None, array=None, VectorData=None ):
+        if ( name  is None ): sys.exit( "[add_cell_data-@makeUnstructuredGrid-] name  == ??? " )
+        if ( array is None ): sys.exit( "[add_cell_data-@makeUnstructuredGrid-] array == ??? " )
+        self.CellFields[name]  = ( array, VectorData )
+        return( self )
+
+
+    # ------------------------------------------------- #
+    # --- write                                     --- #
+    # ------------------------------------------------- #
+    def write( self, path_or_fileobj=None, pretty=None ):
+        # ------------------------------------------------- #
+        # --- [1] rebuild contents from added fields    --- #
+        # ------------------------------------------------- #
+        self.vtkContents = ''
+        self.vtkEndTags  = ''
+        self.stats       = cda.compressStats()
+        if ( self.appended is not None ): self.appended.truncate( offset=0 )
         self.vtk_add_VTKFileTag  ( datatype="UnstructuredGrid" )
-        self.vtk_add_UnstructuredGridTag( Data=self.Data, Node=self.Node, Elem=self.Elem, VectorData=self.VectorData )
-        self.vtk_writeFile()
+        self.vtk_add_UnstructuredGridTag( Node=self.Node, Elem=self.Elem, offsets=self.offsets, types=self.types, \
+                                          PointFields=self.PointFields, CellFields=self.CellFields )
+        # ------------------------------------------------- #
+        # --- [2] write to path or file object          --- #
+        # ------------------------------------------------- #
+        return( self.vtk_writeFile( vtkFile=path_or_fileobj, pretty=pretty ) )
+
         
     # ------------------------------------------------- #
     # --- vtk_add_VTKFileTag                        --- #
@@ -37,8 +121,8 @@ class vtk_makeUnstructuredGrid():
         # --- [1] Add XML Definition & VTKFile Tag      --- #
         # ------------------------------------------------- #
         if ( datatype is None ): datatype = "UnstructuredGrid"
-        self.vtkContents  += '<?xml version="1.0"?>\n'
-        self.vtkContents  += '<VTKFile type="{0}">\n'.format( datatype )
+        self.vtkContents  += '<?xml version="1.0" encoding="utf-8"?>\n'
+        self.vtkContents  += '<VTKFile type="{0}"{1}>\n'.format( datatype, eda.fileAttributes( DataFormat=self.DataFormat, compressor=self.compressor ) )
         self.vtkEndTags    = '</VTKFile>'     + '\n' + self.vtkEndTags
         
     # ------------------------------------------------- #
@@ -46,41 +130,41 @@ class vtk_makeUnstructuredGrid():
     # ------------------------------------------------- #
     def vtk_add_UnstructuredGridTag( self, Data=None , Node    =None, Elem=None, DataName=None, \
                                      VectorData=False, DataDims=None, WholeExtent=None, \
-                                     PointData =False, CellData=True ):
+                                     PointData =False, CellData=True, PointFields=None, CellFields=None, \
+                                     offsets=None, types=None ):
         # ------------------------------------------------- #
         # --- [1] Arguments                             --- #
         # ------------------------------------------------- #
-        if ( DataName is None ): DataName = "Data"
-        self.prepareData( Data=Data, VectorData=VectorData )
-        if ( Data     is None ): return()
-        if ( Elem     is None ): return()
-        if ( Node     is None ): return()
-        if   ( VectorData is True  ):
-            Scl_or_Vec   = "Vectors"
-        elif ( VectorData is False ):
-            Scl_or_Vec   = "Scalars"
+        #  -- Data, PointFields, CellFields :: ndarray or { DataName:ndarray or ( ndarray, VectorData ) } -- #
+        if ( DataName    is None ): DataName    = "Data"
+        if ( Elem        is None ): return()
+        if ( Node        is None ): return()
+        PointFields      = fda.asFields( Data=PointFields )
+        CellFields       = fda.asFields( Data=CellFields  )
+        if   ( PointData is True ):
+            PointFields  = { **fda.asFields( Data=Data, DataName=DataName, VectorData=VectorData ), **PointFields }
+        elif ( CellData  is True ):
+            CellFields   = { **fda.asFields( Data=Data, DataName=DataName, VectorData=VectorData ), **CellFields  }
         nNodes = Node.shape[0]
-        nElems = Elem.shape[0]
+        nElems = self.countCells( Elem=Elem, offsets=offsets )
+        PointFields      = fda.resolveFields( Fields=PointFields, nTuples=nNodes )
+        CellFields       = fda.resolveFields( Fields=CellFields , nTuples=nElems )
+        PointFields, CellFields = self.averageFields( PointFields=PointFields, CellFields=CellFields, \
+                                                      nNodes=nNodes, Elem=Elem, offsets=offsets )
         # ------------------------------------------------- #
         # --- [2] UnstructuredGrid & Piece Tag  Begin   --- #
         # ------------------------------------------------- #
         self.vtkContents  += '<UnstructuredGrid>\n'
-        self.vtkContents  += '<Piece  NumberOfPoints="{0}" NumberOfCells="{1}">\n'.format( nNodes, nElems )
+        self.vtkContents  += '<Piece NumberOfPoints="{0}" NumberOfCells="{1}">\n'.format( nNodes, nElems )
         # ------------------------------------------------- #
         # --- [3] PointData / CellData / Coordinates    --- #
         # ------------------------------------------------- #
-        if   ( PointData is True ):
-            self.vtkContents  += '<PointData {0}="{1}">\n'.format( Scl_or_Vec, DataName )
-            self.vtkContents  += self.vtk_add_DataArray( Data=Data, DataName=DataName )
-            self.vtkContents  += '</PointData>\n'
-        elif ( CellData  is True ):
-            self.vtkContents  += '<CellData {0}="{1}">\n' .format( Scl_or_Vec, DataName  )
-            self.vtkContents  += self.vtk_add_DataArray( Data=Data, DataName=DataName )
-            self.vtkContents  += '</CellData>\n'
+        self.vtkContents  += self.vtk_add_FieldData( Fields=PointFields, tag="PointData" )
+        self.vtkContents  += self.vtk_add_FieldData( Fields=CellFields , tag="CellData"  )
         self.vtkContents  += '<Points>\n'
         self.vtkContents  += self.vtk_add_DataArray( Data=Node, DataName="Nodes", VectorData=True )
         self.vtkContents  += '</Points>\n'
-        self.vtkContents  += self.vtk_add_Cells( Elem=Elem )
+        self.vtkContents  += self.vtk_add_Cells( Elem=Elem, offsets=offsets, types=types )
         # ------------------------------------------------- #
         # --- [4] Close UnstructuredGrid & Piece Tag    --- #
         # ------------------------------------------------- #
@@ -88,34 +172,129 @@ class vtk_makeUnstructuredGrid():
         self.vtkContents  += '</UnstructuredGrid>\n'
 
 
+    # ------------------------------------------------- #
+    # --- averageFields                             --- #
+    # ------------------------------------------------- #
+    def averageFields( self, PointFields=None, CellFields=None, nNodes=None, Elem=None, offsets=None ):
+        #  -- point fields => cell means ( gather ), cell fields => point means ( scatter-add ), -- #
+        #  -- under the same name, unless that name is already given in the other section        -- #
+        toCell, toPoint = cpd.AverageModes[ self.average ]
+        addCell  = { key:( cpd.pointToCell( Data=Data, Elem=Elem, offsets=offsets ), VectorData ) \
+                     for key,( Data, VectorData ) in PointFields.items() if ( toCell  and ( key not in CellFields  ) ) }
+        addPoint = { key:( cpd.cellToPoint( Data=Data, Elem=Elem, nNodes=nNodes, offsets=offsets ), VectorData ) \
+                     for key,( Data, VectorData ) in CellFields.items()  if ( toPoint and ( key not in PointFields ) ) }
+        return( { **PointFields, **addPoint }, { **CellFields, **addCell } )
+
+
+    # ------------------------------------------------- #
+    # --- vtk_add_FieldData                         --- #
+    # ------------------------------------------------- #
+    def vtk_add_FieldData( self, Fields=None, tag="PointData" ):
+        #  -- Fields are resolved, active Scalars / Vectors :: first scalar / 3-component field -- #
+        if ( not( Fields ) ): return( "" )
+        ret  = '<{0}{1}>\n'.format( tag, fda.activeAttributes( Fields=Fields ) )
+        for DataName, ( Data, VectorData ) in Fields.items():
+            ret += self.vtk_add_DataArray( Data=Data, DataName=DataName, VectorData=VectorData )
+        ret += '</{0}>\n'.format( tag )
+        return( ret )
+
+
     # ========================================================= #
     # ===  vtk_add_Cells                                    === #
     # ========================================================= #
-    def vtk_add_Cells( self, Elem=None, ElementType=None ):
+    def vtk_add_Cells( self, Elem=None, ElementType=None, offsets=None, types=None ):
         if ( Elem is None ): sys.exit( "[vtk_add_Cell] Elem == ???" )
         ret    = ""
-        nElems = Elem.shape[0]
-        nVerts = Elem.shape[1]
-        if ( ElementType is None ):
-            if ( nVerts == 1 ): ElementType = "vertex"
-            if ( nVerts == 2 ): ElementType = "line"
-            if ( nVerts == 3 ): ElementType = "triangle"
-            if ( nVerts == 4 ): ElementType = "tetra"
-            if ( nVerts == 5 ): ElementType = "pyramid"
-            if ( nVerts == 6 ): ElementType = "hexahedron"
-        ElementTypeTable = { "vertex":1, "poly_vertex":2, "line":3, "poly_line":4, "triangle":5, \
-                             "polygon":7, "pixel":8, "quad":9, "tetra":10, "voxel":11, "hexahedron":12, \
-                             "hexa":12, "pyramid":14 }
-        types   = np.ones( (nElems,), dtype=np.int64 ) * ElementTypeTable[ElementType]
-        offsets = ( np.arange( nElems, dtype=np.int64 ) + 1 ) * nVerts
-        connect = np.array( Elem, dtype=np.int64 )
+        connect, offsets, types = self.prepareCells( Elem=Elem, ElementType=ElementType, offsets=offsets, types=types )
         ret   += "<Cells>\n"
-        ret   += self.vtk_add_DataArray( Data=connect , DataName="connectivity", VectorData=True, nComponents=1 )
+        ret   += self.vtk_add_DataArray( Data=connect , DataName="connectivity", VectorData=( connect.ndim == 2 ), nComponents=1 )
         ret   += self.vtk_add_DataArray( Data=offsets , DataName="offsets"      )
         ret   += self.vtk_add_DataArray( Data=types   , DataName="types"        )
         ret   += "</Cells>\n"
         return( ret )
 
+
+    # ------------------------------------------------- #
+    # --- prepareCells                              --- #
+    # ------------------------------------------------- #
+    def prepareCells( self, Elem=None, ElementType=None, offsets=None, types=None ):
+        # ------------------------------------------------- #
+        # --- [1] connectivity & offsets                --- #
+        # ------------------------------------------------- #
+        #  -- ( nElems,nVerts ) :: kept 2D,  padded ( -1 ) / CSR :: flattened 1D connectivity -- #
+        Elem     = np.asarray( Elem )
+        if   ( Elem.ndim == 1 ):
+            if ( offsets is None ):
+                sys.exit( "[prepareCells-@makeUnstructuredGrid-] 1D Elem ( connectivity ) needs offsets [ERROR]" )
+            connect  = Elem.astype( np.int64, copy=False )
+            offsets  = self.endOffsets( offsets=offsets )
+            counts   = np.diff( offsets, prepend=0 )
+            if ( ( offsets.size > 0 ) and ( offsets[-1] != connect.size ) ):
+                sys.exit( "[prepareCells-@makeUnstructuredGrid-] offsets[-1] = {0} != connectivity size {1} [ERROR]"\
+                          .format( offsets[-1], connect.size ) )
+        elif ( Elem.ndim == 2 ):
+            nElems, nVerts = Elem.shape
+            valid    = ( Elem >= 0 )
+            if ( valid.all() ):
+                connect  = Elem.astype( np.int64, copy=False )
+                offsets  = ( np.arange( nElems, dtype=np.int64 ) + 1 ) * nVerts
+                counts   = np.full( (nElems,), nVerts, dtype=np.int64 )
+            else:
+                if ( np.any( valid[:,1:] & ~valid[:,:-1] ) ):
+                    sys.exit( "[prepareCells-@makeUnstructuredGrid-] -1 padding should come after the vertices [ERROR]" )
+                counts   = np.count_nonzero( valid, axis=1 ).astype( np.int64 )
+                connect  = Elem[valid].astype( np.int64, copy=False )
+                offsets  = np.cumsum( counts )
+        else:
+            sys.exit( "[prepareCells-@makeUnstructuredGrid-] Elem should be 1D or 2D [ERROR]" )
+        # ------------------------------------------------- #
+        # --- [2] types                                 --- #
+        # ------------------------------------------------- #
+        if ( types is None ): types = ElementType
+        types    = self.cellTypes( types=types, counts=counts )
+        if ( types.size != offsets.size ):
+            sys.exit( "[prepareCells-@makeUnstructuredGrid-] {0} types for {1} cells [ERROR]".format( types.size, offsets.size ) )
+        return( connect, offsets, types )
+
+
+    # ------------------------------------------------- #
+    # --- cellTypes                                 --- #
+    # ------------------------------------------------- #
+    def cellTypes( self, types=None, counts=None ):
+        #  -- types :: None ( from counts ), ElementType name, array of type ids or of names -- #
+        nElems   = counts.size
+        if   ( types is None ):
+            lut      = np.full( ( max( nVertsTable ) + 1, ), -1, dtype=np.int64 )
+            for nVerts,ElementType in nVertsTable.items():
+                lut[nVerts] = ElementTypeTable[ElementType]
+            inRange  = ( counts < lut.size )
+            types    = np.where( inRange, lut[ np.where( inRange, counts, 0 ) ], -1 )
+            if ( np.any( types < 0 ) ):
+                sys.exit( "[cellTypes-@makeUnstructuredGrid-] no default type for {0} vertices, give types [ERROR]"\
+                          .format( np.unique( counts[ types < 0 ] ) ) )
+            return( types )
+        if ( isinstance( types, str ) ):
+            return( np.full( (nElems,), ElementTypeTable[types], dtype=np.int64 ) )
+        types    = np.asarray( types )
+        if ( types.dtype.kind in "US" ):
+            names, inverse = np.unique( types, return_inverse=True )
+            return( np.array( [ ElementTypeTable[str(name)] for name in names ], dtype=np.int64 )[inverse] )
+        return( types.astype( np.int64, copy=False ) )
+
+
+    # ------------------------------------------------- #
+    # --- endOffsets / countCells                   --- #
+    # ------------------------------------------------- #
+    def endOffsets( self, offsets=None ):
+        #  -- VTK end offsets ( nElems ), or CSR row pointers ( nElems+1, starting with 0 ) -- #
+        offsets  = np.asarray( offsets, dtype=np.int64 )
+        if ( ( offsets.size > 0 ) and ( offsets[0] == 0 ) ): offsets = offsets[1:]
+        return( offsets )
+
+    def countCells( self, Elem=None, offsets=None ):
+        if ( np.ndim( Elem ) == 1 ): return( self.endOffsets( offsets=offsets ).size )
+        return( Elem.shape[0] )
+
     
     # ------------------------------------------------- #
     # --- vtk_add_DataArray                         --- #
@@ -124,21 +303,23 @@ class vtk_makeUnstructuredGrid():
         if ( Data        is None ): sys.exit( "[vtk_add_DataArray -@makeUnstructuredGrid-] Data     == ??? " )
         if ( DataName    is None ): sys.exit( "[vtk_add_DataArray -@makeUnstructuredGrid-] DataName == ??? " )
         if ( DataFormat  is None ): DataFormat  = self.DataFormat
-        if ( DataType    is None ): DataType    = self.inquiryData( Data=Data, ret_DataType   =True, VectorData=VectorData )
-        if ( nComponents is None ): nComponents = self.inquiryData( Data=Data, ret_nComponents=True, VectorData=VectorData )
-        if ( nData       is None ): nData       = self.inquiryData( Data=Data, ret_nData      =True, VectorData=VectorData )
+        if ( self.downcast       ): Data        = eda.downcastArray( Data=Data )
+        info = self.inquiryData( Data=Data, VectorData=VectorData )
+        if ( DataType    is None ): DataType    = info["DataType"]
+        if ( nComponents is None ): nComponents = info["nComponents"]
+        if ( nData       is None ): nData       = info["nData"]
+        if ( DataFormat.lower() == "appended" ):
+            offset = self.appended.add_DataArray( Data=Data, compressor=self.compressor, level=self.level, \
+                                                  DataName=DataName, stats=self.stats, cache=ecc.sharedCache() )
+            return( '<DataArray Name="{0}" type="{1}" NumberOfComponents="{2}" format="{3}" offset="{4}"/>\n'\
+                    .format( DataName, DataType, nComponents, DataFormat, offset ) )
         ret  = ""
         ret += '<DataArray Name="{0}" type="{1}" NumberOfComponents="{2}" format="{3}">\n'\
                                  .format( DataName, DataType, nComponents, DataFormat )
-        lines = ""
-        if ( VectorData ):
-            for line in Data:
-                lines += ( " ".join( [ str( val ) for val in line ] ) + "\n" )
-        else:
-            for line in np.ravel( Data ):
-                lines += "{0} ".format( line )
-            lines += "\n"
-        ret += lines
+        ret += eda.encodeDataArray( Data=Data, DataFormat=DataFormat, rowWise=( nComponents != 1 ), \
+                                   compressor=self.compressor, level=self.level, \
+                                   DataName=DataName, stats=self.stats, cache=ecc.sharedCache(), \
+                                   float_format=self.float_format )
         ret += '</DataArray>\n'
         return( ret )
     
@@ -146,46 +327,93 @@ class vtk_makeUnstructuredGrid():
     # ------------------------------------------------- #
     # --- vtk_writeFile                             --- #
     # ------------------------------------------------- #
-    def vtk_writeFile( self, vtkFile=None ):
+    def vtk_writeFile( self, vtkFile=None, pretty=None ):
+        #  -- vtkFile :: path, or a file object opened in "wb" -- #
         if ( vtkFile is None ): vtkFile = self.vtkFile
-        with open( vtkFile, "w" ) as f:
-            f.write( self.vtkContents )
-            f.write( self.vtkEndTags  )
-        subprocess.call( ( "xmllint --format --encode utf-8 {0} -o {0}"\
-                           .format( vtkFile ) ).split() )
-        print( "[vtk_writeFile-@makeUnstructuredGrid-] VTK File output :: {0}".format( vtkFile ) )
+        if ( pretty  is None ): pretty  = self.pretty
+        with xwr.openXML( vtkFile ) as f:
+            depth = xwr.writeXML( f=f, contents=self.vtkContents, pretty=pretty )
+            if ( self.appended is not None ):
+                self.appended.writeAppendedData( f=f, indent=xwr.indentOf( depth=depth, pretty=pretty ) )
+            xwr.writeXML( f=f, contents=self.vtkEndTags, pretty=pretty, depth=depth )
+        print( "[vtk_writeFile-@makeUnstructuredGrid-] VTK File output :: {0}".format( xwr.nameOf( vtkFile ) ) )
+        return( self.stats )
 
 
     # ------------------------------------------------- #
-    # --- inquiryData                               --- #
+    # --- vtk_writePieces                           --- #
     # ------------------------------------------------- #
-    def inquiryData( self, Data=None, VectorData=False, ret_DataType=False, ret_nComponents=False, ret_nData=False ):
-        if ( Data is None ): sys.exit( "[inquiryData-@vtk_makeUnstructuredGrid-] Data  == ??? " )
+    def vtk_writePieces( self, nPieces=None, nProcs=None, GhostLevel=0, vtkFile=None ):
         # ------------------------------------------------- #
-        # --- [1] DataType Check                        --- #
+        # --- [1] Arguments                             --- #
         # ------------------------------------------------- #
-        if ( type(Data) is not np.ndarray ):
-            sys.exit( "[inquiryData-@vtk_makeUnstructuredGrid-] Data should be np.ndarray [ERROR]" )
-        if ( Data.dtype == np.int32   ): DataType = "Int32"
-        if ( Data.dtype == np.int64   ): DataType = "Int64"
-        if ( Data.dtype == np.float32 ): DataType = "Float32"
-        if ( Data.dtype == np.float64 ): DataType = "Float64"
+        #  -- pieces are element ranges, each with its own ( renumbered ) used nodes ;              -- #
+        #  -- every field of self.PointFields / self.CellFields, averaged on the whole grid first -- #
+        if ( nPieces  is None ): sys.exit( "[vtk_writePieces-@makeUnstructuredGrid-] nPieces == ??? " )
+        if ( not( self.PointFields ) and not( self.CellFields ) ):
+            sys.exit( "[vtk_writePieces-@makeUnstructuredGrid-] no PointData / CellData [ERROR]" )
+        if ( vtkFile  is None ): vtkFile  = self.vtkFile
+        connect, offsets, types = self.prepareCells( Elem=self.Elem, offsets=self.offsets, types=self.types )
+        nNodes      = self.Node.shape[0]
+        PointFields = fda.resolveFields( Fields=self.PointFields, nTuples=nNodes       )
+        CellFields  = fda.resolveFields( Fields=self.CellFields , nTuples=offsets.size )
+        PointFields, CellFields = self.averageFields( PointFields=PointFields, CellFields=CellFields, \
+                                                      nNodes=nNodes, Elem=self.Elem, offsets=self.offsets )
+        ranges      = pwr.splitRange( nItems=offsets.size, nPieces=nPieces )
+        heads       = offsets - np.diff( offsets, prepend=0 )
         # ------------------------------------------------- #
-        # --- [2] Data Shape Check                      --- #
+        # --- [2] write each piece on a process pool    --- #
         # ------------------------------------------------- #
-        if ( VectorData is True ):
-            nComponents = Data.shape[-1]
-            nData       = np.size( Data[-1][:] )
-        else:
-            nComponents = 1
-            nData       = np.size( Data[:]    )
+        #  -- mixed cells are cut out of the 1D connectivity, offsets rebased to the piece -- #
+        pieces      = []
+        for ik,( e0,e1 ) in enumerate( ranges ):
+            if ( connect.ndim == 2 ):
+                Elem, pOffsets = connect[e0:e1], None
+            else:
+                Elem, pOffsets = connect[heads[e0]:offsets[e1-1]], offsets[e0:e1] - heads[e0]
+            used     = np.unique( Elem )
+            pFields  = { key:( Data[used] , VectorData ) for key,( Data, VectorData ) in PointFields.items() }
+            cFields  = { key:( Data[e0:e1], VectorData ) for key,( Data, VectorData ) in CellFields.items()  }
+            pieces  += [ { "vtkFile"   :pwr.pieceFileName( vtkFile=vtkFile, iPiece=ik ), \
+                           "PointFields":pFields, "CellFields":cFields, "Node":self.Node[used], \
+                           "Elem"      :np.searchsorted( used, Elem ), \
+                           "offsets"   :pOffsets, "types":types[e0:e1], \
+                           "DataFormat":self.DataFormat, "compressor":self.compressor, "level":self.level, \
+                           "pretty"    :self.pretty, \
+                           "float_format":self.float_format, "downcast":self.downcast } ]
+        pwr.writePieces( writer=vtk_makeUnstructuredGrid, pieces=pieces, nProcs=nProcs )
         # ------------------------------------------------- #
-        # --- [3] Return                                --- #
+        # --- [3] PUnstructuredGrid summary file        --- #
         # ------------------------------------------------- #
-        if ( ret_DataType    ): return( DataType    )
-        if ( ret_nComponents ): return( nComponents )
-        if ( ret_nData       ): return( nData       )
-        return( { "DataType":DataType, "nComponents":nComponents, "nData":nData } )
+        contents     = '<?xml version="1.0" encoding="utf-8"?>\n'
+        contents    += '<VTKFile type="PUnstructuredGrid"{0}>\n'.format( eda.fileAttributes( DataFormat=self.DataFormat, compressor=self.compressor ) )
+        contents    += '<PUnstructuredGrid GhostLevel="{0}">\n'.format( GhostLevel )
+        contents    += pwr.summaryFields( Fields=PointFields, tag="PPointData", downcast=self.downcast )
+        contents    += pwr.summaryFields( Fields=CellFields , tag="PCellData" , downcast=self.downcast )
+        contents    += '<PPoints>\n'
+        contents    += '<PDataArray type="{0}" Name="Nodes" NumberOfComponents="{1}"/>\n'\
+            .format( eda.downcastType( DataType=self.inquiryData( Data=self.Node, ret_DataType=True ), downcast=self.downcast ), self.Node.shape[-1] )
+        contents    += '</PPoints>\n'
+        for piece in pieces:
+            contents += '<Piece Source="{0}"/>\n'.format( os.path.basename( piece["vtkFile"] ) )
+        contents    += '</PUnstructuredGrid>\n'
+        contents    += '</VTKFile>\n'
+        with open( pwr.summaryFileName( vtkFile=vtkFile ), "wb" ) as f:
+            xwr.writeXML( f=f, contents=contents, pretty=self.pretty )
+        print( "[vtk_writePieces-@makeUnstructuredGrid-] VTK File output :: {0}".format( pwr.summaryFileName( vtkFile=vtkFile ) ) )
+
+
+    # ------------------------------------------------- #
+    # --- inquiryData                               --- #
+    # ------------------------------------------------- #
+    def inquiryData( self, Data=None, VectorData=False, ret_DataType=False, ret_nComponents=False, ret_nData=False ):
+        #  -- DataType, nComponents, nData in 1 pass, memoized in self.inquiry -- #
+        if ( Data is None ): sys.exit( "[inquiryData-@vtk_makeUnstructuredGrid-] Data  == ??? " )
+        info = self.inquiry.inquire( Data=Data, VectorData=VectorData )
+        if ( ret_DataType    ): return( info["DataType"]    )
+        if ( ret_nComponents ): return( info["nComponents"] )
+        if ( ret_nData       ): return( info["nData"]       )
+        return( info )
 
         
     # ------------------------------------------------- #
@@ -196,7 +424,7 @@ class vtk_makeUnstructuredGrid():
         # --- [1] Data Array Type/Shape Check           --- #
         # ------------------------------------------------- #
         if ( Data is None   ): return()
-        if ( type(Data) is not np.ndarray ):
+        if ( not( isinstance( Data, np.ndarray ) ) ):
             sys.exit( "[prepareData-@vtk_makeUnstructuredGrid-] Data should be np.ndarray [ERROR]" )
         if ( Data.ndim >= 5 ):
             sys.exit( "[prepareData-@vtk_makeUnstructuredGrid-] incorrect Data size ( ndim >= 5 ) [ERROR]" )
@@ -220,6 +448,107 @@ class vtk_makeUnstructuredGrid():
             Data        = Data.reshape( self.LILJLK )
 
 
+
+# ========================================================= #
+# ===  vtk_makeUnstructuredGridSeries class             === #
+# ========================================================= #
+class vtk_makeUnstructuredGridSeries( vtk_makeUnstructuredGrid ):
+    # ------------------------------------------------- #
+    # --- class Initiator                           --- #
+    # ------------------------------------------------- #
+    #  -- Points / Cells are encoded once, each add_step encodes only the new field -- #
+    def __init__( self, pvdFile=None, Node=None, Elem=None, VectorData=False, DataFormat="ascii", \
+                  compressor=None, level=None, pretty=False, offsets=None, types=None, \
+                  precision=None, float_format=None, downcast=False, average=None ):
+        # --- [1-1] Arguments                       --- #
+        if ( pvdFile is None ): pvdFile = "out.pvd"
+        if ( average not in cpd.AverageModes ):
+            sys.exit( "[vtk_makeUnstructuredGridSeries] unknown average :: {0} [ERROR]".format( average ) )
+        if ( Node    is None ): sys.exit( "[vtk_makeUnstructuredGridSeries] Node == ??? " )
+        if ( Elem    is None ): sys.exit( "[vtk_makeUnstructuredGridSeries] Elem == ??? " )
+        # --- [1-2] Variables Settings              --- #
+        self.pvdFile     = pvdFile
+        self.vtkFile     = None
+        self.vtkContents = ''
+        self.vtkEndTags  = ''
+        self.Data        = None
+        self.Node        = Node
+        self.Elem        = Elem
+        self.offsets     = offsets
+        self.types       = types
+        self.nElems      = self.countCells( Elem=Elem, offsets=offsets )
+        self.DataFormat  = DataFormat
+        self.VectorData  = VectorData
+        self.compressor  = compressor
+        self.level       = level
+        self.stats       = cda.compressStats()
+        self.inquiry     = iqd.inquiryCache()
+        self.pretty      = pretty
+        self.float_format = eda.floatFormat( precision=precision, float_format=float_format )
+        self.downcast    = downcast
+        self.average     = average
+        self.appended    = None
+        if ( DataFormat.lower() == "appended" ):
+            self.appended = apw.appendedWriter( vtkFile=pvdFile )
+        self.DataDims    = None
+        self.LILJLK      = None
+        self.iStep       = 0
+        self.collection  = pvd.pvdCollection( pvdFile=pvdFile, pretty=pretty )
+        # --- [1-3] Routines                        --- #
+        self.vtk_add_VTKFileTag( datatype="UnstructuredGrid" )
+        self.vtkHeader   = self.vtkContents
+        self.vtkGeometry = '<Points>\n' \
+            + self.vtk_add_DataArray( Data=Node, DataName="Nodes", VectorData=True ) \
+            + '</Points>\n' \
+            + self.vtk_add_Cells( Elem=Elem, offsets=offsets, types=types )
+        if ( self.appended is not None ):
+            self.geometryOffset = self.appended.offset
+
+
+    # ------------------------------------------------- #
+    # --- add_step                                  --- #
+    # ------------------------------------------------- #
+    def add_step( self, Data=None, time=None, vtkFile=None, DataName=None, VectorData=None, \
+                  PointData=False, CellData=True ):
+        # ------------------------------------------------- #
+        # --- [1] Arguments                             --- #
+        # ------------------------------------------------- #
+        if ( Data       is None ): sys.exit( "[add_step-@vtk_makeUnstructuredGridSeries-] Data == ??? " )
+        if ( DataName   is None ): DataName   = "Data"
+        if ( VectorData is None ): VectorData = self.VectorData
+        if ( time       is None ): time       = self.iStep
+        if ( vtkFile    is None ):
+            vtkFile  = "{0}_{1:06}.vtu".format( os.path.splitext( self.pvdFile )[0], self.iStep )
+        Fields           = fda.asFields( Data=Data, DataName=DataName, VectorData=VectorData )
+        PointFields      = fda.resolveFields( Fields=( Fields if ( PointData is True ) else {} ), \
+                                              nTuples=self.Node.shape[0] )
+        CellFields       = fda.resolveFields( Fields=( Fields if ( ( PointData is not True ) and ( CellData is True ) ) else {} ), \
+                                              nTuples=self.nElems )
+        PointFields, CellFields = self.averageFields( PointFields=PointFields, CellFields=CellFields, \
+                                                      nNodes=self.Node.shape[0], Elem=self.Elem, offsets=self.offsets )
+        self.stats       = cda.compressStats()
+        # ------------------------------------------------- #
+        # --- [2] field + cached geometry               --- #
+        # ------------------------------------------------- #
+        self.vtkContents  = self.vtkHeader
+        self.vtkContents += '<UnstructuredGrid>\n'
+        self.vtkContents += '<Piece NumberOfPoints="{0}" NumberOfCells="{1}">\n'\
+            .format( self.Node.shape[0], self.nElems )
+        self.vtkContents += self.vtk_add_FieldData( Fields=PointFields, tag="PointData" )
+        self.vtkContents += self.vtk_add_FieldData( Fields=CellFields , tag="CellData"  )
+        self.vtkContents += self.vtkGeometry
+        self.vtkContents += '</Piece>\n'
+        self.vtkContents += '</UnstructuredGrid>\n'
+        # ------------------------------------------------- #
+        # --- [3] write step & update .pvd              --- #
+        # ------------------------------------------------- #
+        self.vtk_writeFile( vtkFile=vtkFile )
+        if ( self.appended is not None ):
+            self.appended.truncate( offset=self.geometryOffset )
+        self.collection.add_DataSet( vtkFile=vtkFile, timestep=time )
+        self.iStep += 1
+        return( self.stats )
+
             
 # ======================================== #
 # ===  実行部                          === #
@@ -232,8 +561,6 @@ if ( __name__=="__main__" ):
         Elem  = np.array( rElem[:,1:], dtype=np.int64 )
     with open( nodeFile, "r" ) as f:
         Node  = np.loadtxt( f )
-    Data    = np.zeros( (Elem.shape[0]) )
-    for iE,el in enumerate( Elem ):
-        Data[iE] = 0.25 * ( Node[el[0],2] + Node[el[1],2] + Node[el[2],2] + Node[el[3],2] )
+    Data    = cpd.pointToCell( Data=Node[:,2], Elem=Elem )
     vtk     = vtk_makeUnstructuredGrid( Data=Data, Elem=Elem, Node=Node )
         
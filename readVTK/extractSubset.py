@@ -0,0 +1,95 @@
+import sys
+import numpy as np
+import readVTK.readVTK                         as rvt
+import makeImageData.makeImageData             as mid
+import makeRectilinearGrid.makeRectilinearGrid as mrg
+
+# -- dataset type => writer -- #
+WriterTable = { "ImageData":mid.vtk_makeImageData, "RectilinearGrid":mrg.vtk_makeRectilinearGrid }
+
+
+# ========================================================= #
+# ===  vtk_extractSubset                                === #
+# ========================================================= #
+def vtk_extractSubset( vtkFile=None, outFile=None, extent=None, stride=None, DataFormat="appended", \
+                       compressor=None, level=None, pretty=False, nThreads=None ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- extent :: ( ( i0,i1 ), ( j0,j1 ), ( k0,k1 ) ), inclusive point indices in the file's Extent, -- #
+    #  --           None for a whole axis ; stride :: int or ( si,sj,sk ), every n-th point / cell     -- #
+    #  -- only the rows of the sub-extent are read ( raw bytes, or the compressed blocks holding them ) -- #
+    if ( vtkFile is None ): sys.exit( "[vtk_extractSubset-@extractSubset-] vtkFile == ??? " )
+    if ( outFile is None ): sys.exit( "[vtk_extractSubset-@extractSubset-] outFile == ??? " )
+    if ( stride  is None ): stride = 1
+    if ( np.ndim( stride ) == 0 ): stride = ( stride, )*3
+    if ( extent  is None ): extent = ( None, None, None )
+    with rvt.vtk_readVTK( vtkFile=vtkFile, nThreads=nThreads ) as reader:
+        if ( reader.datatype not in WriterTable ):
+            sys.exit( "[vtk_extractSubset-@extractSubset-] unsupported type :: {0} [ERROR]".format( reader.datatype ) )
+        if ( len( reader.pieces ) != 1 ):
+            sys.exit( "[vtk_extractSubset-@extractSubset-] {0} pieces, 1 expected [ERROR]".format( len( reader.pieces ) ) )
+        # ------------------------------------------------- #
+        # --- [2] point / cell extents ( piece-local )   --- #
+        # ------------------------------------------------- #
+        fileExt    = [ int( val ) for val in reader.pieces[0]["Extent"].split() ]
+        nPts       = reader.dims( section="PointData" )
+        nCells     = reader.dims( section="CellData"  )
+        pExtent, cExtent, sizes = [], [], []
+        for ik in range( 3 ):
+            i0, i1 = ( fileExt[2*ik], fileExt[2*ik+1] ) if ( extent[ik] is None ) else extent[ik]
+            i0, i1 = i0 - fileExt[2*ik], i1 - fileExt[2*ik]
+            if ( not( 0 <= i0 <= i1 < nPts[ik] ) ):
+                sys.exit( "[vtk_extractSubset-@extractSubset-] extent {0} out of {1} [ERROR]"\
+                          .format( extent, reader.pieces[0]["Extent"] ) )
+            #  -- last point on the stride, cells between the kept points ( 1 cell if degenerate ) -- #
+            n      = ( i1 - i0 ) // stride[ik] + 1
+            i1     = i0 + ( n-1 ) * stride[ik]
+            c0     = min( i0, nCells[ik]-1 )
+            c1     = min( max( i1-1, c0 ), nCells[ik]-1 )
+            pExtent += [ ( i0, i1 ) ]
+            cExtent += [ ( c0, c1 ) ]
+            sizes   += [ n ]
+        # ------------------------------------------------- #
+        # --- [3] geometry of the subset                --- #
+        # ------------------------------------------------- #
+        if ( reader.datatype == "ImageData" ):
+            Origin  = [ float( val ) for val in reader.dataset.get( "Origin" , "0 0 0" ).split() ]
+            Spacing = [ float( val ) for val in reader.dataset.get( "Spacing", "1 1 1" ).split() ]
+            Origin  = [ Origin[ik] + ( fileExt[2*ik] + pExtent[ik][0] ) * Spacing[ik] for ik in range( 3 ) ]
+            Spacing = [ Spacing[ik] * stride[ik] for ik in range( 3 ) ]
+            vtk     = mid.vtk_makeImageData( vtkFile=outFile, Origin=Origin, Spacing=Spacing, \
+                                             DataFormat=DataFormat, compressor=compressor, level=level, pretty=pretty )
+        else:
+            names   = reader.keys( section="Coordinates" )
+            axes    = [ np.asarray( reader.get( name=name, section="Coordinates" ) )\
+                        [ pExtent[ik][0]:pExtent[ik][1]+1:stride[ik] ] for ik,name in enumerate( names ) ]
+            vtk     = mrg.vtk_makeRectilinearGrid( vtkFile=outFile, xAxis=axes[0], yAxis=axes[1], zAxis=axes[2], \
+                                                   DataFormat=DataFormat, compressor=compressor, level=level, \
+                                                   pretty=pretty )
+        # ------------------------------------------------- #
+        # --- [4] PointData / CellData                  --- #
+        # ------------------------------------------------- #
+        #  -- ( nk,nj,ni[,nComp] ) in file order => ( ni,nj,nk[,nComp] ), bytes as they are ( i fastest ) -- #
+        cSizes     = [ len( range( c0, c1+1, s ) ) for ( c0, c1 ), s in zip( cExtent, stride ) ]
+        if ( not( reader.keys( section="PointData" ) ) ):
+            #  -- cell-only ImageData :: trailing 1-point axes are dropped, the writer adds 1 point per axis -- #
+            while ( ( len( cSizes ) > 1 ) and ( sizes[len( cSizes )-1] == 1 ) ): cSizes = cSizes[:-1]
+        for section, ext, shape, add in [ ( "PointData", pExtent, sizes , vtk.add_point_data ), \
+                                          ( "CellData" , cExtent, cSizes, vtk.add_cell_data  ) ]:
+            for name in reader.keys( section=section ):
+                Data  = reader.getExtent( name=name, section=section, extent=ext, stride=stride )
+                nComp = int( reader.info( name=name, section=section ).get( "NumberOfComponents", 1 ) )
+                Data  = Data.reshape( tuple( shape ) + ( ( nComp, ) if ( nComp > 1 ) else () ) )
+                add( name=name, array=Data, VectorData=( nComp > 1 ) )
+        vtk.write()
+    return( vtk )
+
+
+# ======================================== #
+# ===  実行部                          === #
+# ======================================== #
+if ( __name__=="__main__" ):
+    vtkFile = sys.argv[1] if ( len( sys.argv ) > 1 ) else "out.vti"
+    outFile = sys.argv[2] if ( len( sys.argv ) > 2 ) else "sub.vti"
+    vtk     = vtk_extractSubset( vtkFile=vtkFile, outFile=outFile, stride=2 )
@@ -0,0 +1,391 @@
+import sys, re, mmap, base64, collections
+import numpy as np
+import vtkUtils.compressDataArray as cda
+
+# -- VTK type name => numpy dtype ( native byte order ) -- #
+DataTypeTable  = { "Int8" :np.int8 , "Int16" :np.int16 , "Int32" :np.int32 , "Int64" :np.int64 , \
+                   "UInt8":np.uint8, "UInt16":np.uint16, "UInt32":np.uint32, "UInt64":np.uint64, \
+                   "Float32":np.float32, "Float64":np.float64 }
+# -- VTKFile compressor attribute => compressor name -- #
+CompressorTable = { val:key for key,val in cda.compressorTable.items() }
+# -- XML tags / attributes ( data never contains "<" before <AppendedData> ) -- #
+TagPattern     = re.compile( rb'<(/?)([A-Za-z_][\w.-]*)([^>]*?)(/?)>' )
+AttrPattern    = re.compile( rb'([\w:.-]+)\s*=\s*"([^"]*)"' )
+SpacePattern   = re.compile( rb'\s' )
+
+
+# ========================================================= #
+# ===  vtk_readVTK class                                === #
+# ========================================================= #
+class vtk_readVTK():
+    # ------------------------------------------------- #
+    # --- class Initiator                           --- #
+    # ------------------------------------------------- #
+    #  -- .vti / .vtr / .vts / .vtu / .vtp :: the XML header is scanned once into an index, -- #
+    #  -- arrays are loaded on request :: appended raw as np.memmap ( zero copy ),           -- #
+    #  -- appended compressed / binary / ascii decoded on demand, 1 array at a time          -- #
+    def __init__( self, vtkFile=None, nThreads=None ):
+        # --- [1-1] Arguments                       --- #
+        if ( vtkFile is None ): sys.exit( "[vtk_readVTK] vtkFile == ??? " )
+        # --- [1-2] Variables Settings              --- #
+        self.vtkFile     = vtkFile
+        self.nThreads    = nThreads
+        self.file        = open( vtkFile, "rb" )
+        self.mm          = mmap.mmap( self.file.fileno(), 0, access=mmap.ACCESS_READ )
+        self.attributes  = {}
+        self.datatype    = None
+        self.dataset     = {}
+        self.pieces      = []
+        self.index       = []
+        self.dataStart   = None
+        self.layouts     = {}
+        self.blockCache  = collections.OrderedDict()
+        # --- [1-3] Routines                        --- #
+        self.scanHeader()
+
+
+    # ------------------------------------------------- #
+    # --- scanHeader                                --- #
+    # ------------------------------------------------- #
+    def scanHeader( self ):
+        # ------------------------------------------------- #
+        # --- [1] walk through the tags                 --- #
+        # ------------------------------------------------- #
+        #  -- inline DataArray contents are skipped ( only their byte range is kept ) -- #
+        stack, pos = [], 0
+        while ( True ):
+            match = TagPattern.search( self.mm, pos )
+            if ( match is None ): break
+            closing, tag, attrs, empty = match.groups()
+            tag, pos = tag.decode( "ascii" ), match.end()
+            if ( closing ):
+                if ( stack ): stack.pop()
+                continue
+            attrs = { key.decode( "ascii" ):val.decode( "utf-8" ) for key,val in AttrPattern.findall( attrs ) }
+            # ------------------------------------------------- #
+            # --- [2] VTKFile / dataset / Piece             --- #
+            # ------------------------------------------------- #
+            if   ( tag == "VTKFile" ):
+                self.attributes = attrs
+                self.datatype   = attrs.get( "type" )
+            elif ( tag == self.datatype ):
+                self.dataset    = attrs
+            elif ( tag == "Piece" ):
+                self.pieces    += [ attrs ]
+            elif ( tag == "AppendedData" ):
+                #  -- raw data starts just after "_", offsets are relative to it -- #
+                if ( attrs.get( "encoding", "raw" ) != "raw" ):
+                    sys.exit( "[scanHeader-@vtk_readVTK-] AppendedData encoding :: {0} [ERROR]"\
+                              .format( attrs.get( "encoding" ) ) )
+                self.dataStart  = self.mm.find( b"_", pos ) + 1
+                break
+            elif ( tag == "DataArray" ):
+                entry           = { **attrs, "section":stack[-1] if ( stack ) else None, \
+                                    "piece":len( self.pieces )-1, "start":None, "end":None }
+                if ( not( empty ) ):
+                    entry["start"] = pos
+                    entry["end"]   = self.mm.find( b"</DataArray>", pos )
+                    pos            = entry["end"]
+                self.index     += [ entry ]
+            if ( not( empty ) ): stack += [ tag ]
+        # ------------------------------------------------- #
+        # --- [3] header type / byte order / compressor --- #
+        # ------------------------------------------------- #
+        order           = ">" if ( self.attributes.get( "byte_order" ) == "BigEndian" ) else "<"
+        self.order      = order
+        self.headerType = np.dtype( DataTypeTable[ self.attributes.get( "header_type", "UInt32" ) ] ).newbyteorder( order )
+        self.compressor = None
+        if ( "compressor" in self.attributes ):
+            if ( self.attributes["compressor"] not in CompressorTable ):
+                sys.exit( "[scanHeader-@vtk_readVTK-] unsupported compressor :: {0} [ERROR]"\
+                          .format( self.attributes["compressor"] ) )
+            self.compressor = CompressorTable[ self.attributes["compressor"] ]
+
+
+    # ------------------------------------------------- #
+    # --- keys / info                               --- #
+    # ------------------------------------------------- #
+    def keys( self, section=None, piece=0 ):
+        return( [ entry["Name"] for entry in self.index \
+                  if ( ( entry["piece"] == piece ) and ( section in [ None, entry["section"] ] ) ) ] )
+
+    def info( self, name=None, section=None, piece=0 ):
+        #  -- index entry :: Name, type, NumberOfComponents, format, offset, section, piece -- #
+        for entry in self.index:
+            if ( ( entry.get( "Name" ) == name ) and ( entry["piece"] == piece ) \
+                 and ( section in [ None, entry["section"] ] ) ):
+                return( entry )
+        sys.exit( "[info-@vtk_readVTK-] no DataArray :: {0} ( section={1}, piece={2} ) [ERROR]"\
+                  .format( name, section, piece ) )
+
+
+    # ------------------------------------------------- #
+    # --- get / __getitem__                         --- #
+    # ------------------------------------------------- #
+    def get( self, name=None, section=None, piece=0 ):
+        # ------------------------------------------------- #
+        # --- [1] decode 1 DataArray                    --- #
+        # ------------------------------------------------- #
+        #  -- ( nTuples, ) or ( nTuples, nComponents ) -- #
+        entry  = self.info( name=name, section=section, piece=piece )
+        dtype  = np.dtype( DataTypeTable[ entry["type"] ] ).newbyteorder( self.order )
+        fmt    = entry.get( "format", "ascii" ).lower()
+        if   ( fmt == "appended" ):
+            ret = self.readAppended( offset=self.dataStart + int( entry["offset"] ), dtype=dtype )
+        elif ( fmt == "binary"   ):
+            ret = self.readBinary  ( text=self.mm[ entry["start"]:entry["end"] ], dtype=dtype )
+        elif ( fmt == "ascii"    ):
+            ret = np.array( self.mm[ entry["start"]:entry["end"] ].split(), dtype=dtype )
+        else:
+            sys.exit( "[get-@vtk_readVTK-] unknown format :: {0} [ERROR]".format( fmt ) )
+        nComp  = int( entry.get( "NumberOfComponents", 1 ) )
+        if ( nComp > 1 ): ret = ret.reshape( -1, nComp )
+        return( ret )
+
+    def __getitem__( self, name ):
+        return( self.get( name=name ) )
+
+
+    # ------------------------------------------------- #
+    # --- readAppended                              --- #
+    # ------------------------------------------------- #
+    def readAppended( self, offset=None, dtype=None ):
+        # ------------------------------------------------- #
+        # --- [1] raw :: header + bytes => np.memmap    --- #
+        # ------------------------------------------------- #
+        hSize  = self.headerType.itemsize
+        if ( self.compressor is None ):
+            nBytes = int( np.frombuffer( self.mm, dtype=self.headerType, count=1, offset=offset )[0] )
+            return( np.memmap( self.vtkFile, dtype=dtype, mode="r", offset=offset+hSize, \
+                               shape=( nBytes // dtype.itemsize, ) ) )
+        # ------------------------------------------------- #
+        # --- [2] compressed :: decode block by block   --- #
+        # ------------------------------------------------- #
+        nBlocks = int( np.frombuffer( self.mm, dtype=self.headerType, count=1, offset=offset )[0] )
+        header  = np.frombuffer( self.mm, dtype=self.headerType, count=3+nBlocks, offset=offset ).astype( np.int64 )
+        start   = offset + hSize * ( 3 + nBlocks )
+        bounds  = start + np.concatenate( [ [0], np.cumsum( header[3:] ) ] )
+        cblocks = ( self.mm[ bounds[ik]:bounds[ik+1] ] for ik in range( nBlocks ) )
+        return( self.decompress( header=header, cblocks=cblocks, dtype=dtype ) )
+
+
+    # ------------------------------------------------- #
+    # --- readBinary                                --- #
+    # ------------------------------------------------- #
+    def readBinary( self, text=None, dtype=None ):
+        # ------------------------------------------------- #
+        # --- [1] raw :: base64( header + bytes )       --- #
+        # ------------------------------------------------- #
+        #  -- the header may also be encoded on its own ( ends with "=" padding ) -- #
+        text   = b"".join( text.split() )
+        hSize  = self.headerType.itemsize
+        if ( self.compressor is None ):
+            hLen   = -( -hSize // 3 ) * 4
+            if ( b"=" in text[:hLen] ):
+                raw = base64.b64decode( text[hLen:] )
+            else:
+                raw = base64.b64decode( text )[hSize:]
+            return( np.frombuffer( raw, dtype=dtype ) )
+        # ------------------------------------------------- #
+        # --- [2] compressed :: base64( header ) + base64( blocks ) --- #
+        # ------------------------------------------------- #
+        nBlocks = int( np.frombuffer( base64.b64decode( text[:4*hSize] )[:hSize], dtype=self.headerType )[0] )
+        hLen    = -( -hSize * ( 3 + nBlocks ) // 3 ) * 4
+        header  = np.frombuffer( base64.b64decode( text[:hLen] )[:hSize*(3+nBlocks)], \
+                                 dtype=self.headerType ).astype( np.int64 )
+        body    = base64.b64decode( text[hLen:] )
+        bounds  = np.concatenate( [ [0], np.cumsum( header[3:] ) ] )
+        cblocks = ( body[ bounds[ik]:bounds[ik+1] ] for ik in range( nBlocks ) )
+        return( self.decompress( header=header, cblocks=cblocks, dtype=dtype ) )
+
+
+    # ------------------------------------------------- #
+    # --- getExtent                                 --- #
+    # ------------------------------------------------- #
+    def getExtent( self, name=None, extent=None, stride=None, section=None, piece=0 ):
+        # ------------------------------------------------- #
+        # --- [1] Arguments                             --- #
+        # ------------------------------------------------- #
+        #  -- extent :: ( ( i0,i1 ), ( j0,j1 ), ( k0,k1 ) ), inclusive, piece-local indices     -- #
+        #  -- stride :: int or ( si,sj,sk ), returns ( nk,nj,ni[,nComp] ) in file order ( i fastest ) -- #
+        #  -- only the bytes ( raw ) or blocks ( compressed ) of the selected rows are read        -- #
+        entry      = self.info( name=name, section=section, piece=piece )
+        dtype      = np.dtype( DataTypeTable[ entry["type"] ] ).newbyteorder( self.order )
+        nComp      = int( entry.get( "NumberOfComponents", 1 ) )
+        LI, LJ, LK = self.dims( section=entry["section"], piece=piece )
+        if ( extent is None ): extent = ( ( 0,LI-1 ), ( 0,LJ-1 ), ( 0,LK-1 ) )
+        if ( stride is None ): stride = 1
+        if ( np.ndim( stride ) == 0 ): stride = ( stride, )*3
+        ( i0,i1 ), ( j0,j1 ), ( k0,k1 ) = extent
+        si, sj, sk = stride
+        if ( not( ( 0 <= i0 <= i1 < LI ) and ( 0 <= j0 <= j1 < LJ ) and ( 0 <= k0 <= k1 < LK ) ) ):
+            sys.exit( "[getExtent-@vtk_readVTK-] extent {0} out of ( {1},{2},{3} ) [ERROR]".format( extent, LI, LJ, LK ) )
+        kIdx, jIdx = range( k0, k1+1, sk ), range( j0, j1+1, sj )
+        ret        = np.empty( ( len( kIdx ), len( jIdx ), len( range( i0, i1+1, si ) ), nComp ), dtype=dtype )
+        # ------------------------------------------------- #
+        # --- [2] k-planes ( rows j0..j1 ), or rows     --- #
+        # ------------------------------------------------- #
+        item       = nComp * dtype.itemsize
+        rowBytes   = LI * item
+        for ik,k in enumerate( kIdx ):
+            if ( sj == 1 ):
+                b0    = ( k*LJ + j0 ) * rowBytes
+                rows  = np.frombuffer( self.readRange( entry=entry, b0=b0, b1=b0+len( jIdx )*rowBytes ), dtype=dtype )
+                ret[ik] = rows.reshape( len( jIdx ), LI, nComp )[:,i0:i1+1:si]
+            else:
+                for jk,j in enumerate( jIdx ):
+                    b0    = ( k*LJ + j ) * rowBytes + i0 * item
+                    row   = np.frombuffer( self.readRange( entry=entry, b0=b0, b1=b0+( i1-i0+1 )*item ), dtype=dtype )
+                    ret[ik,jk] = row.reshape( -1, nComp )[::si]
+        return( ret if ( nComp > 1 ) else ret[...,0] )
+
+
+    # ------------------------------------------------- #
+    # --- dims                                      --- #
+    # ------------------------------------------------- #
+    def dims( self, section="PointData", piece=0 ):
+        #  -- ( LI,LJ,LK ) of points ( or cells, for CellData ) from the Piece Extent -- #
+        ext   = [ int( val ) for val in self.pieces[piece]["Extent"].split() ]
+        nPts  = [ ext[2*ik+1] - ext[2*ik] + 1 for ik in range( 3 ) ]
+        if ( section == "CellData" ): return( tuple( [ max( n-1, 1 ) for n in nPts ] ) )
+        return( tuple( nPts ) )
+
+
+    # ------------------------------------------------- #
+    # --- readRange                                 --- #
+    # ------------------------------------------------- #
+    def readRange( self, entry=None, b0=0, b1=0 ):
+        # ------------------------------------------------- #
+        # --- [1] bytes [b0,b1) of the decoded payload  --- #
+        # ------------------------------------------------- #
+        layout = self.layout( entry=entry )
+        if   ( layout["kind"] == "raw"    ):
+            return( self.mm[ layout["base"]+b0:layout["base"]+b1 ] )
+        elif ( layout["kind"] == "base64" ):
+            return( self.decodeRange( char0=layout["char0"], end=layout["end"], \
+                                      b0=layout["skip"]+b0, b1=layout["skip"]+b1 ) )
+        elif ( layout["kind"] == "whole"  ):
+            #  -- ascii, or base64 wrapped over lines :: decoded once, then sliced -- #
+            if ( "data" not in layout ):
+                raw = self.get( name=entry["Name"], section=entry["section"], piece=entry["piece"] )
+                layout["data"] = np.ascontiguousarray( raw ).reshape( -1 ).view( np.uint8 )
+            return( layout["data"][b0:b1] )
+        # ------------------------------------------------- #
+        # --- [2] compressed :: only the blocks needed  --- #
+        # ------------------------------------------------- #
+        blockSize = layout["blockSize"]
+        kBlocks   = range( b0 // blockSize, ( max( b1, b0+1 ) - 1 ) // blockSize + 1 )
+        todo      = [ kb for kb in kBlocks if ( ( id( entry ), kb ) not in self.blockCache ) ]
+        cblocks   = [ self.compressedBlock( layout=layout, kb=kb ) for kb in todo ]
+        for kb,block in zip( todo, cda.decompressBlocks( cblocks=cblocks, compressor=self.compressor, \
+                                                         nThreads=self.nThreads ) ):
+            self.blockCache[ ( id( entry ), kb ) ] = block
+        buff      = b"".join( [ self.blockCache[ ( id( entry ), kb ) ] for kb in kBlocks ] )
+        for kb in kBlocks: self.blockCache.move_to_end( ( id( entry ), kb ) )
+        while ( len( self.blockCache ) > max( 8, len( kBlocks ) ) ):
+            self.blockCache.popitem( last=False )
+        start     = kBlocks[0] * blockSize
+        return( buff[ b0-start:b1-start ] )
+
+
+    # ------------------------------------------------- #
+    # --- layout                                    --- #
+    # ------------------------------------------------- #
+    def layout( self, entry=None ):
+        # ------------------------------------------------- #
+        # --- [1] where the payload of entry lies       --- #
+        # ------------------------------------------------- #
+        #  -- raw :: mm offset, base64 :: 1 line of base64 ( whitespace inside => whole ), -- #
+        #  -- blocks :: header + compressed block bounds ( mm offsets, or base64 stream )   -- #
+        if ( id( entry ) in self.layouts ): return( self.layouts[ id( entry ) ] )
+        hSize  = self.headerType.itemsize
+        fmt    = entry.get( "format", "ascii" ).lower()
+        ret    = { "kind":"whole" }
+        if   ( fmt == "appended" ):
+            offset  = self.dataStart + int( entry["offset"] )
+            if ( self.compressor is None ):
+                ret = { "kind":"raw", "base":offset+hSize }
+            else:
+                nBlocks = int( np.frombuffer( self.mm, dtype=self.headerType, count=1, offset=offset )[0] )
+                header  = np.frombuffer( self.mm, dtype=self.headerType, count=3+nBlocks, offset=offset ).astype( np.int64 )
+                ret     = { "kind":"blocks", "blockSize":int( header[1] ), "char0":None, "end":None, \
+                            "bounds":offset + hSize*( 3+nBlocks ) + np.concatenate( [ [0], np.cumsum( header[3:] ) ] ) }
+        elif ( fmt == "binary"   ):
+            start   = entry["start"] + ( len( self.mm[ entry["start"]:entry["end"] ] ) \
+                                         - len( self.mm[ entry["start"]:entry["end"] ].lstrip() ) )
+            end     = start + len( self.mm[ start:entry["end"] ].rstrip() )
+            if ( SpacePattern.search( self.mm, start, end ) is None ):
+                if ( self.compressor is None ):
+                    hLen = -( -hSize // 3 ) * 4
+                    if ( b"=" in self.mm[ start:start+hLen ] ):
+                        ret = { "kind":"base64", "char0":start+hLen, "end":end, "skip":0     }
+                    else:
+                        ret = { "kind":"base64", "char0":start     , "end":end, "skip":hSize }
+                else:
+                    nBlocks = int( np.frombuffer( base64.b64decode( self.mm[ start:start+4*hSize ] )[:hSize], \
+                                                  dtype=self.headerType )[0] )
+                    hLen    = -( -hSize * ( 3 + nBlocks ) // 3 ) * 4
+                    header  = np.frombuffer( base64.b64decode( self.mm[ start:start+hLen ] )[:hSize*(3+nBlocks)], \
+                                             dtype=self.headerType ).astype( np.int64 )
+                    ret     = { "kind":"blocks", "blockSize":int( header[1] ), "char0":start+hLen, "end":end, \
+                                "bounds":np.concatenate( [ [0], np.cumsum( header[3:] ) ] ) }
+        self.layouts[ id( entry ) ] = ret
+        return( ret )
+
+
+    # ------------------------------------------------- #
+    # --- compressedBlock / decodeRange             --- #
+    # ------------------------------------------------- #
+    def compressedBlock( self, layout=None, kb=0 ):
+        c0, c1 = int( layout["bounds"][kb] ), int( layout["bounds"][kb+1] )
+        if ( layout["char0"] is None ): return( self.mm[c0:c1] )
+        return( self.decodeRange( char0=layout["char0"], end=layout["end"], b0=c0, b1=c1 ) )
+
+    def decodeRange( self, char0=None, end=None, b0=0, b1=0 ):
+        #  -- bytes [b0,b1) of the base64 stream starting at char0, decoding whole 4-char quanta only -- #
+        c0  = char0 + 4 * ( b0 // 3 )
+        c1  = min( char0 + 4 * ( -( -b1 // 3 ) ), end )
+        dec = base64.b64decode( self.mm[c0:c1] )
+        return( dec[ b0 % 3:b0 % 3 + ( b1-b0 ) ] )
+
+
+    # ------------------------------------------------- #
+    # --- decompress                                --- #
+    # ------------------------------------------------- #
+    def decompress( self, header=None, cblocks=None, dtype=None ):
+        #  -- header = [ nBlocks, blockSize, lastBlockSize, cSize_1, ... ], lastBlockSize 0 :: full -- #
+        nBlocks, blockSize, lastSize = [ int( val ) for val in header[:3] ]
+        nBytes  = blockSize * nBlocks - ( ( blockSize - lastSize ) if ( lastSize > 0 ) else 0 )
+        ret     = np.empty( ( nBytes, ), dtype=np.uint8 )
+        iS      = 0
+        for block in cda.decompressBlocks( cblocks=cblocks, compressor=self.compressor, nThreads=self.nThreads ):
+            ret[iS:iS+len( block )] = np.frombuffer( block, dtype=np.uint8 )
+            iS += len( block )
+        return( ret.view( dtype ) )
+
+
+    # ------------------------------------------------- #
+    # --- close / with                              --- #
+    # ------------------------------------------------- #
+    def close( self ):
+        self.mm.close()
+        self.file.close()
+
+    def __enter__( self ):
+        return( self )
+
+    def __exit__( self, *args ):
+        self.close()
+
+
+# ======================================== #
+# ===  実行部                          === #
+# ======================================== #
+if ( __name__=="__main__" ):
+    vtkFile = sys.argv[1] if ( len( sys.argv ) > 1 ) else "out.vti"
+    with vtk_readVTK( vtkFile=vtkFile ) as reader:
+        print( "[vtk_readVTK] {0} :: {1} {2}".format( vtkFile, reader.datatype, reader.dataset ) )
+        for entry in reader.index:
+            Data = reader.get( name=entry["Name"], section=entry["section"], piece=entry["piece"] )
+            print( "  {0:>12} / {1:<16} {2:>8} {3:>10} {4}".format( entry["section"], entry["Name"], \
+                                                                  entry["type"], entry.get( "format" ), Data.shape ) )
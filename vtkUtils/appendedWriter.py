@@ -0,0 +1,141 @@
+import os, sys, shutil, tempfile
+import numpy as np
+import vtkUtils.encodeDataArray   as eda
+import vtkUtils.compressDataArray as cda
+
+
+# ========================================================= #
+# ===  appendedWriter class                             === #
+# ========================================================= #
+class appendedWriter():
+    # ------------------------------------------------- #
+    # --- class Initiator                           --- #
+    # ------------------------------------------------- #
+    #  -- raw payloads are spooled to disk as each DataArray is added,   -- #
+    #  -- and copied after <AppendedData encoding="raw"> on vtk_writeFile -- #
+    def __init__( self, vtkFile=None, bufSize=2**24 ):
+        # --- [1-1] Arguments                       --- #
+        if ( vtkFile is None ): vtkFile = "out.vtk"
+        # --- [1-2] Variables Settings              --- #
+        self.vtkFile  = vtkFile
+        self.bufSize  = bufSize
+        self.offset   = 0
+        self.spool    = tempfile.TemporaryFile( dir=os.path.dirname( os.path.abspath( vtkFile ) ) )
+        self.streams  = []
+
+
+    # ------------------------------------------------- #
+    # --- add_DataArray                             --- #
+    # ------------------------------------------------- #
+    def add_DataArray( self, Data=None, compressor=None, level=None, DataName=None, stats=None, cache=None ):
+        # ------------------------------------------------- #
+        # --- [1] Arguments                             --- #
+        # ------------------------------------------------- #
+        #  -- cache :: encodeCache, consulted for compressed payloads ( raw ones are a plain copy ) -- #
+        if ( Data is None ): sys.exit( "[add_DataArray-@appendedWriter-] Data == ??? " )
+        if ( not( eda.isArrayLike( Data ) ) ):
+            sys.exit( "[add_DataArray-@appendedWriter-] Data should be np.ndarray [ERROR]" )
+        # ------------------------------------------------- #
+        # --- [2] UInt64 header + raw bytes             --- #
+        # ------------------------------------------------- #
+        #  -- written chunk by chunk from the array buffer ( np.memmap is paged in as it goes ) -- #
+        offset       = self.offset
+        if   ( compressor is None ):
+            self.spool.write( np.array( [ Data.nbytes ], dtype=np.uint64 ).tobytes() )
+            for raw in eda.iterRawChunks( Data=Data, chunkSize=self.bufSize ):
+                self.spool.write( raw )
+            self.offset += 8 + Data.nbytes
+            return( offset )
+        elif ( cache is None ):
+            self.offset += cda.compressDataArrayTo( Data=Data, target=self.spool, compressor=compressor, \
+                                                    level=level, DataName=DataName, stats=stats )
+            return( offset )
+        # ------------------------------------------------- #
+        # --- [3] compressed payload through the cache  --- #
+        # ------------------------------------------------- #
+        key = cache.key( Data=Data, DataFormat="appended", compressor=compressor, level=level )
+        hit = cache.get( key=key )
+        if ( hit is None ):
+            header, blocks = cda.compressDataArray( Data=Data, compressor=compressor, level=level, \
+                                                    DataName=DataName, stats=stats )
+            cache.put( key=key, value=( header, blocks, Data.nbytes ), \
+                       nBytes=len( header ) + sum( [ len( block ) for block in blocks ] ) )
+        else:
+            header, blocks, nBytes = hit
+            if ( stats is not None ):
+                stats.add( DataName=DataName, nBytes=nBytes, elapsed=0.0, \
+                           cBytes=len( header ) + sum( [ len( block ) for block in blocks ] ) )
+        self.spool.write( header )
+        for block in blocks:
+            self.spool.write( block )
+        self.offset += len( header ) + sum( [ len( block ) for block in blocks ] )
+        return( offset )
+
+
+    # ------------------------------------------------- #
+    # --- add_Stream                                --- #
+    # ------------------------------------------------- #
+    def add_Stream( self, stream=None, compressor=None, level=None, stats=None ):
+        # ------------------------------------------------- #
+        # --- [1] register a streamArray payload        --- #
+        # ------------------------------------------------- #
+        #  -- the stream's own spool is copied only once, when writeAppendedData is called -- #
+        if ( stream is None ): sys.exit( "[add_Stream-@appendedWriter-] stream == ??? " )
+        offset       = self.offset
+        header, source, nBytes = stream.finalize( compressor=compressor, level=level, stats=stats )
+        self.spool.flush()
+        self.streams += [ { "offset":offset, "position":self.spool.tell(), "header":header, \
+                            "source":source, "nBytes":nBytes } ]
+        self.offset += len( header ) + nBytes
+        return( offset )
+
+
+    # ------------------------------------------------- #
+    # --- writeAppendedData                         --- #
+    # ------------------------------------------------- #
+    def writeAppendedData( self, f=None, indent="" ):
+        if ( f is None ): sys.exit( "[writeAppendedData-@appendedWriter-] f == ??? " )
+        self.spool.flush()
+        self.spool.seek( 0 )
+        f.write( ( indent + '<AppendedData encoding="raw">\n_' ).encode( "utf-8" ) )
+        position = 0
+        for stream in self.streams:
+            self.copyBytes( source=self.spool, target=f, nBytes=stream["position"]-position )
+            f.write( stream["header"] )
+            stream["source"].seek( 0 )
+            self.copyBytes( source=stream["source"], target=f, nBytes=stream["nBytes"] )
+            position = stream["position"]
+        shutil.copyfileobj( self.spool, f, self.bufSize )
+        f.write( ( '\n' + indent + '</AppendedData>\n' ).encode( "utf-8" ) )
+        self.spool.seek( 0, os.SEEK_END )
+
+
+    # ------------------------------------------------- #
+    # --- truncate                                  --- #
+    # ------------------------------------------------- #
+    #  -- drop every payload added after offset ( e.g. keep cached geometry only ) -- #
+    def truncate( self, offset=0 ):
+        self.streams  = [ stream for stream in self.streams if ( stream["offset"] < offset ) ]
+        position      = offset - sum( [ len( stream["header"] ) + stream["nBytes"] for stream in self.streams ] )
+        self.spool.flush()
+        self.spool.truncate( position )
+        self.spool.seek( position )
+        self.offset   = offset
+
+
+    # ------------------------------------------------- #
+    # --- copyBytes                                 --- #
+    # ------------------------------------------------- #
+    def copyBytes( self, source=None, target=None, nBytes=0 ):
+        while ( nBytes > 0 ):
+            buff    = source.read( min( self.bufSize, nBytes ) )
+            if ( not( buff ) ): break
+            target.write( buff )
+            nBytes -= len( buff )
+
+
+    # ------------------------------------------------- #
+    # --- close                                     --- #
+    # ------------------------------------------------- #
+    def close( self ):
+        self.spool.close()
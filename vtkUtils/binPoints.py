@@ -0,0 +1,175 @@
+import sys
+import numpy as np
+import concurrent.futures
+
+# -- per-voxel statistics, in output order -- #
+Statistics = [ "count", "sum", "mean", "min", "max" ]
+
+
+# ========================================================= #
+# ===  binPoints                                        === #
+# ========================================================= #
+def binPoints( xyz=None, values=None, LILJLK=None, Origin=None, Spacing=None, statistics=None, \
+               Point_or_Cell="cell", chunkSize=None, nProcs=None ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- xyz :: ( nPoints,3 ), values :: ( nPoints, ) or ( nPoints,nComp ), None => count only       -- #
+    #  -- LILJLK :: grid points, voxels are the cells ( "cell" ) or the boxes around points ( "point" ) -- #
+    #  -- returns { stat:( nVoxels, ) or ( nVoxels,nComp ) } in file order ( i fastest ), and info      -- #
+    #  -- empty voxels :: count = sum = 0, mean = min = max = NaN ; points outside the grid are dropped -- #
+    #  -- nProcs > 1 :: groups of chunks binned into partial grids on a process pool, reduced at the end -- #
+    if ( xyz    is None ): sys.exit( "[binPoints-@binPoints-] xyz    == ??? " )
+    if ( LILJLK is None ): sys.exit( "[binPoints-@binPoints-] LILJLK == ??? " )
+    if ( statistics is None ): statistics = Statistics if ( values is not None ) else [ "count" ]
+    if ( chunkSize  is None ): chunkSize  = 2**20
+    for stat in statistics:
+        if ( stat not in Statistics ): sys.exit( "[binPoints-@binPoints-] unknown statistics :: {0} [ERROR]".format( stat ) )
+    if ( ( values is None ) and ( set( statistics ) != { "count" } ) ):
+        sys.exit( "[binPoints-@binPoints-] {0} needs values [ERROR]".format( statistics ) )
+    xyz     = np.asarray( xyz ).reshape( -1, 3 )
+    if ( values is not None ):
+        values = np.asarray( values )
+        values = values.reshape( xyz.shape[0], -1 )
+    dims    = voxelDims( LILJLK=LILJLK, Point_or_Cell=Point_or_Cell )
+    nVoxels = int( np.prod( dims ) )
+    # ------------------------------------------------- #
+    # --- [2] count / sum / min / max over chunks  --- #
+    # ------------------------------------------------- #
+    starts  = list( range( 0, xyz.shape[0], chunkSize ) )
+    args    = { "dims":dims, "Origin":Origin, "Spacing":Spacing, "Point_or_Cell":Point_or_Cell, \
+                "chunkSize":chunkSize, "statistics":statistics }
+    if ( ( nProcs is None ) or ( nProcs <= 1 ) or ( len( starts ) < 2 ) ):
+        partial = binChunks( starts=starts, xyz=xyz, values=values, **args )
+    else:
+        #  -- 1 contiguous group of chunks per task, only its slice of xyz / values is sent -- #
+        bounds  = [ starts[group[0]] for group in np.array_split( np.arange( len( starts ) ), nProcs ) if ( group.size ) ]
+        bounds += [ xyz.shape[0] ]
+        partial = None
+        with concurrent.futures.ProcessPoolExecutor( max_workers=nProcs ) as pool:
+            futures = [ pool.submit( binChunks, starts=list( range( 0, i1-i0, chunkSize ) ), xyz=xyz[i0:i1], \
+                                     values=( None if ( values is None ) else values[i0:i1] ), **args ) \
+                        for i0,i1 in zip( bounds[:-1], bounds[1:] ) ]
+            for future in concurrent.futures.as_completed( futures ):
+                other   = future.result()
+                partial = other if ( partial is None ) else mergePartials( partial=partial, other=other )
+    # ------------------------------------------------- #
+    # --- [3] statistics                            --- #
+    # ------------------------------------------------- #
+    ret     = {}
+    partial = { key:( val if ( key == "count" ) else np.ascontiguousarray( val.T ) ) for key,val in partial.items() }
+    count   = partial["count"]
+    filled  = ( count > 0 )
+    for stat in statistics:
+        if   ( stat == "count" ):
+            ret[stat] = count
+        elif ( stat == "sum"   ):
+            ret[stat] = partial["sum"]
+        elif ( stat == "mean"  ):
+            ret[stat] = np.full_like( partial["sum"], np.nan )
+            ret[stat][filled] = partial["sum"][filled] / count[filled][:,np.newaxis]
+        else:
+            ret[stat] = np.where( filled[:,np.newaxis], partial[stat], np.nan )
+    if ( values is not None ):
+        dtype = values.dtype if ( np.issubdtype( values.dtype, np.floating ) ) else np.float64
+        for stat in [ "sum", "mean", "min", "max" ]:
+            if ( stat in ret ):
+                ret[stat] = ret[stat].astype( dtype )
+                if ( ret[stat].shape[1] == 1 ): ret[stat] = ret[stat][:,0]
+    info    = { "dims":dims, "nPoints":xyz.shape[0], "nOutside":xyz.shape[0] - int( np.sum( count ) ), \
+                "nFilled":int( np.sum( filled ) ), "nVoxels":nVoxels }
+    return( ret, info )
+
+
+# ========================================================= #
+# ===  voxelDims                                        === #
+# ========================================================= #
+def voxelDims( LILJLK=None, Point_or_Cell="cell" ):
+    if ( Point_or_Cell.lower() == "cell" ): return( tuple( [ max( int( s )-1, 1 ) for s in LILJLK ] ) )
+    return( tuple( [ int( s ) for s in LILJLK ] ) )
+
+
+# ========================================================= #
+# ===  gridFromBounds                                   === #
+# ========================================================= #
+def gridFromBounds( xyz=None, LILJLK=None, chunkSize=None ):
+    #  -- Origin, Spacing of LILJLK points spanning the bounding box of xyz ( Spacing 1 on a flat axis ) -- #
+    if ( chunkSize is None ): chunkSize = 2**20
+    xyz     = np.asarray( xyz ).reshape( -1, 3 )
+    xMin    = np.min( [ np.min( xyz[iS:iS+chunkSize], axis=0 ) for iS in range( 0, xyz.shape[0], chunkSize ) ], axis=0 )
+    xMax    = np.max( [ np.max( xyz[iS:iS+chunkSize], axis=0 ) for iS in range( 0, xyz.shape[0], chunkSize ) ], axis=0 )
+    Spacing = [ float( ( hi-lo ) / ( n-1 ) ) if ( ( n > 1 ) and ( hi > lo ) ) else 1.0 \
+                for lo,hi,n in zip( xMin, xMax, LILJLK ) ]
+    return( [ float( lo ) for lo in xMin ], Spacing )
+
+
+# ========================================================= #
+# ===  voxelIndex                                       === #
+# ========================================================= #
+def voxelIndex( xyz=None, dims=None, Origin=None, Spacing=None, Point_or_Cell="cell" ):
+    # ------------------------------------------------- #
+    # --- [1] ( i,j,k ) => i + LI*( j + LJ*k )      --- #
+    # ------------------------------------------------- #
+    #  -- "cell"  :: floor( ( x-O )/S ), a point on the far face belongs to the last cell -- #
+    #  -- "point" :: rint( ( x-O )/S ), nearest grid point ; a flat axis ( 1 voxel ) is ignored -- #
+    flat   = np.zeros( xyz.shape[0], dtype=np.int64 )
+    inside = np.ones ( xyz.shape[0], dtype=bool )
+    stride = 1
+    for ik in range( 3 ):
+        n      = dims[ik]
+        if ( n > 1 ):
+            t      = ( xyz[:,ik] - Origin[ik] ) / Spacing[ik]
+            if ( Point_or_Cell.lower() == "cell" ):
+                inside &= ( t >= 0.0 ) & ( t <= n )
+                idx     = np.minimum( np.floor( t ), n-1 )
+            else:
+                idx     = np.rint( t )
+                inside &= ( idx >= 0 ) & ( idx <= n-1 )
+            flat  += np.clip( idx, 0, n-1 ).astype( np.int64 ) * stride
+        stride *= n
+    return( flat[inside], inside )
+
+
+# ========================================================= #
+# ===  binChunks                                        === #
+# ========================================================= #
+def binChunks( starts=None, xyz=None, values=None, dims=None, Origin=None, Spacing=None, \
+               Point_or_Cell="cell", chunkSize=None, statistics=None ):
+    # ------------------------------------------------- #
+    # --- [1] partial grid :: count / sum / min / max --- #
+    # ------------------------------------------------- #
+    nVoxels = int( np.prod( dims ) )
+    nComp   = 1 if ( values is None ) else values.shape[1]
+    partial = { "count":np.zeros( nVoxels, dtype=np.int64 ) }
+    if ( ( "sum" in statistics ) or ( "mean" in statistics ) ):
+        partial["sum"] = np.zeros( ( nComp, nVoxels ), dtype=np.float64 )
+    if ( "min" in statistics ): partial["min"] = np.full( ( nComp, nVoxels ), +np.inf )
+    if ( "max" in statistics ): partial["max"] = np.full( ( nComp, nVoxels ), -np.inf )
+    # ------------------------------------------------- #
+    # --- [2] scatter chunk by chunk                --- #
+    # ------------------------------------------------- #
+    #  -- 1D unbuffered ufunc.at per component ( its fast path ) :: O( points ) per chunk, -- #
+    #  -- no full-size temporary grid ; partials are ( nComp,nVoxels ), transposed by binPoints -- #
+    for iS in starts:
+        flat, inside      = voxelIndex( xyz=xyz[iS:iS+chunkSize], dims=dims, Origin=Origin, Spacing=Spacing, \
+                                        Point_or_Cell=Point_or_Cell )
+        np.add.at( partial["count"], flat, 1 )
+        if ( values is None ): continue
+        vals              = np.asarray( values[iS:iS+chunkSize][inside], dtype=np.float64 )
+        for ic in range( nComp ):
+            if ( "sum" in partial ): np.add.at    ( partial["sum"][ic], flat, vals[:,ic] )
+            if ( "min" in partial ): np.minimum.at( partial["min"][ic], flat, vals[:,ic] )
+            if ( "max" in partial ): np.maximum.at( partial["max"][ic], flat, vals[:,ic] )
+    return( partial )
+
+
+# ========================================================= #
+# ===  mergePartials                                    === #
+# ========================================================= #
+def mergePartials( partial=None, other=None ):
+    #  -- reduction of 2 partial grids, in place on partial -- #
+    partial["count"] += other["count"]
+    if ( "sum" in partial ): partial["sum"] += other["sum"]
+    if ( "min" in partial ): np.minimum( partial["min"], other["min"], out=partial["min"] )
+    if ( "max" in partial ): np.maximum( partial["max"], other["max"], out=partial["max"] )
+    return( partial )
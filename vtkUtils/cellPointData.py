@@ -0,0 +1,119 @@
+import sys
+import numpy as np
+
+# -- directions of averaging, for the writers' average= option -- #
+AverageModes = { None:( False, False ), "point_to_cell":( True, False ), \
+                 "cell_to_point":( False, True ), "both":( True, True ) }
+
+
+# ========================================================= #
+# ===  pointToCell                                      === #
+# ========================================================= #
+def pointToCell( Data=None, Elem=None, offsets=None, chunkSize=None ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- Data :: ( nNodes, ) or ( nNodes,nComp ) ; Elem :: ( nElems,nVerts ), padded with -1, -- #
+    #  -- or 1D connectivity + offsets ( end offsets, or CSR row pointers from 0 )             -- #
+    #  -- returns the mean over the vertices of each cell, ( nElems, ) or ( nElems,nComp )      -- #
+    if ( Data is None ): sys.exit( "[pointToCell-@cellPointData-] Data == ??? " )
+    if ( Elem is None ): sys.exit( "[pointToCell-@cellPointData-] Elem == ??? " )
+    if ( chunkSize is None ): chunkSize = 2**20
+    Data    = np.asarray( Data )
+    values  = Data.reshape( Data.shape[0], -1 )
+    dtype   = averageType( dtype=Data.dtype )
+    Elem, starts, counts = asConnectivity( Elem=Elem, offsets=offsets )
+    nElems  = counts.size
+    ret     = np.empty( ( nElems, values.shape[1] ), dtype=dtype )
+    # ------------------------------------------------- #
+    # --- [2] gather + mean, chunk of cells by chunk --- #
+    # ------------------------------------------------- #
+    for iS in range( 0, nElems, chunkSize ):
+        iE = min( iS+chunkSize, nElems )
+        if ( Elem.ndim == 2 ):
+            gathered   = values[ Elem[iS:iE] ]
+            ret[iS:iE] = np.sum( gathered, axis=1, dtype=np.float64 ) / Elem.shape[1]
+        else:
+            c0, c1     = starts[iS], starts[iE-1] + counts[iE-1]
+            gathered   = np.asarray( values[ Elem[c0:c1] ], dtype=np.float64 )
+            ret[iS:iE] = np.add.reduceat( gathered, starts[iS:iE]-c0, axis=0 ) / counts[iS:iE,np.newaxis]
+    return( ret.reshape( ( nElems, ) + Data.shape[1:] ) )
+
+
+# ========================================================= #
+# ===  cellToPoint                                      === #
+# ========================================================= #
+def cellToPoint( Data=None, Elem=None, nNodes=None, offsets=None, chunkSize=None ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- Data :: ( nElems, ) or ( nElems,nComp ), Elem / offsets :: as for pointToCell     -- #
+    #  -- returns the mean over the cells around each node ( 1 per incidence ),               -- #
+    #  -- ( nNodes, ) or ( nNodes,nComp ) ; nodes used by no cell are NaN                     -- #
+    if ( Data   is None ): sys.exit( "[cellToPoint-@cellPointData-] Data   == ??? " )
+    if ( Elem   is None ): sys.exit( "[cellToPoint-@cellPointData-] Elem   == ??? " )
+    if ( nNodes is None ): sys.exit( "[cellToPoint-@cellPointData-] nNodes == ??? " )
+    if ( chunkSize is None ): chunkSize = 2**20
+    Data    = np.asarray( Data )
+    values  = Data.reshape( Data.shape[0], -1 )
+    dtype   = averageType( dtype=Data.dtype )
+    Elem, starts, counts = asConnectivity( Elem=Elem, offsets=offsets )
+    nElems  = counts.size
+    if ( values.shape[0] != nElems ):
+        sys.exit( "[cellToPoint-@cellPointData-] {0} values for {1} cells [ERROR]".format( values.shape[0], nElems ) )
+    total   = np.zeros( ( values.shape[1], nNodes ), dtype=np.float64 )
+    nHits   = np.bincount( Elem.reshape( -1 ), minlength=nNodes )
+    # ------------------------------------------------- #
+    # --- [2] scatter-add, chunk of cells by chunk  --- #
+    # ------------------------------------------------- #
+    #  -- 1D ufunc.at per component ( its fast path ) ; ( nElems,nVerts ) :: per vertex column, no repeat -- #
+    for iS in range( 0, nElems, chunkSize ):
+        iE = min( iS+chunkSize, nElems )
+        for ic in range( values.shape[1] ):
+            if ( Elem.ndim == 2 ):
+                for iv in range( Elem.shape[1] ):
+                    np.add.at( total[ic], Elem[iS:iE,iv], values[iS:iE,ic] )
+            else:
+                c0, c1 = starts[iS], starts[iE-1] + counts[iE-1]
+                np.add.at( total[ic], Elem[c0:c1], np.repeat( values[iS:iE,ic], counts[iS:iE] ) )
+    # ------------------------------------------------- #
+    # --- [3] mean                                  --- #
+    # ------------------------------------------------- #
+    ret     = np.full( ( nNodes, values.shape[1] ), np.nan, dtype=dtype )
+    used    = ( nHits > 0 )
+    ret[used] = ( total[:,used] / nHits[used] ).T
+    return( ret.reshape( ( nNodes, ) + Data.shape[1:] ) )
+
+
+# ========================================================= #
+# ===  asConnectivity                                   === #
+# ========================================================= #
+def asConnectivity( Elem=None, offsets=None ):
+    #  -- ( nElems,nVerts ) :: kept 2D ; padded ( -1 ) / 1D + offsets :: 1D connectivity, starts, counts -- #
+    Elem    = np.asarray( Elem )
+    if   ( Elem.ndim == 2 ):
+        valid  = ( Elem >= 0 )
+        counts = np.count_nonzero( valid, axis=1 ).astype( np.int64 )
+        if ( valid.all() ):
+            return( Elem, None, counts )
+        Elem   = Elem[valid]
+    elif ( Elem.ndim == 1 ):
+        if ( offsets is None ):
+            sys.exit( "[asConnectivity-@cellPointData-] 1D Elem ( connectivity ) needs offsets [ERROR]" )
+        offsets = np.asarray( offsets, dtype=np.int64 )
+        if ( ( offsets.size > 0 ) and ( offsets[0] == 0 ) ): offsets = offsets[1:]
+        counts  = np.diff( offsets, prepend=0 )
+    else:
+        sys.exit( "[asConnectivity-@cellPointData-] Elem should be 1D or 2D [ERROR]" )
+    if ( np.any( counts == 0 ) ):
+        sys.exit( "[asConnectivity-@cellPointData-] cells without vertices [ERROR]" )
+    starts  = np.cumsum( counts ) - counts
+    return( Elem, starts, counts )
+
+
+# ========================================================= #
+# ===  averageType                                      === #
+# ========================================================= #
+def averageType( dtype=None ):
+    #  -- floating fields keep their precision, integer fields are averaged into Float64 -- #
+    return( dtype if ( np.issubdtype( dtype, np.floating ) ) else np.dtype( np.float64 ) )
@@ -0,0 +1,202 @@
+import sys, time, zlib, lzma, itertools
+import numpy as np
+import concurrent.futures
+import vtkUtils.encodeDataArray as eda
+
+# -- compressor name => VTKFile compressor attribute -- #
+compressorTable = { "zlib":"vtkZLibDataCompressor", "lzma":"vtkLZMADataCompressor" }
+
+
+# ========================================================= #
+# ===  compressDataArray                                === #
+# ========================================================= #
+def compressDataArray( Data=None, compressor="zlib", level=None, blockSize=None, nThreads=None, \
+                       DataName=None, stats=None ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- returns ( header, [ compressed blocks ] ) in vtkZLibDataCompressor layout :: -- #
+    #  -- header = UInt64[ nBlocks, blockSize, lastBlockSize, cSize_1, ..., cSize_n ]   -- #
+    if ( Data       is None ): sys.exit( "[compressDataArray-@compressDataArray-] Data == ??? " )
+    if ( compressor not in compressorTable ):
+        sys.exit( "[compressDataArray-@compressDataArray-] unknown compressor :: {0} [ERROR]".format( compressor ) )
+    if ( blockSize  is None ): blockSize = 2**20
+    time1   = time.perf_counter()
+    # ------------------------------------------------- #
+    # --- [2] compress blocks on a thread pool      --- #
+    # ------------------------------------------------- #
+    cblocks = list( compressBlocks( blocks=eda.iterBlocks( Data=Data, blockSize=blockSize ), \
+                                    compressor=compressor, level=level, nThreads=nThreads ) )
+    # ------------------------------------------------- #
+    # --- [3] header                                --- #
+    # ------------------------------------------------- #
+    header  = makeHeader( nBytes=Data.nbytes, blockSize=blockSize, cSizes=[ len( cblock ) for cblock in cblocks ] )
+    time2   = time.perf_counter()
+    if ( stats is not None ):
+        stats.add( DataName=DataName, nBytes=Data.nbytes, \
+                   cBytes=len( header ) + sum( [ len( cblock ) for cblock in cblocks ] ), elapsed=time2-time1 )
+    return( header, cblocks )
+
+
+# ========================================================= #
+# ===  compressDataArrayTo                              === #
+# ========================================================= #
+def compressDataArrayTo( Data=None, target=None, compressor="zlib", level=None, blockSize=None, nThreads=None, \
+                         DataName=None, stats=None ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- writes header + compressed blocks of Data to file target, holding 1 group of blocks -- #
+    #  -- at a time ; the header is reserved first and filled in once the sizes are known    -- #
+    if ( Data       is None ): sys.exit( "[compressDataArrayTo-@compressDataArray-] Data   == ??? " )
+    if ( target     is None ): sys.exit( "[compressDataArrayTo-@compressDataArray-] target == ??? " )
+    if ( compressor not in compressorTable ):
+        sys.exit( "[compressDataArrayTo-@compressDataArray-] unknown compressor :: {0} [ERROR]".format( compressor ) )
+    if ( blockSize  is None ): blockSize = 2**20
+    time1   = time.perf_counter()
+    nBlocks = -( -Data.nbytes // blockSize )
+    start   = target.tell()
+    target.write( bytes( 8 * ( 3 + nBlocks ) ) )
+    # ------------------------------------------------- #
+    # --- [2] compress & write group by group       --- #
+    # ------------------------------------------------- #
+    cSizes  = []
+    for cblock in compressBlocks( blocks=eda.iterBlocks( Data=Data, blockSize=blockSize ), \
+                                  compressor=compressor, level=level, nThreads=nThreads ):
+        target.write( cblock )
+        cSizes += [ len( cblock ) ]
+    # ------------------------------------------------- #
+    # --- [3] fill in the header                    --- #
+    # ------------------------------------------------- #
+    end     = target.tell()
+    target.seek( start )
+    target.write( makeHeader( nBytes=Data.nbytes, blockSize=blockSize, cSizes=cSizes ) )
+    target.seek( end )
+    time2   = time.perf_counter()
+    if ( stats is not None ):
+        stats.add( DataName=DataName, nBytes=Data.nbytes, cBytes=end-start, elapsed=time2-time1 )
+    return( end - start )
+
+
+# ========================================================= #
+# ===  compressStream                                   === #
+# ========================================================= #
+def compressStream( source=None, target=None, nBytes=None, compressor="zlib", level=None, blockSize=None, \
+                    nThreads=None, nGroup=16, DataName=None, stats=None ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- compresses nBytes raw bytes of file source into file target, nGroup blocks at a time -- #
+    #  -- returns the header, in the same layout as compressDataArray                         -- #
+    if ( source     is None ): sys.exit( "[compressStream-@compressDataArray-] source == ??? " )
+    if ( target     is None ): sys.exit( "[compressStream-@compressDataArray-] target == ??? " )
+    if ( blockSize  is None ): blockSize = 2**20
+    time1   = time.perf_counter()
+    source.seek( 0 )
+    blocks  = ( source.read( min( blockSize, nBytes-iS ) ) for iS in range( 0, nBytes, blockSize ) )
+    # ------------------------------------------------- #
+    # --- [2] compress group by group               --- #
+    # ------------------------------------------------- #
+    cSizes  = []
+    for cblock in compressBlocks( blocks=blocks, compressor=compressor, level=level, \
+                                  nThreads=nThreads, nGroup=nGroup ):
+        target.write( cblock )
+        cSizes += [ len( cblock ) ]
+    # ------------------------------------------------- #
+    # --- [3] header                                --- #
+    # ------------------------------------------------- #
+    header  = makeHeader( nBytes=nBytes, blockSize=blockSize, cSizes=cSizes )
+    time2   = time.perf_counter()
+    if ( stats is not None ):
+        stats.add( DataName=DataName, nBytes=nBytes, cBytes=len( header ) + sum( cSizes ), elapsed=time2-time1 )
+    return( header )
+
+
+# ========================================================= #
+# ===  compressBlocks                                   === #
+# ========================================================= #
+def compressBlocks( blocks=None, compressor="zlib", level=None, nThreads=None, nGroup=16 ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- yields compressed blocks in order, reading nGroup blocks of the iterable at a time -- #
+    if ( compressor not in compressorTable ):
+        sys.exit( "[compressBlocks-@compressDataArray-] unknown compressor :: {0} [ERROR]".format( compressor ) )
+    if ( level      is None ): level     = { "zlib":6, "lzma":6 }[compressor]
+    if   ( compressor == "zlib" ):
+        func = lambda block: zlib.compress( block, level )
+    elif ( compressor == "lzma" ):
+        func = lambda block: lzma.compress( block, preset=level )
+    blocks  = iter( blocks )
+    group   = list( itertools.islice( blocks, nGroup ) )
+    # ------------------------------------------------- #
+    # --- [2] compress groups on a thread pool      --- #
+    # ------------------------------------------------- #
+    #  -- zlib / lzma release the GIL while compressing a block -- #
+    if ( len( group ) < min( nGroup, 2 ) ):
+        for block in group:
+            yield( func( block ) )
+        return
+    with concurrent.futures.ThreadPoolExecutor( max_workers=nThreads ) as pool:
+        while ( len( group ) > 0 ):
+            yield from pool.map( func, group )
+            group = list( itertools.islice( blocks, nGroup ) )
+
+
+# ========================================================= #
+# ===  decompressBlocks                                 === #
+# ========================================================= #
+def decompressBlocks( cblocks=None, compressor="zlib", nThreads=None ):
+    #  -- yields decompressed blocks in order ( reader side of compressBlocks ) -- #
+    if ( compressor not in compressorTable ):
+        sys.exit( "[decompressBlocks-@compressDataArray-] unknown compressor :: {0} [ERROR]".format( compressor ) )
+    func    = { "zlib":zlib.decompress, "lzma":lzma.decompress }[compressor]
+    cblocks = list( cblocks )
+    if ( len( cblocks ) < 2 ):
+        for cblock in cblocks:
+            yield( func( cblock ) )
+        return
+    with concurrent.futures.ThreadPoolExecutor( max_workers=nThreads ) as pool:
+        yield from pool.map( func, cblocks )
+
+
+# ========================================================= #
+# ===  makeHeader                                       === #
+# ========================================================= #
+def makeHeader( nBytes=0, blockSize=None, cSizes=None ):
+    return( np.array( [ len( cSizes ), blockSize, nBytes % blockSize ] + list( cSizes ), dtype=np.uint64 ).tobytes() )
+
+
+# ========================================================= #
+# ===  compressStats class                              === #
+# ========================================================= #
+class compressStats():
+    # ------------------------------------------------- #
+    # --- class Initiator                           --- #
+    # ------------------------------------------------- #
+    def __init__( self ):
+        self.arrays = []
+
+    # ------------------------------------------------- #
+    # --- add                                       --- #
+    # ------------------------------------------------- #
+    def add( self, DataName=None, nBytes=0, cBytes=0, elapsed=0.0 ):
+        self.arrays += [ { "DataName":str( DataName ), "nBytes":nBytes, "cBytes":cBytes, \
+                           "ratio"   :nBytes / max( cBytes, 1 ), "elapsed":elapsed } ]
+
+    # ------------------------------------------------- #
+    # --- total                                     --- #
+    # ------------------------------------------------- #
+    def total( self ):
+        nBytes  = sum( [ array["nBytes" ] for array in self.arrays ] )
+        cBytes  = sum( [ array["cBytes" ] for array in self.arrays ] )
+        elapsed = sum( [ array["elapsed"] for array in self.arrays ] )
+        return( { "DataName":"total", "nBytes":nBytes, "cBytes":cBytes, \
+                  "ratio"   :nBytes / max( cBytes, 1 ), "elapsed":elapsed } )
+
+    # ------------------------------------------------- #
+    # --- __str__                                   --- #
+    # ------------------------------------------------- #
+    def __str__( self ):
+        fmt = "{DataName:>16} :: {nBytes:>14} -> {cBytes:>14} bytes  ratio = {ratio:8.3f}  time = {elapsed:9.4f} s"
+        return( "\n".join( [ fmt.format( **array ) for array in self.arrays + [ self.total() ] ] ) )
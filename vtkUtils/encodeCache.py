@@ -0,0 +1,107 @@
+import sys, hashlib, collections
+import vtkUtils.encodeDataArray as eda
+
+# -- process-wide cache, None :: disabled ( default ), see enable() / disable() -- #
+shared = None
+
+
+# ========================================================= #
+# ===  enable / disable / sharedCache                   === #
+# ========================================================= #
+def enable( maxBytes=2**28 ):
+    #  -- opt-in :: every writer's vtk_add_DataArray consults the cache from now on -- #
+    global shared
+    if ( shared is None ): shared = encodeCache( maxBytes=maxBytes )
+    shared.maxBytes = maxBytes
+    shared.evict()
+    return( shared )
+
+def disable():
+    global shared
+    shared = None
+
+def sharedCache():
+    return( shared )
+
+
+# ========================================================= #
+# ===  encodeCache class                                === #
+# ========================================================= #
+class encodeCache():
+    # ------------------------------------------------- #
+    # --- class Initiator                           --- #
+    # ------------------------------------------------- #
+    #  -- encoded DataArray contents, keyed by content hash + dtype + shape + format, -- #
+    #  -- least recently used entries are evicted beyond maxBytes                     -- #
+    def __init__( self, maxBytes=2**28 ):
+        self.maxBytes = maxBytes
+        self.nBytes   = 0
+        self.hits     = 0
+        self.misses   = 0
+        self.table    = collections.OrderedDict()
+
+
+    # ------------------------------------------------- #
+    # --- key                                       --- #
+    # ------------------------------------------------- #
+    def key( self, Data=None, **attrs ):
+        #  -- attrs :: everything the encoded result depends on besides the values -- #
+        if ( not( eda.isArrayLike( Data ) ) ):
+            sys.exit( "[key-@encodeCache-] Data should be np.ndarray [ERROR]" )
+        hasher = hashlib.blake2b( digest_size=16 )
+        for raw in eda.iterRawChunks( Data=Data ):
+            hasher.update( raw )
+        digest = hasher.digest()
+        return( ( digest, Data.dtype.str, Data.shape ) + tuple( sorted( attrs.items() ) ) )
+
+
+    # ------------------------------------------------- #
+    # --- get                                       --- #
+    # ------------------------------------------------- #
+    def get( self, key=None ):
+        if ( key in self.table ):
+            self.hits  += 1
+            self.table.move_to_end( key )
+            return( self.table[key][0] )
+        self.misses += 1
+        return( None )
+
+
+    # ------------------------------------------------- #
+    # --- put                                       --- #
+    # ------------------------------------------------- #
+    def put( self, key=None, value=None, nBytes=0 ):
+        if ( nBytes > self.maxBytes ): return()
+        if ( key in self.table ):
+            self.nBytes -= self.table.pop( key )[1]
+        self.table[key] = ( value, nBytes )
+        self.nBytes    += nBytes
+        self.evict()
+
+
+    # ------------------------------------------------- #
+    # --- evict                                     --- #
+    # ------------------------------------------------- #
+    def evict( self ):
+        while ( ( self.nBytes > self.maxBytes ) and ( len( self.table ) > 0 ) ):
+            self.nBytes -= self.table.popitem( last=False )[1][1]
+
+
+    # ------------------------------------------------- #
+    # --- clear                                     --- #
+    # ------------------------------------------------- #
+    def clear( self ):
+        self.table.clear()
+        self.nBytes, self.hits, self.misses = 0, 0, 0
+
+
+    # ------------------------------------------------- #
+    # --- info / __str__                            --- #
+    # ------------------------------------------------- #
+    def info( self ):
+        return( { "hits":self.hits, "misses":self.misses, "nEntries":len( self.table ), \
+                  "nBytes":self.nBytes, "maxBytes":self.maxBytes } )
+
+    def __str__( self ):
+        return( "[encodeCache] hits = {hits}  misses = {misses}  entries = {nEntries}  "
+                "bytes = {nBytes} / {maxBytes}".format( **self.info() ) )
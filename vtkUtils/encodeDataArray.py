@@ -0,0 +1,269 @@
+import sys, base64
+import numpy as np
+import vtkUtils.compressDataArray as cda
+
+
+# ========================================================= #
+# ===  encodeDataArray                                  === #
+# ========================================================= #
+def encodeDataArray( Data=None, DataFormat="ascii", rowWise=False, chunkSize=None, \
+                     compressor=None, level=None, DataName=None, stats=None, cache=None, float_format=None ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- cache :: encodeCache, an identical array encoded before is returned as is -- #
+    #  -- float_format :: format spec of ascii floats ( e.g. ".6g" ), see floatFormat -- #
+    if ( Data is None ): sys.exit( "[encodeDataArray-@encodeDataArray-] Data == ??? " )
+    if ( not( isArrayLike( Data ) ) ):
+        sys.exit( "[encodeDataArray-@encodeDataArray-] Data should be np.ndarray [ERROR]" )
+    if ( cache is not None ):
+        key = cache.key( Data=Data, DataFormat=DataFormat.lower(), rowWise=bool( rowWise ), \
+                         compressor=compressor, level=level, float_format=float_format )
+        hit = cache.get( key=key )
+        if ( hit is not None ):
+            ret, record = hit
+            if ( ( stats is not None ) and ( record is not None ) ):
+                stats.add( DataName=DataName, elapsed=0.0, **record )
+            return( ret )
+    record = None
+    # ------------------------------------------------- #
+    # --- [2] encode DataArray contents             --- #
+    # ------------------------------------------------- #
+    if   ( DataFormat.lower() == "ascii"  ):
+        ret = "".join( encodeAsciiChunks ( Data=Data, rowWise=rowWise, chunkSize=chunkSize, \
+                                           float_format=float_format ) )
+    elif ( ( DataFormat.lower() == "binary" ) and ( compressor is None ) ):
+        ret = "".join( encodeBinaryChunks( Data=Data, chunkSize=chunkSize ) ) + "\n"
+    elif ( DataFormat.lower() == "binary" ):
+        #  -- compressed :: base64( header ) + base64( blocks ), encoded separately -- #
+        header, cblocks = cda.compressDataArray( Data=Data, compressor=compressor, level=level, \
+                                                 DataName=DataName, stats=stats )
+        ret = base64.b64encode( header ).decode( "ascii" ) \
+            + base64.b64encode( b"".join( cblocks ) ).decode( "ascii" ) + "\n"
+        record = { "nBytes":Data.nbytes, "cBytes":len( header ) + sum( [ len( cblock ) for cblock in cblocks ] ) }
+    else:
+        sys.exit( "[encodeDataArray-@encodeDataArray-] unknown DataFormat :: {0} [ERROR]".format( DataFormat ) )
+    if ( cache is not None ):
+        cache.put( key=key, value=( ret, record ), nBytes=len( ret ) )
+    return( ret )
+
+
+# ========================================================= #
+# ===  encodeAsciiChunks                                === #
+# ========================================================= #
+def encodeAsciiChunks( Data=None, rowWise=False, chunkSize=None, float_format=None ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- rowWise=False :: "v0 v1 v2 ... \n"   ( 1 line  for all values ) -- #
+    #  -- rowWise=True  :: "v0 v1 v2\n" x nRow ( 1 line  for each tuple ) -- #
+    if ( chunkSize is None ): chunkSize = 2**20
+    nCol        = Data.shape[-1] if ( rowWise ) else 1
+    nStep       = max( chunkSize // max( nCol, 1 ), 1 )
+    # ------------------------------------------------- #
+    # --- [2] format template                       --- #
+    # ------------------------------------------------- #
+    #  -- float16/32 rows are printed with numpy's repr, others with python's str, -- #
+    #  -- floats with float_format given are printed through its format spec     -- #
+    isFloat     = np.issubdtype( Data.dtype, np.floating )
+    field       = "{:" + float_format + "}" if ( isFloat and ( float_format is not None ) ) else "{}"
+    numpyRepr   = ( rowWise and isFloat and ( Data.dtype.itemsize < 8 ) and ( field == "{}" ) )
+    if ( rowWise ):
+        template = " ".join( [field]*nCol ) + "\n"
+    else:
+        template = field + " "
+    # ------------------------------------------------- #
+    # --- [3] encode chunk by chunk                 --- #
+    # ------------------------------------------------- #
+    #  -- lazily generated arrays ( iterSlabs ) are encoded slab by slab -- #
+    slabs       = Data.iterSlabs( nPoints=max( nStep*nCol // Data.shape[-1], 1 ) ) if ( isLazy( Data ) ) else [ Data ]
+    for slab in slabs:
+        lines   = slab.reshape( -1, nCol ) if ( rowWise ) else np.ravel( slab ).reshape( -1, 1 )
+        for iS in range( 0, lines.shape[0], nStep ):
+            chunk = np.ravel( lines[iS:iS+nStep] )
+            if ( numpyRepr ):
+                chunk = chunk.astype( str )
+            yield( ( template * ( chunk.size // max( nCol, 1 ) ) ).format( *chunk.tolist() ) )
+    if ( not( rowWise ) ):
+        yield( "\n" )
+
+
+# ========================================================= #
+# ===  encodeBinaryChunks                               === #
+# ========================================================= #
+def encodeBinaryChunks( Data=None, chunkSize=None ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- base64( UInt64 nBytes header + raw array bytes ), encoded as 1 stream -- #
+    #  -- each piece is cut at a multiple of 3 bytes, so that no "=" padding is  -- #
+    #  -- inserted, the remainder is carried over to the next raw chunk          -- #
+    if ( chunkSize is None ): chunkSize = 2**20
+    nStep   = 3 * max( chunkSize, 1 )
+    carry   = np.array( [ Data.nbytes ], dtype=np.uint64 ).tobytes()
+    # ------------------------------------------------- #
+    # --- [2] encode chunk by chunk                 --- #
+    # ------------------------------------------------- #
+    for raw in iterRawChunks( Data=Data, chunkSize=nStep ):
+        buff    = carry + raw
+        nCut    = len( buff ) - ( len( buff ) % 3 )
+        carry   = buff[nCut:]
+        if ( nCut > 0 ): yield( base64.b64encode( buff[:nCut] ).decode( "ascii" ) )
+    yield( base64.b64encode( carry ).decode( "ascii" ) )
+
+
+# ========================================================= #
+# ===  iterRawChunks                                    === #
+# ========================================================= #
+def iterRawChunks( Data=None, chunkSize=None ):
+    # ------------------------------------------------- #
+    # --- [1] C-ordered native raw bytes, in chunks --- #
+    # ------------------------------------------------- #
+    #  -- contiguous native arrays ( np.memmap too ) are sliced as memoryviews, without copy; -- #
+    #  -- strided, Fortran-ordered or byte-swapped ones are converted 1 chunk at a time      -- #
+    if ( chunkSize is None ): chunkSize = 2**24
+    if ( isLazy( Data ) ):
+        for slab in Data.iterSlabs( nPoints=max( chunkSize // Data.dtype.itemsize // Data.shape[-1], 1 ) ):
+            yield from iterRawChunks( Data=slab, chunkSize=chunkSize )
+        return
+    if ( Data.size == 0 ): return
+    if ( Data.dtype.isnative and Data.flags.c_contiguous ):
+        raw   = memoryview( Data ).cast( "B" )
+        for iS in range( 0, raw.nbytes, chunkSize ):
+            yield( raw[iS:iS+chunkSize] )
+        return
+    if ( Data.ndim == 0 ):
+        yield( memoryview( toNativeContiguous( Data=Data ) ).cast( "B" ) )
+        return
+    # ------------------------------------------------- #
+    # --- [2] copy blocks of rows ( or recurse )    --- #
+    # ------------------------------------------------- #
+    rowBytes  = Data.nbytes // max( Data.shape[0], 1 )
+    if ( ( Data.ndim > 1 ) and ( rowBytes > chunkSize ) ):
+        for row in Data:
+            yield from iterRawChunks( Data=row, chunkSize=chunkSize )
+        return
+    nRows     = max( chunkSize // max( rowBytes, 1 ), 1 )
+    for iS in range( 0, Data.shape[0], nRows ):
+        yield( memoryview( toNativeContiguous( Data=Data[iS:iS+nRows] ) ).cast( "B" ) )
+
+
+# ========================================================= #
+# ===  iterBlocks                                       === #
+# ========================================================= #
+def iterBlocks( Data=None, blockSize=None ):
+    #  -- raw bytes in blocks of exactly blockSize ( but the last ), as for compressed headers -- #
+    if ( blockSize is None ): blockSize = 2**20
+    if ( isinstance( Data, np.ndarray ) and Data.dtype.isnative and Data.flags.c_contiguous ):
+        yield from iterRawChunks( Data=Data, chunkSize=blockSize )
+        return
+    buff = bytearray()
+    for raw in iterRawChunks( Data=Data, chunkSize=blockSize ):
+        buff += raw
+        while ( len( buff ) >= blockSize ):
+            yield( bytes( buff[:blockSize] ) )
+            del buff[:blockSize]
+    if ( len( buff ) > 0 ): yield( bytes( buff ) )
+
+
+# ========================================================= #
+# ===  floatFormat                                      === #
+# ========================================================= #
+def floatFormat( precision=None, float_format=None ):
+    #  -- precision=p :: ".{p}g" ( p significant digits ), float_format :: format spec as in -- #
+    #  -- format( val, spec ), e.g. ".6g", ".8e", a printf style "%.6g" is accepted too       -- #
+    if ( float_format is not None ):
+        float_format = float_format.strip().lstrip( "%" ).strip( "{}" ).lstrip( ":" )
+        try:
+            format( 0.1, float_format )
+        except ValueError:
+            sys.exit( "[floatFormat-@encodeDataArray-] bad float_format :: {0} [ERROR]".format( float_format ) )
+        return( float_format )
+    if ( precision is not None ):
+        return( ".{0}g".format( int( precision ) ) )
+    return( None )
+
+
+# ========================================================= #
+# ===  downcastArray                                    === #
+# ========================================================= #
+def downcastArray( Data=None ):
+    #  -- float64 => float32 ( data & coordinates ), other dtypes are returned as they are -- #
+    if ( isArrayLike( Data ) and ( Data.dtype == np.float64 ) ):
+        return( Data.astype( np.float32 ) )
+    return( Data )
+
+
+def downcastType( DataType=None, downcast=False ):
+    #  -- VTK type name as written by downcastArray ( for summary files ) -- #
+    return( "Float32" if ( downcast and ( DataType == "Float64" ) ) else DataType )
+
+
+# ========================================================= #
+# ===  isLazy / isArrayLike                             === #
+# ========================================================= #
+def isLazy( Data=None ):
+    #  -- array generated slab by slab ( e.g. structuredPoints ), with shape / dtype / nbytes -- #
+    return( hasattr( Data, "iterSlabs" ) )
+
+def isArrayLike( Data=None ):
+    return( isinstance( Data, np.ndarray ) or isLazy( Data ) )
+
+
+# ========================================================= #
+# ===  toNativeContiguous                               === #
+# ========================================================= #
+def toNativeContiguous( Data=None ):
+    if ( not( Data.dtype.isnative ) ):
+        Data = Data.astype( Data.dtype.newbyteorder( "=" ) )
+    return( np.ascontiguousarray( Data ) )
+
+
+# ========================================================= #
+# ===  fileAttributes  ( extra VTKFile tag attributes ) === #
+# ========================================================= #
+def fileAttributes( DataFormat="ascii", compressor=None ):
+    if ( DataFormat.lower() == "ascii" ): return( "" )
+    byte_order = { "little":"LittleEndian", "big":"BigEndian" }[sys.byteorder]
+    ret        = ' version="1.0" byte_order="{0}" header_type="UInt64"'.format( byte_order )
+    if ( compressor is not None ):
+        ret   += ' compressor="{0}"'.format( cda.compressorTable[compressor] )
+    return( ret )
+
+
+# ========================================================= #
+# ===  legacy_encodeAscii  ( per-value loop, reference ) === #
+# ========================================================= #
+def legacy_encodeAscii( Data=None, rowWise=False ):
+    lines = ""
+    if ( rowWise ):
+        for line in Data:
+            lines += ( " ".join( [ str( val ) for val in line ] ) + "\n" )
+    else:
+        for line in np.ravel( Data ):
+            lines += "{0} ".format( line )
+        lines += "\n"
+    return( lines )
+
+
+# ======================================== #
+# ===  実行部 ( benchmark )            === #
+# ======================================== #
+if ( __name__=="__main__" ):
+    import time
+    nData   = 10**6
+    rng     = np.random.default_rng( 0 )
+    samples = { "Float64 scalar" :( rng.standard_normal( nData )                        , False ), \
+                "Float32 vector" :( rng.standard_normal( (nData//3,3) ).astype( np.float32 ), True  ), \
+                "Int64   connect":( rng.integers( 0, 10**7, (nData//4,4) )            , True  ), }
+    for key,( Data, rowWise ) in samples.items():
+        t0      = time.perf_counter()
+        ret_old = legacy_encodeAscii( Data=Data, rowWise=rowWise )
+        t1      = time.perf_counter()
+        ret_new = encodeDataArray   ( Data=Data, rowWise=rowWise )
+        t2      = time.perf_counter()
+        MBytes  = len( ret_new ) / 1024.**2
+        ret_bin = encodeDataArray   ( Data=Data, DataFormat="binary" )
+        t3      = time.perf_counter()
+        print( "[{0}] identical :: {1}  legacy :: {2:8.2f} MB/s  encoder :: {3:8.2f} MB/s  binary :: {4:8.2f} MB/s"\
+               .format( key, ret_old == ret_new, MBytes/(t1-t0), MBytes/(t2-t1), Data.nbytes/1024.**2/(t3-t2) ) )
@@ -0,0 +1,74 @@
+import sys
+import numpy as np
+
+
+# ========================================================= #
+# ===  asFields                                         === #
+# ========================================================= #
+def asFields( Data=None, DataName="Data", VectorData=None ):
+    # ------------------------------------------------- #
+    # --- [1] ndarray or { name:ndarray } => Fields --- #
+    # ------------------------------------------------- #
+    #  -- Fields :: { DataName:( Data, VectorData ) }, VectorData=None is decided later -- #
+    #  -- VectorData applies to a bare ndarray, mapping values carry their own flag    -- #
+    if ( Data is None ): return( {} )
+    if ( isinstance( Data, dict ) ):
+        return( { key:asField( Data=val ) for key,val in Data.items() } )
+    return( { DataName:asField( Data=Data, VectorData=VectorData ) } )
+
+
+# ========================================================= #
+# ===  asField                                          === #
+# ========================================================= #
+def asField( Data=None, VectorData=None ):
+    #  -- a bare ndarray, or an explicit ( ndarray, VectorData ) pair -- #
+    if ( isinstance( Data, tuple ) ): return( Data )
+    return( ( Data, VectorData ) )
+
+
+# ========================================================= #
+# ===  resolveFields                                    === #
+# ========================================================= #
+def resolveFields( Fields=None, nTuples=None ):
+    # ------------------------------------------------- #
+    # --- [1] decide VectorData of each field       --- #
+    # ------------------------------------------------- #
+    #  -- a field holding more values than nTuples is a vector of Data.shape[-1] components -- #
+    ret = {}
+    for key,val in asFields( Data=Fields ).items():
+        Data, VectorData = val
+        if ( not( isinstance( Data, np.ndarray ) ) ):
+            sys.exit( "[resolveFields-@fieldData-] {0} should be np.ndarray [ERROR]".format( key ) )
+        if ( VectorData is None ):
+            VectorData = isVectorData( Data=Data, nTuples=nTuples )
+        ret[key] = ( Data, VectorData )
+    return( ret )
+
+
+# ========================================================= #
+# ===  isVectorData                                     === #
+# ========================================================= #
+def isVectorData( Data=None, nTuples=None ):
+    #  -- nTuples unknown :: only ( LI,LJ,LK,nComp ) grid data is taken as a vector -- #
+    if ( nTuples is None ): return( Data.ndim == 4 )
+    return( ( Data.ndim >= 2 ) and ( Data.size == nTuples * Data.shape[-1] ) and ( Data.size != nTuples ) )
+
+
+# ========================================================= #
+# ===  activeAttributes                                 === #
+# ========================================================= #
+def activeAttributes( Fields=None ):
+    # ------------------------------------------------- #
+    # --- [1] first scalar / first 3-vector field   --- #
+    # ------------------------------------------------- #
+    #  -- returns ' Scalars="p" Vectors="u"' for <PointData> / <CellData> -- #
+    Scalars, Vectors = None, None
+    for key,( Data, VectorData ) in Fields.items():
+        if   ( ( Scalars is None ) and not( VectorData ) ):
+            Scalars = key
+        elif ( ( Vectors is None ) and VectorData and ( Data.shape[-1] == 3 ) ):
+            Vectors = key
+    ret  = ''
+    if ( Scalars is not None ): ret += ' Scalars="{0}"'.format( Scalars )
+    if ( Vectors is not None ): ret += ' Vectors="{0}"'.format( Vectors )
+    return( ret )
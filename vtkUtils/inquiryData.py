@@ -0,0 +1,59 @@
+import sys
+import vtkUtils.encodeDataArray as eda
+
+# -- VTK type name from ( dtype.kind, itemsize ), byte order does not matter -- #
+DataTypeTable = { ( "i",1 ):"Int8" , ( "i",2 ):"Int16" , ( "i",4 ):"Int32" , ( "i",8 ):"Int64" , \
+                  ( "u",1 ):"UInt8", ( "u",2 ):"UInt16", ( "u",4 ):"UInt32", ( "u",8 ):"UInt64", \
+                  ( "f",4 ):"Float32", ( "f",8 ):"Float64" }
+
+
+# ========================================================= #
+# ===  inquiryData                                      === #
+# ========================================================= #
+def inquiryData( Data=None, VectorData=False ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    if ( Data is None ): sys.exit( "[inquiryData-@inquiryData-] Data == ??? " )
+    if ( not( eda.isArrayLike( Data ) ) ):
+        sys.exit( "[inquiryData-@inquiryData-] Data should be np.ndarray [ERROR]" )
+    # ------------------------------------------------- #
+    # --- [2] DataType / nComponents / nData        --- #
+    # ------------------------------------------------- #
+    #  -- nData :: number of tuples ( points, cells, ... ) -- #
+    key = ( Data.dtype.kind, Data.dtype.itemsize )
+    if ( key not in DataTypeTable ):
+        sys.exit( "[inquiryData-@inquiryData-] unsupported dtype {0} [ERROR]".format( Data.dtype ) )
+    nComponents = Data.shape[-1] if ( VectorData and ( Data.ndim >= 1 ) ) else 1
+    nData       = Data.size // max( nComponents, 1 )
+    return( { "DataType":DataTypeTable[key], "nComponents":nComponents, "nData":nData } )
+
+
+# ========================================================= #
+# ===  inquiryCache class                               === #
+# ========================================================= #
+class inquiryCache():
+    # ------------------------------------------------- #
+    # --- class Initiator                           --- #
+    # ------------------------------------------------- #
+    #  -- descriptors are memoized for the writer's lifetime, keyed by dtype and shape -- #
+    #  -- ( all they depend on ), so that a reused id() can never return a stale one   -- #
+    def __init__( self ):
+        self.table  = {}
+        self.hits   = 0
+        self.misses = 0
+
+
+    # ------------------------------------------------- #
+    # --- inquire                                   --- #
+    # ------------------------------------------------- #
+    def inquire( self, Data=None, VectorData=False ):
+        if ( not( eda.isArrayLike( Data ) ) ):
+            return( inquiryData( Data=Data, VectorData=VectorData ) )
+        key = ( Data.dtype.str, Data.shape, bool( VectorData ) )
+        if ( key in self.table ):
+            self.hits   += 1
+        else:
+            self.misses += 1
+            self.table[key] = inquiryData( Data=Data, VectorData=VectorData )
+        return( self.table[key] )
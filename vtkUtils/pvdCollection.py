@@ -0,0 +1,54 @@
+import os, sys
+import vtkUtils.writeXML as xwr
+
+
+# ========================================================= #
+# ===  pvdCollection class                              === #
+# ========================================================= #
+class pvdCollection():
+    # ------------------------------------------------- #
+    # --- class Initiator                           --- #
+    # ------------------------------------------------- #
+    #  -- the .pvd file is kept valid after each add_DataSet : the new entry -- #
+    #  -- overwrites the closing tags, which are then written again after it -- #
+    def __init__( self, pvdFile=None, pretty=False ):
+        # --- [1-1] Arguments                       --- #
+        if ( pvdFile is None ): pvdFile = "out.pvd"
+        # --- [1-2] Variables Settings              --- #
+        self.pvdFile   = pvdFile
+        self.pretty    = pretty
+        self.nDataSets = 0
+        self.pvdHeader = '<?xml version="1.0" encoding="utf-8"?>\n' \
+                         '<VTKFile type="Collection" version="0.1">\n' \
+                         '<Collection>\n'
+        self.pvdFooter = '</Collection>\n' \
+                         '</VTKFile>\n'
+        # --- [1-3] Routines                        --- #
+        with open( self.pvdFile, "wb" ) as f:
+            self.depth     = xwr.writeXML( f=f, contents=self.pvdHeader, pretty=self.pretty )
+            self.footerPos = f.tell()
+            xwr.writeXML( f=f, contents=self.pvdFooter, pretty=self.pretty, depth=self.depth )
+
+
+    # ------------------------------------------------- #
+    # --- add_DataSet                               --- #
+    # ------------------------------------------------- #
+    def add_DataSet( self, vtkFile=None, timestep=None, part=0 ):
+        # ------------------------------------------------- #
+        # --- [1] Arguments                             --- #
+        # ------------------------------------------------- #
+        if ( vtkFile  is None ): sys.exit( "[add_DataSet-@pvdCollection-] vtkFile == ??? " )
+        if ( timestep is None ): timestep = self.nDataSets
+        source = os.path.relpath( os.path.abspath( vtkFile ), \
+                                  os.path.dirname( os.path.abspath( self.pvdFile ) ) )
+        line   = '<DataSet timestep="{0}" group="" part="{1}" file="{2}"/>\n'.format( timestep, part, source )
+        # ------------------------------------------------- #
+        # --- [2] overwrite footer with entry + footer  --- #
+        # ------------------------------------------------- #
+        with open( self.pvdFile, "r+b" ) as f:
+            f.seek( self.footerPos )
+            xwr.writeXML( f=f, contents=line, pretty=self.pretty, depth=self.depth )
+            self.footerPos = f.tell()
+            xwr.writeXML( f=f, contents=self.pvdFooter, pretty=self.pretty, depth=self.depth )
+            f.truncate()
+        self.nDataSets += 1
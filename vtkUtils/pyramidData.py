@@ -0,0 +1,128 @@
+import os, sys, math
+import numpy as np
+import vtkUtils.writeXML as xwr
+
+# -- downsampling modes :: block average, or every n-th point -- #
+PyramidModes = [ "mean", "stride" ]
+
+
+# ========================================================= #
+# ===  pyramidFactors                                   === #
+# ========================================================= #
+def pyramidFactors( pyramid=None ):
+    #  -- True => [ 2, 4, 8 ], int n => [ 2, 4, ..., 2**n ], or a list of factors > 1 -- #
+    if ( ( pyramid is None ) or ( pyramid is False ) ): return( [] )
+    if ( pyramid is True ): return( [ 2, 4, 8 ] )
+    if ( np.ndim( pyramid ) == 0 ): return( [ 2**( ik+1 ) for ik in range( int( pyramid ) ) ] )
+    factors = sorted( set( [ int( factor ) for factor in pyramid ] ) )
+    if ( factors and ( factors[0] < 2 ) ):
+        sys.exit( "[pyramidFactors-@pyramidData-] factors should be >= 2 :: {0} [ERROR]".format( pyramid ) )
+    return( factors )
+
+
+# ========================================================= #
+# ===  levelFileName  ( out.vti => out_lod2.vti )       === #
+# ========================================================= #
+def levelFileName( vtkFile=None, factor=1 ):
+    base, ext = os.path.splitext( vtkFile )
+    return( "{0}_lod{1}{2}".format( base, factor, ext ) )
+
+
+# ========================================================= #
+# ===  manifestFileName  ( out.vti => out_lod.xml )     === #
+# ========================================================= #
+def manifestFileName( vtkFile=None ):
+    return( "{0}_lod.xml".format( os.path.splitext( vtkFile )[0] ) )
+
+
+# ========================================================= #
+# ===  writeManifest                                    === #
+# ========================================================= #
+def writeManifest( manifestFile=None, levels=None, mode="mean", pretty=False ):
+    # ------------------------------------------------- #
+    # --- [1] factor => file, extent, geometry      --- #
+    # ------------------------------------------------- #
+    #  -- levels :: [ { "factor", "vtkFile", "LILJLK", "Origin", "Spacing" } ], finest first  -- #
+    #  -- a plain index, not a .pvd :: a collection would overlay the levels as 1 dataset's parts -- #
+    if ( manifestFile is None ): sys.exit( "[writeManifest-@pyramidData-] manifestFile == ??? " )
+    if ( levels       is None ): sys.exit( "[writeManifest-@pyramidData-] levels       == ??? " )
+    baseDir   = os.path.dirname( os.path.abspath( manifestFile ) )
+    contents  = '<?xml version="1.0" encoding="utf-8"?>\n'
+    contents += '<LODPyramid mode="{0}" nLevels="{1}">\n'.format( mode, len( levels ) )
+    for level in levels:
+        contents += '<Level factor="{0}" file="{1}" WholeExtent="{2}" Origin="{3}" Spacing="{4}"/>\n'\
+            .format( level["factor"], os.path.relpath( os.path.abspath( level["vtkFile"] ), baseDir ), \
+                     " ".join( [ "0 {0}".format( max( int( s )-1, 0 ) ) for s in level["LILJLK"] ] ), \
+                     " ".join( [ str( Opt ) for Opt in level["Origin" ] ] ), \
+                     " ".join( [ str( Spc ) for Spc in level["Spacing"] ] ) )
+    contents += '</LODPyramid>\n'
+    with open( manifestFile, "wb" ) as f:
+        xwr.writeXML( f=f, contents=contents, pretty=pretty )
+    return( manifestFile )
+
+
+# ========================================================= #
+# ===  levelGeometry                                    === #
+# ========================================================= #
+def levelGeometry( Origin=None, Spacing=None, factor=1, mode="mean" ):
+    #  -- block averages sit at the block centres ( exact for full blocks ), strided points on the grid -- #
+    shift   = 0.5 * ( factor-1 ) if ( mode == "mean" ) else 0.0
+    Origin  = [ float( Opt ) + shift * float( Spc ) for Opt,Spc in zip( Origin, Spacing ) ]
+    Spacing = [ float( Spc ) * factor for Spc in Spacing ]
+    return( Origin, Spacing )
+
+
+# ========================================================= #
+# ===  downsampleLevels                                 === #
+# ========================================================= #
+def downsampleLevels( Data=None, LILJLK=None, VectorData=False, factors=None, mode="mean", slabBytes=2**26 ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- Data :: ( LI,LJ,LK[,nComp] ), bytes in file order ( i fastest ), as the writers take it -- #
+    #  -- returns { factor:( ceil(LI/f),ceil(LJ/f),ceil(LK/f)[,nComp] ) } in the same convention   -- #
+    #  -- 1 pass over k-slabs of lcm( factors ) planes :: only 1 slab of Data is read at a time    -- #
+    if ( mode not in PyramidModes ):
+        sys.exit( "[downsampleLevels-@pyramidData-] unknown mode :: {0} [ERROR]".format( mode ) )
+    if ( not( factors ) ): return( {} )
+    LI, LJ, LK = [ int( s ) for s in LILJLK ]
+    nComp      = Data.shape[-1] if ( VectorData ) else 1
+    ordered    = Data.reshape( LK, LJ, LI, nComp )
+    period     = math.lcm( *factors )
+    nPlane     = period * max( slabBytes // max( period * LI * LJ * nComp * Data.dtype.itemsize, 1 ), 1 )
+    levels     = { f:np.empty( ( -( -LK//f ), -( -LJ//f ), -( -LI//f ), nComp ), dtype=Data.dtype ) for f in factors }
+    # ------------------------------------------------- #
+    # --- [2] slab by slab, every level at once     --- #
+    # ------------------------------------------------- #
+    for k0 in range( 0, LK, nPlane ):
+        slab = ordered[k0:k0+nPlane]
+        for f in factors:
+            if ( mode == "stride" ):
+                block = slab[::f,::f,::f]
+            else:
+                block = blockMean( slab=slab, factor=f, dtype=Data.dtype )
+            levels[f][k0//f:k0//f+block.shape[0]] = block
+    # ------------------------------------------------- #
+    # --- [3] back to ( LI',LJ',LK'[,nComp] )       --- #
+    # ------------------------------------------------- #
+    ret = {}
+    for f,level in levels.items():
+        shape  = ( level.shape[2], level.shape[1], level.shape[0] ) + ( ( nComp, ) if ( VectorData ) else () )
+        ret[f] = level.reshape( shape )
+    return( ret )
+
+
+# ========================================================= #
+# ===  blockMean                                        === #
+# ========================================================= #
+def blockMean( slab=None, factor=2, dtype=None ):
+    #  -- mean over factor^3 blocks ( smaller at the far edges ), summed in float64 along k, j, i -- #
+    ret = np.asarray( slab, dtype=np.float64 )
+    for axis in range( 3 ):
+        starts = np.arange( 0, ret.shape[axis], factor )
+        counts = np.diff( np.append( starts, ret.shape[axis] ) )
+        shape  = [1]*ret.ndim
+        shape[axis] = counts.size
+        ret    = np.add.reduceat( ret, starts, axis=axis ) / counts.reshape( shape )
+    if ( np.issubdtype( dtype, np.integer ) ): ret = np.rint( ret )
+    return( ret.astype( dtype ) )
@@ -0,0 +1,164 @@
+import sys
+import numpy as np
+
+# -- quantized integer types, in order of size -- #
+QuantTypes = [ np.uint8, np.uint16, np.uint32 ]
+BitsTable  = { 8:np.uint8, 16:np.uint16, 32:np.uint32, "uint8":np.uint8, "uint16":np.uint16, "uint32":np.uint32 }
+SpecKeys   = { "bits", "abs_error", "rel_error", "dtype", "scale", "offset" }
+
+
+# ========================================================= #
+# ===  quantizeFields                                   === #
+# ========================================================= #
+def quantizeFields( Fields=None, quantize=None, chunkSize=None, silent=False ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- Fields   :: resolved { DataName:( Data, VectorData ) }                          -- #
+    #  -- quantize :: spec for every floating field, or { DataName:spec }, spec ::          -- #
+    #  --   8 / 16 / "uint8" / "uint16", { "bits":8 }, { "abs_error":e }, { "rel_error":r } -- #
+    #  --   ( r :: relative to the value range ), or fixed { "dtype", "scale", "offset" }   -- #
+    #  -- returns quantized Fields, and { DataName:{ dtype, scale, offset, maxError } }      -- #
+    specs   = resolveSpecs( quantize=quantize, Fields=Fields )
+    if ( not( specs ) ): return( Fields, {} )
+    ret     = dict( Fields )
+    info    = {}
+    # ------------------------------------------------- #
+    # --- [2] Data ~ scale * q + offset             --- #
+    # ------------------------------------------------- #
+    for key,spec in specs.items():
+        Data, VectorData = Fields[key]
+        params           = quantizeParams( Data=Data, spec=spec, chunkSize=chunkSize, DataName=key )
+        q, maxError      = quantizeArray ( Data=Data, params=params, chunkSize=chunkSize )
+        ret[key]         = ( q, VectorData )
+        info[key]        = { **params, "maxError":maxError }
+        if ( not( silent ) ):
+            print( "[quantizeFields-@quantizeData-] {0} :: {1}  scale = {2:.6e}  offset = {3:.6e}  maxError = {4:.6e}"\
+                   .format( key, np.dtype( params["dtype"] ).name, params["scale"], params["offset"], maxError ) )
+    return( ret, info )
+
+
+# ========================================================= #
+# ===  resolveSpecs                                     === #
+# ========================================================= #
+def resolveSpecs( quantize=None, Fields=None ):
+    #  -- { DataName:spec } of the floating fields to be quantized -- #
+    if ( quantize is None ): return( {} )
+    if ( isinstance( quantize, dict ) and not( set( quantize.keys() ) <= SpecKeys ) ):
+        return( { key:spec for key,spec in quantize.items() if ( ( key in Fields ) and ( spec is not None ) ) } )
+    return( { key:quantize for key,( Data, VectorData ) in Fields.items() \
+              if ( np.issubdtype( Data.dtype, np.floating ) ) } )
+
+
+# ========================================================= #
+# ===  quantizeParams                                   === #
+# ========================================================= #
+def quantizeParams( Data=None, spec=None, chunkSize=None, DataName=None ):
+    # ------------------------------------------------- #
+    # --- [1] fixed parameters                      --- #
+    # ------------------------------------------------- #
+    if ( not( isinstance( spec, dict ) ) ): spec = { "bits":spec }
+    if ( "scale" in spec ):
+        return( { "dtype":np.dtype( BitsTable.get( spec.get( "dtype" ), spec.get( "dtype", np.uint16 ) ) ), \
+                  "scale":float( spec["scale"] ), "offset":float( spec.get( "offset", 0.0 ) ) } )
+    # ------------------------------------------------- #
+    # --- [2] value range ( chunk by chunk )        --- #
+    # ------------------------------------------------- #
+    vMin, vMax = valueRange( Data=Data, chunkSize=chunkSize, DataName=DataName )
+    vRange     = vMax - vMin
+    # ------------------------------------------------- #
+    # --- [3] scale from bits, or from error bound  --- #
+    # ------------------------------------------------- #
+    #  -- rounding to the nearest level :: | error | <= scale / 2 -- #
+    if   ( "abs_error" in spec ) or ( "rel_error" in spec ):
+        error  = spec["abs_error"] if ( "abs_error" in spec ) else spec["rel_error"] * vRange
+        if ( error <= 0.0 ):
+            if ( vRange > 0.0 ):
+                sys.exit( "[quantizeParams-@quantizeData-] error bound should be > 0 [ERROR]" )
+            error = 0.5
+        scale  = 2.0 * error
+        nLevel = int( np.rint( vRange / scale ) ) + 1
+        dtype  = next( ( qt for qt in QuantTypes if ( nLevel - 1 <= np.iinfo( qt ).max ) ), None )
+        if ( dtype is None ):
+            sys.exit( "[quantizeParams-@quantizeData-] {0} levels exceed UInt32 [ERROR]".format( nLevel ) )
+    else:
+        bits   = spec.get( "bits", 8 )
+        if ( bits not in BitsTable ):
+            sys.exit( "[quantizeParams-@quantizeData-] unknown bits :: {0} [ERROR]".format( bits ) )
+        dtype  = BitsTable[bits]
+        scale  = vRange / np.iinfo( dtype ).max if ( vRange > 0.0 ) else 1.0
+    return( { "dtype":np.dtype( dtype ), "scale":float( scale ), "offset":float( vMin ) } )
+
+
+# ========================================================= #
+# ===  quantizeArray                                    === #
+# ========================================================= #
+def quantizeArray( Data=None, params=None, chunkSize=None ):
+    # ------------------------------------------------- #
+    # --- [1] q = rint( ( Data - offset ) / scale ) --- #
+    # ------------------------------------------------- #
+    #  -- chunk by chunk, so that no full-size float temporary is made -- #
+    if ( chunkSize is None ): chunkSize = 2**22
+    scale, offset = params["scale"], params["offset"]
+    qMax          = np.iinfo( params["dtype"] ).max
+    flat          = Data.reshape( -1 )
+    ret           = np.empty( flat.shape, dtype=params["dtype"] )
+    maxError      = 0.0
+    for iS in range( 0, flat.size, chunkSize ):
+        chunk        = np.asarray( flat[iS:iS+chunkSize], dtype=np.float64 )
+        q            = np.clip( np.rint( ( chunk - offset ) / scale ), 0, qMax )
+        ret[iS:iS+chunkSize] = q
+        if ( chunk.size > 0 ):
+            maxError = max( maxError, float( np.max( np.abs( q * scale + offset - chunk ) ) ) )
+    return( ret.reshape( Data.shape ), maxError )
+
+
+# ========================================================= #
+# ===  dequantizeArray                                  === #
+# ========================================================= #
+def dequantizeArray( q=None, scale=1.0, offset=0.0, dtype=np.float32 ):
+    return( ( q * scale + offset ).astype( dtype ) )
+
+
+# ========================================================= #
+# ===  valueRange                                       === #
+# ========================================================= #
+def valueRange( Data=None, chunkSize=None, DataName=None ):
+    if ( chunkSize is None ): chunkSize = 2**22
+    flat       = Data.reshape( -1 )
+    vMin, vMax = np.inf, -np.inf
+    for iS in range( 0, flat.size, chunkSize ):
+        chunk  = flat[iS:iS+chunkSize]
+        if ( not( np.all( np.isfinite( chunk ) ) ) ):
+            sys.exit( "[valueRange-@quantizeData-] {0} has NaN / Inf values [ERROR]".format( DataName ) )
+        vMin   = min( vMin, float( np.min( chunk ) ) )
+        vMax   = max( vMax, float( np.max( chunk ) ) )
+    if ( vMin > vMax ): vMin, vMax = 0.0, 0.0
+    return( vMin, vMax )
+
+
+# ========================================================= #
+# ===  fieldDataTag                                     === #
+# ========================================================= #
+def fieldDataTag( info=None ):
+    #  -- <FieldData> with "{DataName}_quantization" = ( scale, offset, maxError ) :: -- #
+    #  -- value = scale * q + offset, | value - original | <= maxError                   -- #
+    if ( not( info ) ): return( "" )
+    ret  = '<FieldData>\n'
+    for key,val in info.items():
+        ret += '<DataArray Name="{0}_quantization" type="Float64" NumberOfTuples="1" NumberOfComponents="3" '\
+               'ComponentName0="scale" ComponentName1="offset" ComponentName2="maxError" format="ascii">\n'\
+               .format( key )
+        ret += "{0!r} {1!r} {2!r}\n".format( val["scale"], val["offset"], val["maxError"] )
+        ret += '</DataArray>\n'
+    ret += '</FieldData>\n'
+    return( ret )
+
+
+# ========================================================= #
+# ===  quantizedType                                    === #
+# ========================================================= #
+def quantizedType( DataType=None, params=None ):
+    #  -- VTK type name as written by quantizeArray ( for summary files ) -- #
+    if ( params is None ): return( DataType )
+    return( "UInt{0}".format( 8 * np.dtype( params["dtype"] ).itemsize ) )
@@ -0,0 +1,45 @@
+import sys
+import numpy as np
+
+
+# ========================================================= #
+# ===  rangeArray class                                 === #
+# ========================================================= #
+class rangeArray():
+    # ------------------------------------------------- #
+    # --- class Initiator                           --- #
+    # ------------------------------------------------- #
+    #  -- ( nData,1 ) column of start, start+step, ..., generated slab by slab while encoding, -- #
+    #  -- e.g. implicit connectivity / offsets ; never materialized as a whole                  -- #
+    def __init__( self, nData=None, start=0, step=1, dtype=np.int64 ):
+        # --- [1-1] Arguments                       --- #
+        if ( nData is None ): sys.exit( "[rangeArray] nData == ??? " )
+        # --- [1-2] Variables Settings              --- #
+        self.nData    = int( nData )
+        self.start    = int( start )
+        self.step     = int( step )
+        self.dtype    = np.dtype( dtype )
+        self.shape    = ( self.nData, 1 )
+        self.ndim     = 2
+        self.size     = self.nData
+        self.nbytes   = self.size * self.dtype.itemsize
+
+
+    # ------------------------------------------------- #
+    # --- iterSlabs                                 --- #
+    # ------------------------------------------------- #
+    def iterSlabs( self, nPoints=None ):
+        #  -- each slab holds at most nPoints values, as a C-contiguous ( n,1 ) array -- #
+        if ( nPoints is None ): nPoints = 2**20
+        for iS in range( 0, self.nData, nPoints ):
+            iE = min( iS+nPoints, self.nData )
+            yield( np.arange( self.start + iS*self.step, self.start + iE*self.step, self.step, \
+                              dtype=self.dtype ).reshape( -1,1 ) )
+
+
+    # ------------------------------------------------- #
+    # --- toArray                                   --- #
+    # ------------------------------------------------- #
+    def toArray( self ):
+        #  -- materializes all the values ( O(N) memory ), for small arrays only -- #
+        return( np.concatenate( list( self.iterSlabs() ) + [ np.empty( ( 0,1 ), dtype=self.dtype ) ] ) )
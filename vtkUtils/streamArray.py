@@ -0,0 +1,85 @@
+import os, sys, tempfile
+import numpy as np
+import vtkUtils.encodeDataArray   as eda
+import vtkUtils.compressDataArray as cda
+import vtkUtils.inquiryData       as iqd
+
+
+# ========================================================= #
+# ===  streamArray class                                === #
+# ========================================================= #
+class streamArray():
+    # ------------------------------------------------- #
+    # --- class Initiator                           --- #
+    # ------------------------------------------------- #
+    #  -- 1 DataArray received chunk by chunk, raw bytes are spooled to disk as they come -- #
+    def __init__( self, vtkFile=None, DataName=None, VectorData=False ):
+        # --- [1-1] Arguments                       --- #
+        if ( vtkFile is None ): vtkFile = "out.vtk"
+        # --- [1-2] Variables Settings              --- #
+        self.vtkFile    = vtkFile
+        self.DataName   = DataName
+        self.VectorData = VectorData
+        self.info       = None
+        self.sample     = None
+        self.nBytes     = 0
+        self.nData      = 0
+        self.spool      = tempfile.TemporaryFile( dir=os.path.dirname( os.path.abspath( vtkFile ) ) )
+        self.cspool     = None
+
+
+    # ------------------------------------------------- #
+    # --- append                                    --- #
+    # ------------------------------------------------- #
+    def append( self, Data=None ):
+        # ------------------------------------------------- #
+        # --- [1] Arguments                             --- #
+        # ------------------------------------------------- #
+        if ( Data is None ): sys.exit( "[append-@streamArray-] Data == ??? " )
+        info = iqd.inquiryData( Data=Data, VectorData=self.VectorData )
+        if ( self.info is None ):
+            self.info, self.sample = info, np.empty( ( 0, ) + Data.shape[1:], dtype=Data.dtype )
+        if ( ( info["DataType"] != self.info["DataType"] ) or ( info["nComponents"] != self.info["nComponents"] ) ):
+            sys.exit( "[append-@streamArray-] {0} :: chunk of {1} x {2} after {3} x {4} [ERROR]"\
+                      .format( self.DataName, info["DataType"], info["nComponents"], \
+                               self.info["DataType"], self.info["nComponents"] ) )
+        # ------------------------------------------------- #
+        # --- [2] spool raw bytes                       --- #
+        # ------------------------------------------------- #
+        if ( self.cspool is not None ):
+            self.cspool.close()
+            self.cspool = None
+        self.spool.seek( 0, os.SEEK_END )
+        for raw in eda.iterRawChunks( Data=Data ):
+            self.spool.write( raw )
+        self.nBytes += Data.nbytes
+        self.nData  += info["nData"]
+
+
+    # ------------------------------------------------- #
+    # --- finalize                                  --- #
+    # ------------------------------------------------- #
+    def finalize( self, compressor=None, level=None, stats=None ):
+        # ------------------------------------------------- #
+        # --- [1] returns ( header, source, nBytes )    --- #
+        # ------------------------------------------------- #
+        #  -- source is the ( compressed ) payload to be copied after the header -- #
+        self.spool.flush()
+        if ( compressor is None ):
+            return( np.array( [ self.nBytes ], dtype=np.uint64 ).tobytes(), self.spool, self.nBytes )
+        if ( self.cspool is None ):
+            self.cspool  = tempfile.TemporaryFile( dir=os.path.dirname( os.path.abspath( self.vtkFile ) ) )
+            self.cheader = cda.compressStream( source=self.spool, target=self.cspool, nBytes=self.nBytes, \
+                                               compressor=compressor, level=level, \
+                                               DataName=self.DataName, stats=stats )
+            self.cspool.flush()
+            self.cBytes  = self.cspool.tell()
+        return( self.cheader, self.cspool, self.cBytes )
+
+
+    # ------------------------------------------------- #
+    # --- close                                     --- #
+    # ------------------------------------------------- #
+    def close( self ):
+        self.spool.close()
+        if ( self.cspool is not None ): self.cspool.close()
@@ -0,0 +1,113 @@
+import sys
+import numpy as np
+
+
+# ========================================================= #
+# ===  structuredPoints class                           === #
+# ========================================================= #
+class structuredPoints():
+    # ------------------------------------------------- #
+    # --- class Initiator                           --- #
+    # ------------------------------------------------- #
+    #  -- ( nPoints,3 ) StructuredGrid points, generated slab by slab in file order ( i fastest ) -- #
+    #  -- from 1D axes :: ( xAxis[i], yAxis[j], zAxis[k] ), or from a callback                -- #
+    #  -- func( i, j, k ) :: 1D index arrays of a slab => coordinates of ( len(k),len(j),len(i),3 ) -- #
+    def __init__( self, xAxis=None, yAxis=None, zAxis=None, func=None, LILJLK=None, dtype=None, \
+                  origin=( 0,0,0 ) ):
+        # --- [1-1] Arguments                       --- #
+        if ( func is None ):
+            if ( xAxis is None ): xAxis = np.array( [0.0] )
+            if ( yAxis is None ): yAxis = np.array( [0.0] )
+            if ( zAxis is None ): zAxis = np.array( [0.0] )
+            xAxis, yAxis, zAxis = np.ravel( xAxis ), np.ravel( yAxis ), np.ravel( zAxis )
+            if ( LILJLK is None ): LILJLK = ( xAxis.size, yAxis.size, zAxis.size )
+            if ( dtype is None ): dtype = np.result_type( xAxis, yAxis, zAxis )
+        else:
+            if ( LILJLK is None ): sys.exit( "[structuredPoints] func needs LILJLK [ERROR]" )
+            if ( dtype  is None ): dtype  = np.float64
+        # --- [1-2] Variables Settings              --- #
+        self.xAxis    = xAxis
+        self.yAxis    = yAxis
+        self.zAxis    = zAxis
+        self.func     = func
+        self.origin   = tuple( origin )
+        self.LILJLK   = tuple( [ int( s ) for s in LILJLK ] )
+        self.dtype    = np.dtype( dtype )
+        self.shape    = ( int( np.prod( self.LILJLK ) ), 3 )
+        self.ndim     = 2
+        self.size     = self.shape[0] * 3
+        self.nbytes   = self.size * self.dtype.itemsize
+
+
+    # ------------------------------------------------- #
+    # --- iterSlabs                                 --- #
+    # ------------------------------------------------- #
+    def iterSlabs( self, nPoints=None ):
+        # ------------------------------------------------- #
+        # --- [1] slabs of whole k-planes, or j-rows    --- #
+        # ------------------------------------------------- #
+        #  -- each slab holds about nPoints points ( at least 1 i-row ) -- #
+        if ( nPoints is None ): nPoints = 2**20
+        LI, LJ, LK = self.LILJLK
+        iIdx       = np.arange( LI )
+        if ( LI*LJ <= nPoints ):
+            nK     = max( nPoints // max( LI*LJ, 1 ), 1 )
+            for k0 in range( 0, LK, nK ):
+                yield( self.slab( i=iIdx, j=np.arange( LJ ), k=np.arange( k0, min( k0+nK, LK ) ) ) )
+        else:
+            nJ     = max( nPoints // max( LI, 1 ), 1 )
+            for k0 in range( LK ):
+                for j0 in range( 0, LJ, nJ ):
+                    yield( self.slab( i=iIdx, j=np.arange( j0, min( j0+nJ, LJ ) ), k=np.array( [k0] ) ) )
+
+
+    # ------------------------------------------------- #
+    # --- slab                                      --- #
+    # ------------------------------------------------- #
+    def slab( self, i=None, j=None, k=None ):
+        #  -- coordinates of points ( i,j,k ), k slowest, as a C-contiguous ( n,3 ) array -- #
+        i0, j0, k0 = self.origin
+        if ( self.func is not None ):
+            ret = np.asarray( self.func( i+i0, j+j0, k+k0 ), dtype=self.dtype )
+            if ( ret.size != 3 * i.size * j.size * k.size ):
+                sys.exit( "[slab-@structuredPoints-] func returned {0} values for {1} points [ERROR]"\
+                          .format( ret.size, i.size * j.size * k.size ) )
+            return( np.ascontiguousarray( ret ).reshape( -1,3 ) )
+        ret          = np.empty( ( k.size, j.size, i.size, 3 ), dtype=self.dtype )
+        ret[...,0]   = self.xAxis[i+i0][np.newaxis,np.newaxis,:]
+        ret[...,1]   = self.yAxis[j+j0][np.newaxis,:,np.newaxis]
+        ret[...,2]   = self.zAxis[k+k0][:,np.newaxis,np.newaxis]
+        return( ret.reshape( -1,3 ) )
+
+
+    # ------------------------------------------------- #
+    # --- subExtent                                 --- #
+    # ------------------------------------------------- #
+    def subExtent( self, extent=None ):
+        #  -- extent :: ( ( i0,i1 ), ( j0,j1 ), ( k0,k1 ) ), inclusive, as in writePieces -- #
+        ( i0,i1 ), ( j0,j1 ), ( k0,k1 ) = extent
+        origin = ( self.origin[0]+i0, self.origin[1]+j0, self.origin[2]+k0 )
+        return( structuredPoints( xAxis=self.xAxis, yAxis=self.yAxis, zAxis=self.zAxis, func=self.func, \
+                                  LILJLK=( i1-i0+1, j1-j0+1, k1-k0+1 ), dtype=self.dtype, origin=origin ) )
+
+
+    # ------------------------------------------------- #
+    # --- astype                                    --- #
+    # ------------------------------------------------- #
+    def astype( self, dtype=None ):
+        #  -- same points, generated in another dtype ( no copy of the axes ) -- #
+        return( structuredPoints( xAxis=self.xAxis, yAxis=self.yAxis, zAxis=self.zAxis, func=self.func, \
+                                  LILJLK=self.LILJLK, dtype=dtype, origin=self.origin ) )
+
+
+    # ------------------------------------------------- #
+    # --- toArray                                   --- #
+    # ------------------------------------------------- #
+    def toArray( self ):
+        #  -- materializes all the points ( O(N) memory ), for small grids only -- #
+        ret = np.empty( self.shape, dtype=self.dtype )
+        iS  = 0
+        for slab in self.iterSlabs():
+            ret[iS:iS+slab.shape[0]] = slab
+            iS += slab.shape[0]
+        return( ret )
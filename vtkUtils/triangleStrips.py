@@ -0,0 +1,129 @@
+import sys
+import numpy as np
+
+
+# ========================================================= #
+# ===  stripify                                         === #
+# ========================================================= #
+def stripify( Elem=None ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- Elem :: ( nTris,3 ) triangles, or ( nQuads,4 ) quads split into 2 triangles each -- #
+    #  -- returns ( connectivity, offsets ) of <Strips>, consistent orientation is kept  -- #
+    if ( Elem is None ): sys.exit( "[stripify-@triangleStrips-] Elem == ??? " )
+    Elem   = np.asarray( Elem, dtype=np.int64 )
+    if   ( ( Elem.ndim == 2 ) and ( Elem.shape[1] == 4 ) ):
+        Elem = np.concatenate( [ Elem[:,[0,1,2]], Elem[:,[0,2,3]] ], axis=1 ).reshape( -1,3 )
+    elif ( ( Elem.ndim != 2 ) or ( Elem.shape[1] != 3 ) ):
+        sys.exit( "[stripify-@triangleStrips-] Elem should be ( nElems,3 ) or ( nElems,4 ) [ERROR]" )
+    nTris  = Elem.shape[0]
+    if ( nTris == 0 ):
+        return( np.zeros( (0,), dtype=np.int64 ), np.zeros( (0,), dtype=np.int64 ) )
+    neighbor = edgeNeighbors( Elem=Elem )
+    # ------------------------------------------------- #
+    # --- [2] greedy walks, all strips of a round at once --- #
+    # ------------------------------------------------- #
+    #  -- a strip ( s0,s1,s2,... ) grows over the edge of its last 2 vertices               -- #
+    #  -- seeds :: free triangles of fewest free neighbors ( <= 2 ), no 2 adjacent seeds    -- #
+    #  -- every step advances all the live strips by 1 triangle in numpy ; a triangle       -- #
+    #  -- claimed by 2 strips goes to the lower strip id, the other strip stops there       -- #
+    #  -- cost :: O( nTris ) per round + O( live strips ) per step, ~1 s per 10^6 triangles -- #
+    used     = np.zeros( (nTris,), dtype=bool     )
+    owner    = np.zeros( (nTris,), dtype=np.int64 )     # strip id of each triangle
+    rank     = np.zeros( (nTris,), dtype=np.int64 )     # position of each triangle in its strip
+    vnew     = np.zeros( (nTris,), dtype=np.int64 )     # vertex appended by each triangle
+    heads    = []                                      # ( id, s0, s1, s2 ) of each strip
+    nStrips  = 0
+    while ( not( used.all() ) ):
+        #  -- [2-1] seeds of this round                                        -- #
+        free     = np.flatnonzero( ~used )
+        nb       = neighbor[free]
+        nFree    = ( ( nb >= 0 ) & ~used[ np.maximum( nb,0 ) ] ).sum( axis=1 )
+        seeds    = free[ nFree <= max( nFree.min(), 2 ) ]
+        isSeed   = np.zeros( (nTris,), dtype=bool )
+        isSeed[seeds] = True
+        nb       = neighbor[seeds]
+        clash    = ( ( nb >= 0 ) & isSeed[ np.maximum( nb,0 ) ] & ( nb < seeds[:,None] ) ).any( axis=1 )
+        seeds    = seeds[ ~clash ]
+        #  -- [2-2] start with the rotation whose exit edge has a free neighbor -- #
+        e        = np.ones( seeds.shape, dtype=np.int64 )
+        for rot in ( 0, 2, 1 ):
+            nb   = neighbor[seeds,rot]
+            e    = np.where( ( nb >= 0 ) & ~used[ np.maximum( nb,0 ) ], rot, e )
+        v        = Elem[seeds]
+        iv       = np.arange( seeds.size )
+        ids      = nStrips + iv
+        nStrips += seeds.size
+        b, c     = v[iv,e], v[iv,(e+1)%3]
+        heads   += [ np.stack( [ ids, v[iv,(e+2)%3], b, c ], axis=1 ) ]
+        used [seeds] = True
+        owner[seeds] = ids
+        rank [seeds] = 0
+        length   = np.ones( seeds.shape, dtype=np.int64 )
+        t        = seeds
+        #  -- [2-3] grow :: e = index of the exit edge ( b,c ) in triangle t    -- #
+        while ( t.size > 0 ):
+            nb   = neighbor[t,e]
+            live = np.flatnonzero( nb >= 0 )
+            live = live[ ~used[ nb[live] ] ]
+            order  = live[ np.lexsort( ( ids[live], nb[live] ) ) ]
+            first  = np.ones( order.shape, dtype=bool )
+            first[1:] = ( nb[order][1:] != nb[order][:-1] )
+            live   = np.sort( order[first] )
+            t, e, b, c, ids, length, nb = t[live], e[live], b[live], c[live], ids[live], length[live], nb[live]
+            tv   = Elem[nb]
+            isP  = ( tv != b[:,None] ) & ( tv != c[:,None] )
+            live = np.flatnonzero( isP.sum( axis=1 ) == 1 )
+            t, e, b, c, ids, length, nb, tv, isP = \
+                t[live], e[live], b[live], c[live], ids[live], length[live], nb[live], tv[live], isP[live]
+            iv   = np.arange( nb.size )
+            p    = np.argmax( isP, axis=1 )
+            used [nb] = True
+            owner[nb] = ids
+            rank [nb] = length
+            vnew [nb] = tv[iv,p]
+            e    = np.where( tv[iv,(p+1)%3] == c, p, (p+2)%3 )
+            b, c = c, tv[iv,p]
+            t, length = nb, length + 1
+    # ------------------------------------------------- #
+    # --- [3] pack strips into connectivity        --- #
+    # ------------------------------------------------- #
+    heads    = np.concatenate( heads, axis=0 )
+    lengths  = np.bincount( owner, minlength=nStrips ) + 2
+    offsets  = np.cumsum( lengths )
+    starts   = offsets - lengths
+    connect  = np.zeros( (offsets[-1],), dtype=np.int64 )
+    for k in range( 3 ):
+        connect[ starts[heads[:,0]] + k ] = heads[:,k+1]
+    grown    = np.flatnonzero( rank > 0 )
+    connect[ starts[owner[grown]] + 2 + rank[grown] ] = vnew[grown]
+    return( connect, offsets )
+
+
+# ========================================================= #
+# ===  edgeNeighbors                                    === #
+# ========================================================= #
+def edgeNeighbors( Elem=None ):
+    # ------------------------------------------------- #
+    # --- [1] neighbor[t,e] across edge ( v_e, v_e+1 ) --- #
+    # ------------------------------------------------- #
+    #  -- edges are sorted by their ( min,max ) key, consecutive equal keys are paired -- #
+    #  -- -1 :: boundary edge ( non-manifold edges are paired in sorted order )        -- #
+    nTris    = Elem.shape[0]
+    v0       = Elem.ravel()
+    v1       = Elem[:,[1,2,0]].ravel()
+    lo, hi   = np.minimum( v0, v1 ), np.maximum( v0, v1 )
+    order    = np.lexsort( ( hi, lo ) )
+    lo, hi   = lo[order], hi[order]
+    same     = ( lo[1:] == lo[:-1] ) & ( hi[1:] == hi[:-1] )
+    #  -- pair ( k, k+1 ) only when k is not itself the 2nd of a previous pair -- #
+    pair     = np.flatnonzero( same )
+    if ( pair.size > 0 ):
+        run      = np.concatenate( [ [True], pair[1:] != pair[:-1]+1 ] )
+        runStart = np.maximum.accumulate( np.where( run, pair, 0 ) )
+        pair     = pair[ ( ( pair - runStart ) % 2 ) == 0 ]
+    neighbor = np.full( ( 3*nTris, ), -1, dtype=np.int64 )
+    neighbor[ order[pair  ] ] = order[pair+1] // 3
+    neighbor[ order[pair+1] ] = order[pair  ] // 3
+    return( neighbor.reshape( nTris,3 ) )
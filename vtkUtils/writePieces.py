@@ -0,0 +1,151 @@
+import os, sys
+import numpy as np
+import concurrent.futures
+import vtkUtils.encodeDataArray as eda
+import vtkUtils.fieldData       as fda
+import vtkUtils.inquiryData     as iqd
+import vtkUtils.quantizeData    as qnt
+
+
+# ========================================================= #
+# ===  writePieces                                      === #
+# ========================================================= #
+def writePieces( writer=None, pieces=None, nProcs=None ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- writer :: vtk_make*** class, pieces :: list of keyword args for writer( **kwargs ) -- #
+    if ( writer is None ): sys.exit( "[writePieces-@writePieces-] writer == ??? " )
+    if ( pieces is None ): sys.exit( "[writePieces-@writePieces-] pieces == ??? " )
+    # ------------------------------------------------- #
+    # --- [2] write each piece on a process pool    --- #
+    # ------------------------------------------------- #
+    if ( ( nProcs == 1 ) or ( len( pieces ) == 1 ) ):
+        ret = [ writePiece( ( writer, kwargs ) ) for kwargs in pieces ]
+    else:
+        with concurrent.futures.ProcessPoolExecutor( max_workers=nProcs ) as pool:
+            ret = list( pool.map( writePiece, [ ( writer, kwargs ) for kwargs in pieces ] ) )
+    return( ret )
+
+
+# ========================================================= #
+# ===  writePiece  ( worker )                           === #
+# ========================================================= #
+def writePiece( args ):
+    #  -- "PointFields" / "CellFields" :: { name:( Data, VectorData ) }, added through the builder -- #
+    writer, kwargs = args
+    kwargs         = dict( kwargs )
+    PointFields    = kwargs.pop( "PointFields", None )
+    CellFields     = kwargs.pop( "CellFields" , None )
+    vtk            = writer( **kwargs )
+    if ( ( PointFields is not None ) or ( CellFields is not None ) ):
+        for key,( Data, VectorData ) in ( PointFields or {} ).items():
+            vtk.add_point_data( name=key, array=Data, VectorData=VectorData )
+        for key,( Data, VectorData ) in ( CellFields  or {} ).items():
+            vtk.add_cell_data ( name=key, array=Data, VectorData=VectorData )
+        vtk.write()
+    return( kwargs["vtkFile"] )
+
+
+# ========================================================= #
+# ===  pieceFileName                                    === #
+# ========================================================= #
+def pieceFileName( vtkFile=None, iPiece=0 ):
+    base, ext = os.path.splitext( vtkFile )
+    return( "{0}_{1}{2}".format( base, iPiece, ext ) )
+
+
+# ========================================================= #
+# ===  summaryFileName  ( out.vti => out.pvti )         === #
+# ========================================================= #
+def summaryFileName( vtkFile=None ):
+    base, ext = os.path.splitext( vtkFile )
+    return( "{0}.p{1}".format( base, ext[1:] ) )
+
+
+# ========================================================= #
+# ===  splitRange                                       === #
+# ========================================================= #
+def splitRange( nItems=None, nPieces=None ):
+    nPieces = max( min( nPieces, nItems ), 1 )
+    bounds  = ( np.arange( nPieces+1 ) * nItems ) // nPieces
+    return( [ ( bounds[ik], bounds[ik+1] ) for ik in range( nPieces ) ] )
+
+
+# ========================================================= #
+# ===  structuredExtents                                === #
+# ========================================================= #
+def structuredExtents( LILJLK=None, nPieces=None, GhostLevel=0 ):
+    # ------------------------------------------------- #
+    # --- [1] split along the slowest varying axis  --- #
+    # ------------------------------------------------- #
+    #  -- point extents of neighbouring pieces share 1 layer, + GhostLevel layers -- #
+    axis    = max( [ ik for ik in range( 3 ) if LILJLK[ik] > 1 ] + [0] )
+    nCells  = max( LILJLK[axis]-1, 1 )
+    extents = []
+    for ( c0, c1 ) in splitRange( nItems=nCells, nPieces=nPieces ):
+        extent       = [ [ 0, max( s-1, 0 ) ] for s in LILJLK ]
+        extent[axis] = [ max( c0-GhostLevel, 0 ), min( c1+GhostLevel, LILJLK[axis]-1 ) ]
+        extents     += [ extent ]
+    return( extents )
+
+
+# ========================================================= #
+# ===  cellDims / cellExtent                            === #
+# ========================================================= #
+def cellDims( LILJLK=None ):
+    return( tuple( [ max( int( s )-1, 1 ) for s in LILJLK ] ) )
+
+def cellExtent( extent=None, LILJLK=None ):
+    #  -- cells between the points of a point extent ( the single cell of a flat axis ) -- #
+    return( [ [ lo, hi-1 ] if ( s > 1 ) else [ 0, 0 ] for ( lo, hi ), s in zip( extent, LILJLK ) ] )
+
+
+# ========================================================= #
+# ===  extentString                                     === #
+# ========================================================= #
+def extentString( extent=None ):
+    return( " ".join( [ "{0} {1}".format( lo, hi ) for ( lo, hi ) in extent ] ) )
+
+
+# ========================================================= #
+# ===  subExtent                                        === #
+# ========================================================= #
+def subExtent( Data=None, LILJLK=None, extent=None, VectorData=False ):
+    # ------------------------------------------------- #
+    # --- [1] view as file order ( i fastest )      --- #
+    # ------------------------------------------------- #
+    #  -- returned piece keeps the same ( LI,LJ,LK[,nComp] ) convention as Data -- #
+    LI, LJ, LK  = LILJLK
+    nComp       = ( Data.shape[-1], ) if ( VectorData ) else ()
+    ordered     = Data.reshape( ( LK, LJ, LI ) + nComp )
+    ( i0,i1 ), ( j0,j1 ), ( k0,k1 ) = extent
+    piece       = ordered[k0:k1+1,j0:j1+1,i0:i1+1]
+    return( np.ascontiguousarray( piece ).reshape( ( i1-i0+1, j1-j0+1, k1-k0+1 ) + nComp ) )
+
+
+# ========================================================= #
+# ===  sharedQuantize                                   === #
+# ========================================================= #
+def sharedQuantize( quantize=None, Fields=None ):
+    #  -- quantized pieces share 1 ( scale, offset ) per field, taken from the whole field -- #
+    specs = qnt.resolveSpecs( quantize=quantize, Fields=Fields )
+    if ( not( specs ) ): return( None )
+    return( { key:qnt.quantizeParams( Data=Fields[key][0], spec=spec, DataName=key ) for key,spec in specs.items() } )
+
+
+# ========================================================= #
+# ===  summaryFields  ( <PPointData> / <PCellData> )    === #
+# ========================================================= #
+def summaryFields( Fields=None, tag="PPointData", downcast=False, quantize=None ):
+    #  -- 1 PDataArray per resolved field, of the type written in the pieces -- #
+    if ( not( Fields ) ): return( "" )
+    ret  = '<{0}{1}>\n'.format( tag, fda.activeAttributes( Fields=Fields ) )
+    for key,( Data, VectorData ) in Fields.items():
+        info     = iqd.inquiryData( Data=Data, VectorData=VectorData )
+        DataType = qnt.quantizedType( DataType=eda.downcastType( DataType=info["DataType"], downcast=downcast ), \
+                                      params=( quantize or {} ).get( key ) )
+        ret     += '<PDataArray type="{0}" Name="{1}" NumberOfComponents="{2}"/>\n'\
+            .format( DataType, key, info["nComponents"] )
+    ret += '</{0}>\n'.format( tag )
+    return( ret )
@@ -0,0 +1,69 @@
+import re, sys, contextlib
+
+# -- a line holding a tag ( DataArray payloads never start with "<" ) -- #
+tagLine = re.compile( r"^<[^\n]*\n?", re.M )
+
+
+# ========================================================= #
+# ===  writeXML                                         === #
+# ========================================================= #
+def writeXML( f=None, contents=None, pretty=False, depth=0, indent="  " ):
+    # ------------------------------------------------- #
+    # --- [1] Arguments                             --- #
+    # ------------------------------------------------- #
+    #  -- f :: file opened in "wb", contents are written as utf-8 in one pass -- #
+    #  -- returns the nesting depth after contents, to continue on next call  -- #
+    if ( f        is None ): sys.exit( "[writeXML-@writeXML-] f        == ??? " )
+    if ( contents is None ): sys.exit( "[writeXML-@writeXML-] contents == ??? " )
+    if ( not( pretty ) ):
+        f.write( contents.encode( "utf-8" ) )
+        return( depth )
+    # ------------------------------------------------- #
+    # --- [2] indent tag lines, keep payload as is  --- #
+    # ------------------------------------------------- #
+    #  -- equivalent XML, different whitespace from xmllint --format in general :        -- #
+    #  -- tag lines get indent*depth, payload text and the tag closing it are kept as is, -- #
+    #  -- ( same bytes as xmllint for ascii / binary ), raw <AppendedData> is indented   -- #
+    #  -- by appendedWriter, where xmllint would reject the raw bytes                     -- #
+    pos = 0
+    for match in tagLine.finditer( contents ):
+        line = match.group()
+        tag  = line.rstrip( "\n" )
+        if ( tag.startswith( "</" ) ): depth -= 1
+        if ( match.start() > pos ):
+            f.write( contents[pos:match.start()].encode( "utf-8" ) )
+            f.write( line.encode( "utf-8" ) )
+        else:
+            f.write( ( indent*max( depth, 0 ) + line ).encode( "utf-8" ) )
+        if ( not( tag.startswith( "</" ) or tag.startswith( "<?" ) or tag.endswith( "/>" ) ) ):
+            depth += 1
+        pos = match.end()
+    f.write( contents[pos:].encode( "utf-8" ) )
+    return( depth )
+
+
+# ========================================================= #
+# ===  indentOf                                         === #
+# ========================================================= #
+def indentOf( depth=0, pretty=False, indent="  " ):
+    if ( pretty ): return( indent*max( depth, 0 ) )
+    return( "" )
+
+
+# ========================================================= #
+# ===  openXML                                          === #
+# ========================================================= #
+def openXML( path_or_fileobj=None ):
+    #  -- a file object ( opened in "wb" ) is written as is and left open for the caller -- #
+    if ( hasattr( path_or_fileobj, "write" ) ):
+        return( contextlib.nullcontext( path_or_fileobj ) )
+    return( open( path_or_fileobj, "wb" ) )
+
+
+# ========================================================= #
+# ===  nameOf                                           === #
+# ========================================================= #
+def nameOf( path_or_fileobj=None ):
+    if ( hasattr( path_or_fileobj, "write" ) ):
+        return( getattr( path_or_fileobj, "name", repr( path_or_fileobj ) ) )
+    return( path_or_fileobj )